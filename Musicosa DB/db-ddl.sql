@@ -95,6 +95,8 @@ CREATE TABLE entries
     title         TEXT     NOT NULL UNIQUE,
     author        TEXT,
     video_url     TEXT     NOT NULL,
+    -- '<provider>:<video id>' canonical key of the video URL (e.g. 'youtube:dQw4w9WgXcQ')
+    video_key     TEXT,
     topic TEXT,
 
     CONSTRAINT authored_by_fk FOREIGN KEY (author) REFERENCES contestants (id)
@@ -171,4 +173,34 @@ CREATE TABLE stats_entries
 
     CONSTRAINT entry_fk FOREIGN KEY (entry) REFERENCES entries (id)
         ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+-- Rankings by other strategies (e.g. median), side by side with the official one in stats_entries
+CREATE TABLE stats_entries_strategies
+(
+    entry            TEXT NOT NULL,
+    strategy         TEXT NOT NULL,
+    score            REAL,
+    ranking_place    INTEGER
+        CONSTRAINT strategy_ranking_place_is_1_indexed CHECK ( ranking_place >= 1 ),
+    ranking_sequence INTEGER
+        CONSTRAINT strategy_ranking_sequence_is_1_indexed CHECK ( ranking_sequence >= 1 ),
+
+    CONSTRAINT entry_strategy_stats_pk PRIMARY KEY (entry, strategy),
+
+    CONSTRAINT strategy_ranking_sequence_unique UNIQUE (strategy, ranking_sequence),
+
+    CONSTRAINT entry_fk FOREIGN KEY (entry) REFERENCES entries (id)
+        ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+-- Entry stats of every ranking run (Stage 2 or a score correction), packed (see RankingSnapshot in the runner)
+CREATE TABLE ranking_runs
+(
+    id         INTEGER NOT NULL
+        CONSTRAINT ranking_run_pk PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT    NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    origin     TEXT    NOT NULL
+        CONSTRAINT ranking_run_origin_values CHECK ( origin IN ('ranking', 'correction') ),
+    snapshot   BLOB    NOT NULL
 );
\ No newline at end of file
@@ -3,17 +3,28 @@ from typing import ClassVar, cast
 
 from common.config.defaults import (
     DEFAULT_ARTIFACTS_FOLDER,
+    DEFAULT_CONSOLIDATED_CSV_FILE,
     DEFAULT_CONTESTANT_NAME_COORDS,
     DEFAULT_ENTRIES_DATA_COORDS,
     DEFAULT_FINAL_VIDEO_NAME,
     DEFAULT_FORMS_FOLDER,
+    DEFAULT_FORMS_FORMAT,
+    DEFAULT_FORMS_WORKBOOK_FILE,
+    DEFAULT_FULFILLMENT_FILE,
     DEFAULT_GENERATION_RETRY_ATTEMPTS,
+    DEFAULT_MIN_VOTES,
     DEFAULT_OVERWRITE_PRESENTATIONS,
     DEFAULT_OVERWRITE_TEMPLATES,
     DEFAULT_OVERWRITE_VIDEO_BITS,
+    DEFAULT_PARSING_CACHE_FILE,
+    DEFAULT_PARSING_CACHE_HASH_CONTENTS,
+    DEFAULT_PARSING_WORKERS,
     DEFAULT_PRESENTATION_DURATION,
     DEFAULT_PRESENTATIONS_API_URL,
     DEFAULT_QUIET_FFMPEG_FINAL_VIDEO,
+    DEFAULT_RANKING_ENGINE,
+    DEFAULT_RANKING_STRATEGIES,
+    DEFAULT_SIMULATION_WORKERS,
     DEFAULT_STAGE_5_QUIET_FFMPEG,
     DEFAULT_STAGE_6_QUIET_FFMPEG,
     DEFAULT_START_FROM_STAGE,
@@ -21,9 +32,11 @@ from common.config.defaults import (
     DEFAULT_TEMPLATES_API_URL,
     DEFAULT_TRANSITION_DURATION,
     DEFAULT_TRANSITION_TYPE,
+    DEFAULT_TRIMMED_MEAN_PROPORTION,
     DEFAULT_USE_COOKIES,
     DEFAULT_VALID_TITLES_FILE,
     DEFAULT_VIDEO_BITS_FOLDER,
+    DEFAULT_XLSX_READER,
 )
 from common.custom_types import Stage
 
@@ -36,6 +49,13 @@ class StageOneConfig:
     valid_titles_file: str
     contestant_name_coords: str
     entries_data_coords: str
+    parsing_workers: int
+    parsing_cache_file: str
+    parsing_cache_hash_contents: bool
+    xlsx_reader: str
+    forms_format: str
+    consolidated_csv_file: str
+    forms_workbook_file: str
 
     def __init__(
         self,
@@ -43,6 +63,13 @@ class StageOneConfig:
         valid_titles_file: str = DEFAULT_VALID_TITLES_FILE,
         contestant_name_coords: str = DEFAULT_CONTESTANT_NAME_COORDS,
         entries_data_coords: str = DEFAULT_ENTRIES_DATA_COORDS,
+        parsing_workers: int = DEFAULT_PARSING_WORKERS,
+        parsing_cache_file: str = DEFAULT_PARSING_CACHE_FILE,
+        parsing_cache_hash_contents: bool = DEFAULT_PARSING_CACHE_HASH_CONTENTS,
+        xlsx_reader: str = DEFAULT_XLSX_READER,
+        forms_format: str = DEFAULT_FORMS_FORMAT,
+        consolidated_csv_file: str = DEFAULT_CONSOLIDATED_CSV_FILE,
+        forms_workbook_file: str = DEFAULT_FORMS_WORKBOOK_FILE,
     ):
         forms_folder = forms_folder.strip()
 
@@ -50,6 +77,44 @@ class StageOneConfig:
         self.valid_titles_file = valid_titles_file.strip()
         self.contestant_name_coords = contestant_name_coords.strip()
         self.entries_data_coords = entries_data_coords.strip()
+        self.parsing_workers = parsing_workers
+        self.parsing_cache_file = parsing_cache_file.strip()
+        self.parsing_cache_hash_contents = parsing_cache_hash_contents
+        self.xlsx_reader = xlsx_reader.strip()
+        self.forms_format = forms_format.strip()
+        self.consolidated_csv_file = consolidated_csv_file.strip()
+        self.forms_workbook_file = forms_workbook_file.strip()
+
+
+@dataclass
+class StageTwoConfig:
+    ranking_engine: str
+    min_votes: int
+    ranking_strategies: list[str]
+    trimmed_mean_proportion: float
+    simulation_workers: int
+
+    def __init__(
+        self,
+        ranking_engine: str = DEFAULT_RANKING_ENGINE,
+        min_votes: int = DEFAULT_MIN_VOTES,
+        ranking_strategies: list[str] = DEFAULT_RANKING_STRATEGIES,
+        trimmed_mean_proportion: float = DEFAULT_TRIMMED_MEAN_PROPORTION,
+        simulation_workers: int = DEFAULT_SIMULATION_WORKERS,
+    ):
+        self.ranking_engine = ranking_engine.strip()
+        self.min_votes = min_votes
+        self.ranking_strategies = [strategy.strip() for strategy in ranking_strategies]
+        self.trimmed_mean_proportion = trimmed_mean_proportion
+        self.simulation_workers = simulation_workers
+
+
+@dataclass
+class StageThreeConfig:
+    fulfillment_file: str
+
+    def __init__(self, fulfillment_file: str = DEFAULT_FULFILLMENT_FILE):
+        self.fulfillment_file = fulfillment_file.strip()
 
 
 @dataclass
@@ -139,6 +204,8 @@ class Config:
     artifacts_folder: str
     stitch_final_video: bool
     stage_1: StageOneConfig
+    stage_2: StageTwoConfig
+    stage_3: StageThreeConfig
     stage_4: StageFourConfig
     stage_5: StageFiveConfig
     stage_6: StageSixConfig
@@ -149,6 +216,8 @@ class Config:
         artifacts_folder: str = DEFAULT_ARTIFACTS_FOLDER,
         stitch_final_video: bool = DEFAULT_STITCH_FINAL_VIDEO_FLAG,
         stage_1: StageOneConfig = StageOneConfig(),
+        stage_2: StageTwoConfig = StageTwoConfig(),
+        stage_3: StageThreeConfig = StageThreeConfig(),
         stage_4: StageFourConfig = StageFourConfig(),
         stage_5: StageFiveConfig = StageFiveConfig(),
         stage_6: StageSixConfig = StageSixConfig(),
@@ -157,6 +226,8 @@ class Config:
         self.artifacts_folder = artifacts_folder.strip()
         self.stitch_final_video = stitch_final_video
         self.stage_1 = stage_1
+        self.stage_2 = stage_2
+        self.stage_3 = stage_3
         self.stage_4 = stage_4
         self.stage_5 = stage_5
         self.stage_6 = stage_6
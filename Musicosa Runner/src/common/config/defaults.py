@@ -1,3 +1,5 @@
+from os import cpu_count
+
 from common.custom_types import STAGE_ONE, Stage
 
 DEFAULT_CONFIG_FILE_NAME = "config.toml"
@@ -11,6 +13,21 @@ DEFAULT_FORMS_FOLDER = "contestant_forms"
 DEFAULT_VALID_TITLES_FILE = "titles.txt"
 DEFAULT_CONTESTANT_NAME_COORDS = "F2"
 DEFAULT_ENTRIES_DATA_COORDS = "C6:H6"
+DEFAULT_PARSING_WORKERS = cpu_count() or 1
+DEFAULT_PARSING_CACHE_FILE = f"{DEFAULT_ARTIFACTS_FOLDER}/parsed_forms.cache"
+DEFAULT_PARSING_CACHE_HASH_CONTENTS = False
+DEFAULT_XLSX_READER = "stream"
+DEFAULT_FORMS_FORMAT = "xlsx"
+DEFAULT_CONSOLIDATED_CSV_FILE = "submissions.csv"
+DEFAULT_FORMS_WORKBOOK_FILE = "submissions.xlsx"
+# Stage 2 defaults
+DEFAULT_RANKING_ENGINE = "python"
+DEFAULT_MIN_VOTES = 1
+DEFAULT_RANKING_STRATEGIES: list[str] = []
+DEFAULT_TRIMMED_MEAN_PROPORTION = 0.1
+DEFAULT_SIMULATION_WORKERS = cpu_count() or 1
+# Stage 3 defaults
+DEFAULT_FULFILLMENT_FILE = ""
 # Stage 4 defaults
 DEFAULT_TEMPLATES_API_URL = "http://localhost:3000/templates"
 DEFAULT_PRESENTATIONS_API_URL = "http://localhost:3000/presentations"
@@ -1,7 +1,15 @@
 import tomllib
 from os import path
 
-from common.config.config import Config, StageFiveConfig, StageFourConfig, StageOneConfig, StageSixConfig
+from common.config.config import (
+    Config,
+    StageFiveConfig,
+    StageFourConfig,
+    StageOneConfig,
+    StageSixConfig,
+    StageThreeConfig,
+    StageTwoConfig,
+)
 from common.config.defaults import DEFAULT_CONFIG_FILE_NAME
 
 
@@ -32,6 +40,8 @@ def load_config(config_file: str | None = None) -> Config:
             artifacts_folder=config_dict["artifacts_folder"],
             stitch_final_video=config_dict["stitch_final_video"],
             stage_1=StageOneConfig(**config_dict["stage_1"]),
+            stage_2=StageTwoConfig(**config_dict.get("stage_2", {})),
+            stage_3=StageThreeConfig(**config_dict.get("stage_3", {})),
             stage_4=StageFourConfig(**config_dict["stage_4"]),
             stage_5=StageFiveConfig(**config_dict["stage_5"]),
             stage_6=StageSixConfig(**config_dict["stage_6"]),
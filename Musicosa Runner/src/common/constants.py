@@ -6,3 +6,5 @@ PRESENTATION_IMG_FILE_SUFFIX = "PRESENTATION"
 VIDEO_FORMAT = "mp4"
 
 VIDEOCLIPS_OVERRIDE_DURATION_LIMIT = -1
+
+BULK_WRITE_CHUNK_SIZE = 5000
@@ -1,26 +1,94 @@
-from typing import Any, Iterable
+from functools import cache
+from itertools import batched
+from typing import Any, Callable, Iterable, Sequence
 
+from peewee import Field, ForeignKeyField
+from peewee import Model as PeeweeModel
+from peewee import __exception_wrapper__ as peewee_exception_wrapper  # pyright: ignore [reportAttributeAccessIssue]
+
+from common.constants import BULK_WRITE_CHUNK_SIZE
+from common.db.database import db
 from common.model.models import DomainModel
 
 
-def bulk_pack(collection: Iterable) -> list[dict[Any, Any]]:
+def bulk_write[T: DomainModel](
+    domain_model: type[T], collection: Iterable[T], replace: bool = False, chunk_size: int = BULK_WRITE_CHUNK_SIZE
+) -> int:
     """
-    Create a collection of ORM entities in the format of the input of a Peewee bulk operation
-    :param collection: Collection of ORM entities
-    :return: A list of dictionaries with the data of the ORM entities compatible with Peewee bulk operations
+    Insert a collection of domain entities, serialized straight to column tuples (no ORM entity per item)
+    :param domain_model: Domain model class of the entities (with a nested ORM model)
+    :param collection: Collection of domain entities
+    :param replace: Replace rows that conflict with existing ones instead of failing
+    :return: Number of rows written
     """
-    bulk_data = []
+    orm_model: type[PeeweeModel] = getattr(domain_model, "ORM")
+    fields = orm_model._meta.sorted_fields  # pyright: ignore [reportAttributeAccessIssue]
+    serialize = row_serializer(domain_model)
+
+    return bulk_write_rows(orm_model, fields, map(serialize, collection), replace, chunk_size)
+
+
+def bulk_write_rows(
+    orm_model: type[PeeweeModel],
+    fields: Sequence[Field],
+    rows: Iterable[tuple],
+    replace: bool = False,
+    chunk_size: int = BULK_WRITE_CHUNK_SIZE,
+) -> int:
+    """
+    Insert rows of column values with one prepared statement, executed in chunks within a single transaction (a
+    savepoint if there's one already open). Rows are consumed lazily, one chunk at a time
+    :param orm_model: ORM model of the table
+    :param fields: Fields of the table the row values belong to, in the same order
+    :param rows: Rows of column values, as domain values (they are converted with each field's 'db_value')
+    :param replace: Replace rows that conflict with existing ones instead of failing
+    :return: Number of rows written
+    """
+    columns = ", ".join([f'"{field.column_name}"' for field in fields])
+    placeholders = ", ".join(["?"] * len(fields))
+    table_name = orm_model._meta.table_name  # pyright: ignore [reportAttributeAccessIssue]
+    sql = f'INSERT{" OR REPLACE" if replace else ""} INTO "{table_name}" ({columns}) VALUES ({placeholders})'
+    converters = [field.db_value for field in fields]
+    written = 0
+
+    with db.atomic():
+        cursor = db.cursor()
 
-    for item in collection:
-        if not isinstance(item, DomainModel):
-            raise TypeError(f"Collection contains an item that isn't a domain model ('{item}')")
+        for chunk in batched(rows, chunk_size):
+            # Driver errors are translated into Peewee exceptions, as 'execute_sql' does
+            with peewee_exception_wrapper:
+                cursor.executemany(
+                    sql, [tuple([convert(value) for convert, value in zip(converters, row)]) for row in chunk]
+                )
+
+            written += len(chunk)
+
+    return written
+
+
+@cache
+def row_serializer(domain_model: type[DomainModel]) -> Callable[[Any], tuple]:
+    """
+    Build the function that turns an entity of a domain model into the values of the columns of its ORM model. Domain
+    attributes map to the ORM fields of the same name, and related entities to their primary key
+    """
+    orm_model: type[PeeweeModel] = getattr(domain_model, "ORM")
+    getters: list[Callable[[Any], Any]] = []
 
-        orm_entity = item.to_orm()
+    for field in orm_model._meta.sorted_fields:  # pyright: ignore [reportAttributeAccessIssue]
+        if isinstance(field, ForeignKeyField):
+            getters.append(
+                lambda item, name=field.name, key=field.rel_field.name: (
+                    getattr(related, key) if (related := getattr(item, name)) is not None else None
+                )
+            )
+        else:
+            getters.append(lambda item, name=field.name: getattr(item, name))
 
-        if not getattr(orm_entity, "__data__", None):
-            # Fucked around and found out (:
-            raise TypeError(f"ORM entity '{orm_entity}' doesn't store its data in '__data__'")
+    def serialize(item: Any) -> tuple:
+        if not isinstance(item, domain_model):
+            raise TypeError(f"Collection contains an item that isn't a '{domain_model.__name__}' ('{item}')")
 
-        bulk_data.append(orm_entity.__data__)
+        return tuple([get(item) for get in getters])
 
-    return bulk_data
+    return serialize
@@ -1,13 +1,12 @@
 from dataclasses import dataclass
-from datetime import time
 from enum import StrEnum
 from typing import Any, Literal
 
-from peewee import AutoField, CompositeKey, FloatField, ForeignKeyField, IntegerField, TextField
+from peewee import AutoField, BlobField, CompositeKey, FloatField, ForeignKeyField, IntegerField, TextField
 from peewee import Model as PeeweeModel
 
 from common.db.database import db
-from common.time.utils import parse_time
+from common.time.timestamp import Timestamp, parse_timestamp
 
 # pyright: reportArgumentType=false
 
@@ -20,6 +19,15 @@ class DatabaseModel:
     def to_domain(self) -> Any: ...
 
 
+class TimestampField(TextField):
+    """
+    Timestamp stored as its 'HH:MM:SS' text. Converted at the DB boundary, both ways
+    """
+
+    def python_value(self, value: str | None) -> Timestamp | None:
+        return parse_timestamp(value) if value is not None else None
+
+
 class MetadataFields(StrEnum):
     EDITION = "edition"
     TOPIC = "topic"
@@ -277,6 +285,7 @@ class Entry(DomainModel):
     title: str
     author: Contestant | None
     video_url: str
+    video_key: str | None
     topic: EntryTopic | None
 
     class ORM(PeeweeModel, DatabaseModel):
@@ -284,6 +293,7 @@ class Entry(DomainModel):
         title = TextField(column_name="title", unique=True)
         author = ForeignKeyField(Contestant.ORM, column_name="author", null=True)
         video_url = TextField(column_name="video_url")
+        video_key = TextField(column_name="video_key", null=True)
         topic = ForeignKeyField(EntryTopic.ORM, column_name="topic", null=True)
 
         class Meta:
@@ -303,6 +313,7 @@ class Entry(DomainModel):
                 title=self.title,
                 author=self.author.to_domain() if self.author else None,
                 video_url=self.video_url,
+                video_key=self.video_key,
                 topic=self.topic.to_domain() if self.topic else None,
             )
 
@@ -312,6 +323,7 @@ class Entry(DomainModel):
             title=self.title,
             author=self.author.to_orm() if self.author else None,
             video_url=self.video_url,
+            video_key=self.video_key,
             topic=self.topic.to_orm() if self.topic else None,
         )
 
@@ -366,13 +378,13 @@ class Template(DomainModel):
 @dataclass
 class VideoOptions(DomainModel):
     entry: Entry
-    timestamp_start: time | None
-    timestamp_end: time | None
+    timestamp_start: Timestamp | None
+    timestamp_end: Timestamp | None
 
     class ORM(PeeweeModel, DatabaseModel):
         entry = ForeignKeyField(Entry.ORM, column_name="entry", primary_key=True)
-        timestamp_start = TextField(column_name="timestamp_start", null=True)
-        timestamp_end = TextField(column_name="timestamp_end", null=True)
+        timestamp_start = TimestampField(column_name="timestamp_start", null=True)
+        timestamp_end = TimestampField(column_name="timestamp_end", null=True)
 
         class Meta:
             database = db
@@ -382,13 +394,13 @@ class VideoOptions(DomainModel):
             # noinspection PyTypeChecker
             return VideoOptions(
                 entry=self.entry.to_domain(),
-                timestamp_start=parse_time(self.timestamp_start),
-                timestamp_end=parse_time(self.timestamp_end),
+                timestamp_start=self.timestamp_start,
+                timestamp_end=self.timestamp_end,
             )
 
     def to_orm(self) -> "VideoOptions.ORM":
         return VideoOptions.ORM(
-            entry=self.entry.to_orm(), timestamp_start=str(self.timestamp_start), timestamp_end=str(self.timestamp_end)
+            entry=self.entry.to_orm(), timestamp_start=self.timestamp_start, timestamp_end=self.timestamp_end
         )
 
 
@@ -484,3 +496,80 @@ class EntryStats(DomainModel):
             ranking_place=self.ranking_place,
             ranking_sequence=self.ranking_sequence,
         )
+
+
+@dataclass
+class EntryStrategyStats(DomainModel):
+    entry: Entry
+    strategy: str
+    score: float | None
+    ranking_place: int | None
+    ranking_sequence: int | None
+
+    class ORM(PeeweeModel, DatabaseModel):
+        entry = ForeignKeyField(Entry.ORM, column_name="entry")
+        strategy = TextField(column_name="strategy")
+        score = FloatField(column_name="score", null=True)
+        ranking_place = IntegerField(column_name="ranking_place", null=True)
+        ranking_sequence = IntegerField(column_name="ranking_sequence", null=True)
+
+        class Meta:
+            database = db
+            table_name = "stats_entries_strategies"
+            primary_key = CompositeKey("entry", "strategy")
+
+        def to_domain(self) -> "EntryStrategyStats":
+            # noinspection PyTypeChecker
+            return EntryStrategyStats(
+                entry=self.entry.to_domain(),
+                strategy=self.strategy,
+                score=self.score,
+                ranking_place=self.ranking_place,
+                ranking_sequence=self.ranking_sequence,
+            )
+
+    def to_orm(self) -> "EntryStrategyStats.ORM":
+        return EntryStrategyStats.ORM(
+            entry=self.entry.to_orm(),
+            strategy=self.strategy,
+            score=self.score,
+            ranking_place=self.ranking_place,
+            ranking_sequence=self.ranking_sequence,
+        )
+
+
+type RankingRunOrigin = Literal["ranking", "correction"]
+
+
+@dataclass
+class RankingRun(DomainModel):
+    id: int
+    created_at: str
+    origin: RankingRunOrigin
+    snapshot: bytes
+
+    class ORM(PeeweeModel, DatabaseModel):
+        id = AutoField(primary_key=True)
+        created_at = TextField(column_name="created_at")
+        origin = TextField(column_name="origin", choices=["ranking", "correction"])
+        snapshot = BlobField(column_name="snapshot")
+
+        class Meta:
+            database = db
+            table_name = "ranking_runs"
+
+        def to_domain(self) -> "RankingRun":
+            # noinspection PyTypeChecker
+            return RankingRun(id=self.id, created_at=self.created_at, origin=self.origin, snapshot=bytes(self.snapshot))
+
+    def to_orm(self) -> "RankingRun.ORM":
+        return RankingRun.ORM(id=self.id, created_at=self.created_at, origin=self.origin, snapshot=self.snapshot)
+
+    @dataclass
+    class Insert:
+        # 'created_at' is set by the DB
+        origin: RankingRunOrigin
+        snapshot: bytes
+
+        def to_orm(self) -> "RankingRun.ORM":
+            return RankingRun.ORM(origin=self.origin, snapshot=self.snapshot)
@@ -0,0 +1,182 @@
+from dataclasses import dataclass
+from math import isnan, nan
+from struct import Struct
+from typing import Iterable, Iterator, cast
+
+from common.model.models import RankingRun, RankingRunOrigin
+
+# Entry id (its 16 UUID bytes), ranking place, ranking sequence and average score, little-endian. A missing place or
+# sequence is packed as 0 and a missing average score as NaN
+SNAPSHOT_ROW = Struct("<16sIId")
+ENTRY_ID_SIZE = 16
+
+type RankingRow = tuple[str, int | None, int | None, float | None]
+
+
+@dataclass
+class RankingRowChange:
+    """
+    Row of an entry that differs between two snapshots. 'previous' is None for an entry only in the current one, and
+    'current' for an entry only in the previous one
+    """
+
+    entry_id: str
+    previous: RankingRow | None
+    current: RankingRow | None
+
+
+class RankingSnapshot:
+    """
+    Entry stats of a ranking run, packed as fixed-size rows (see SNAPSHOT_ROW) sorted by entry id, so a whole ranking
+    is a single blob of a few bytes per entry. Two snapshots are diffed with one merge pass over their rows, comparing
+    the packed bytes, so only the rows that changed are unpacked
+    """
+
+    data: bytes
+
+    def __init__(self, data: bytes):
+        if len(data) % SNAPSHOT_ROW.size != 0:
+            raise ValueError(f"Invalid ranking snapshot of {len(data)} bytes (Rows are {SNAPSHOT_ROW.size} bytes)")
+
+        self.data = data
+
+    @staticmethod
+    def from_rows(rows: Iterable[RankingRow]) -> "RankingSnapshot":
+        """
+        :param rows: (entry id, ranking place, ranking sequence, average score) of every entry, in any order
+        """
+        packed_rows = sorted(
+            SNAPSHOT_ROW.pack(
+                bytes.fromhex(entry_id),
+                ranking_place or 0,
+                ranking_sequence or 0,
+                avg_score if avg_score is not None else nan,
+            )
+            for entry_id, ranking_place, ranking_sequence, avg_score in rows
+        )
+
+        for previous_row, row in zip(packed_rows, packed_rows[1:]):
+            if previous_row[:ENTRY_ID_SIZE] == row[:ENTRY_ID_SIZE]:
+                raise ValueError(f"Entry '{row[:ENTRY_ID_SIZE].hex()}' is more than once in the ranking")
+
+        return RankingSnapshot(b"".join(packed_rows))
+
+    def __len__(self) -> int:
+        return len(self.data) // SNAPSHOT_ROW.size
+
+    def rows(self) -> Iterator[RankingRow]:
+        """
+        :return: (entry id, ranking place, ranking sequence, average score) of every entry, in entry id order
+        """
+        return map(unpack_row, SNAPSHOT_ROW.iter_unpack(self.data))
+
+    def diff(self, current: "RankingSnapshot") -> list[RankingRowChange]:
+        """
+        :param current: Snapshot of a later run
+        :return: Rows of the entries whose place, sequence or average score changed from this snapshot to the current
+            one, and of the entries only in one of them, in entry id order
+        """
+        previous_data, current_data = self.data, current.data
+        row_size = SNAPSHOT_ROW.size
+        changes: list[RankingRowChange] = []
+
+        if previous_data == current_data:
+            return changes
+
+        previous_offset, current_offset = 0, 0
+
+        while previous_offset < len(previous_data) and current_offset < len(current_data):
+            previous_id = previous_data[previous_offset : previous_offset + ENTRY_ID_SIZE]
+            current_id = current_data[current_offset : current_offset + ENTRY_ID_SIZE]
+
+            if previous_id == current_id:
+                previous_row = previous_data[previous_offset : previous_offset + row_size]
+                current_row = current_data[current_offset : current_offset + row_size]
+
+                if previous_row != current_row:
+                    changes.append(
+                        RankingRowChange(
+                            previous_id.hex(),
+                            unpack_row(SNAPSHOT_ROW.unpack(previous_row)),
+                            unpack_row(SNAPSHOT_ROW.unpack(current_row)),
+                        )
+                    )
+
+                previous_offset += row_size
+                current_offset += row_size
+            elif previous_id < current_id:
+                changes.append(RankingRowChange(previous_id.hex(), self.row_at(previous_offset), None))
+                previous_offset += row_size
+            else:
+                changes.append(RankingRowChange(current_id.hex(), None, current.row_at(current_offset)))
+                current_offset += row_size
+
+        for offset in range(previous_offset, len(previous_data), row_size):
+            changes.append(
+                RankingRowChange(previous_data[offset : offset + ENTRY_ID_SIZE].hex(), self.row_at(offset), None)
+            )
+
+        for offset in range(current_offset, len(current_data), row_size):
+            changes.append(
+                RankingRowChange(current_data[offset : offset + ENTRY_ID_SIZE].hex(), None, current.row_at(offset))
+            )
+
+        return changes
+
+    def row_at(self, offset: int) -> RankingRow:
+        return unpack_row(SNAPSHOT_ROW.unpack_from(self.data, offset))
+
+
+def unpack_row(packed_row: tuple[bytes, int, int, float]) -> RankingRow:
+    entry_id, ranking_place, ranking_sequence, avg_score = packed_row
+
+    return entry_id.hex(), ranking_place or None, ranking_sequence or None, avg_score if not isnan(avg_score) else None
+
+
+def changed_ranking_sequences(changes: list[RankingRowChange]) -> list[int]:
+    """
+    :return: Ranking sequences, before or after the changes, of the changed entries (the ones to re-render downstream)
+    """
+    sequences: set[int] = set()
+
+    for change in changes:
+        for row in (change.previous, change.current):
+            if row is not None and row[2] is not None:
+                sequences.add(row[2])
+
+    return sorted(sequences)
+
+
+def save_ranking_snapshot(snapshot: RankingSnapshot, origin: RankingRunOrigin) -> int:
+    """
+    :return: Id of the new ranking run
+    """
+    inserted_run = RankingRun.ORM.create(**vars(RankingRun.Insert(origin=origin, snapshot=snapshot.data)))
+
+    return cast(int, inserted_run.id)
+
+
+def load_ranking_run(run_id: int | None = None) -> RankingRun:
+    """
+    :param run_id: Id of the ranking run, the latest one if None
+    """
+    query = RankingRun.ORM.select()
+    run = (
+        query.where(RankingRun.ORM.id == run_id).first()
+        if run_id is not None
+        else query.order_by(RankingRun.ORM.id.desc()).first()
+    )
+
+    if run is None:
+        raise ValueError(f"Ranking run '{run_id}' not found" if run_id is not None else "No ranking runs stored yet")
+
+    return run.to_domain()
+
+
+def load_latest_ranking_run_ids(count: int) -> list[int]:
+    """
+    :return: Ids of the latest 'count' ranking runs, oldest first
+    """
+    latest_runs = RankingRun.ORM.select(RankingRun.ORM.id).order_by(RankingRun.ORM.id.desc()).limit(count)
+
+    return [run.id for run in latest_runs][::-1]
@@ -1,26 +1,78 @@
-from peewee import PeeweeException
+from types import MappingProxyType
+from typing import Iterable, Mapping, cast
 
-from common.model.models import SETTING_KEY_SEPARATOR, Setting, SettingKeys
+from common.model.models import SETTING_KEY_SEPARATOR, Setting, SettingKeys, SettingValueTypeSpec
 
 
-def get_setting_by_key(key: SettingKeys) -> Setting | None:
-    key_bits = key.split(SETTING_KEY_SEPARATOR)
+class SettingsSnapshot:
+    """
+    Immutable view of the whole settings table, loaded with a single query. Meant to be loaded once per stage run and
+    passed down explicitly, so hot loops don't hit the DB for every lookup
+    """
 
-    if len(key_bits) != 2:
-        raise ValueError(f"Invalid settings key '{key}'")
+    _settings: Mapping[str, Setting]
 
-    group_key, setting = key_bits
+    def __init__(self, settings: Iterable[Setting]):
+        self._settings = MappingProxyType(
+            {f"{setting.group_key}{SETTING_KEY_SEPARATOR}{setting.setting}": setting for setting in settings}
+        )
 
-    try:
-        setting_entity = Setting.ORM.get((Setting.ORM.group_key == group_key) & (Setting.ORM.setting == setting))
-    except PeeweeException as err:
-        print(err)
-        return None
+    def get(self, key: SettingKeys) -> Setting | None:
+        return self._settings.get(key)
 
-    return setting_entity.to_domain()
+    def is_set(self, key: SettingKeys) -> bool:
+        setting = self._settings.get(key)
 
+        return setting is not None and setting.value is not None
 
-def is_setting_set(key: SettingKeys) -> bool:
-    setting = get_setting_by_key(key)
+    def with_settings(self, settings: Iterable[Setting]) -> "SettingsSnapshot":
+        """
+        :return: Another snapshot with these settings on top (replacing the ones with the same key)
+        """
+        return SettingsSnapshot([*self._settings.values(), *settings])
 
-    return setting is not None and setting.value is not None
+    def value(self, key: SettingKeys) -> SettingValueTypeSpec:
+        if not self.is_set(key):
+            raise ValueError(f"Setting '{key}' not set")
+
+        return self._settings[key].value
+
+    @property
+    def round_count(self) -> int:
+        return cast(int, self.value(SettingKeys.GLOBAL_ROUND_COUNT))
+
+    @property
+    def score_min_value(self) -> float:
+        return cast(float, self.value(SettingKeys.VALIDATION_SCORE_MIN_VALUE))
+
+    @property
+    def score_max_value(self) -> float:
+        return cast(float, self.value(SettingKeys.VALIDATION_SCORE_MAX_VALUE))
+
+    @property
+    def entry_video_duration_seconds(self) -> int:
+        return cast(int, self.value(SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS))
+
+    @property
+    def significant_decimal_digits(self) -> int:
+        return cast(int, self.value(SettingKeys.RANKING_SIGNIFICANT_DECIMAL_DIGITS))
+
+    @property
+    def frame_width_px(self) -> int:
+        return cast(int, self.value(SettingKeys.FRAME_WIDTH_PX))
+
+    @property
+    def frame_height_px(self) -> int:
+        return cast(int, self.value(SettingKeys.FRAME_HEIGHT_PX))
+
+    @property
+    def videoclips_override_top_n_duration(self) -> int:
+        return cast(int, self.value(SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_TOP_N_DURATION))
+
+    @property
+    def videoclips_override_duration_up_to_x_seconds(self) -> int:
+        return cast(int, self.value(SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_DURATION_UP_TO_X_SECONDS))
+
+
+def load_settings_snapshot() -> SettingsSnapshot:
+    return SettingsSnapshot(setting.to_domain() for setting in Setting.ORM.select())
@@ -0,0 +1,136 @@
+from array import array
+from typing import Iterator
+
+NO_TIMESTAMP = -1
+
+type ScoreRow = tuple[int, int, float]
+type EntryRow = tuple[int, int, str | None, int, int, str | None]
+
+
+class SubmissionStore:
+    """
+    Columnar store of the submissions of an edition. Contestant names and entry titles are interned into integer ids,
+    and each (contestant, entry) scoring is a row spread over typed arrays (contestant id, title id, score, author
+    flag), so a row takes a few bytes instead of a dataclass instance per pipeline step. What only authors provide
+    (video URL, timestamp, topic) is kept once per entry, with timestamps as seconds (NO_TIMESTAMP if missing)
+    """
+
+    contestant_names: list[str]
+    titles: list[str]
+
+    # Scoring rows
+
+    row_contestants: array
+    row_titles: array
+    row_scores: array
+    row_author_flags: bytearray
+
+    # Authored entries, in order of appearance
+
+    entry_titles: array
+    entry_authors: array
+    entry_video_urls: list[str | None]
+    entry_timestamp_starts: array
+    entry_timestamp_ends: array
+    entry_topics: list[str | None]
+
+    _contestant_ids: dict[str, int]
+    _title_ids: dict[str, int]
+
+    def __init__(self):
+        self.contestant_names = []
+        self.titles = []
+
+        self.row_contestants = array("I")
+        self.row_titles = array("I")
+        self.row_scores = array("d")
+        self.row_author_flags = bytearray()
+
+        self.entry_titles = array("I")
+        self.entry_authors = array("I")
+        self.entry_video_urls = []
+        self.entry_timestamp_starts = array("i")
+        self.entry_timestamp_ends = array("i")
+        self.entry_topics = []
+
+        self._contestant_ids = {}
+        self._title_ids = {}
+
+    def __len__(self) -> int:
+        return len(self.row_scores)
+
+    @property
+    def row_size(self) -> int:
+        """
+        Bytes taken by each scoring row
+        """
+        return (
+            self.row_contestants.itemsize + self.row_titles.itemsize + self.row_scores.itemsize + 1  # Author flag
+        )
+
+    def add_contestant(self, name: str) -> int:
+        """
+        :return: Id of the contestant, interning the name if it is new
+        """
+        if (contestant_id := self._contestant_ids.get(name)) is None:
+            contestant_id = self._contestant_ids[name] = len(self.contestant_names)
+            self.contestant_names.append(name)
+
+        return contestant_id
+
+    def add_title(self, title: str) -> int:
+        """
+        :return: Id of the entry title, interning it if it is new
+        """
+        if (title_id := self._title_ids.get(title)) is None:
+            title_id = self._title_ids[title] = len(self.titles)
+            self.titles.append(title)
+
+        return title_id
+
+    def contestant_id(self, name: str) -> int:
+        return self._contestant_ids[name]
+
+    def title_id(self, title: str) -> int:
+        return self._title_ids[title]
+
+    def append_score(self, contestant_id: int, title_id: int, score: float, is_author: bool) -> None:
+        self.row_contestants.append(contestant_id)
+        self.row_titles.append(title_id)
+        self.row_scores.append(score)
+        self.row_author_flags.append(is_author)
+
+    def append_entry(
+        self,
+        title_id: int,
+        author_id: int,
+        video_url: str | None,
+        timestamp_start: int = NO_TIMESTAMP,
+        timestamp_end: int = NO_TIMESTAMP,
+        topic: str | None = None,
+    ) -> None:
+        self.entry_titles.append(title_id)
+        self.entry_authors.append(author_id)
+        self.entry_video_urls.append(video_url)
+        self.entry_timestamp_starts.append(timestamp_start)
+        self.entry_timestamp_ends.append(timestamp_end)
+        self.entry_topics.append(topic)
+
+    def scores(self) -> Iterator[ScoreRow]:
+        """
+        :return: (contestant id, title id, score) of every scoring row, in insertion order
+        """
+        return zip(self.row_contestants, self.row_titles, self.row_scores)
+
+    def entries(self) -> Iterator[EntryRow]:
+        """
+        :return: (title id, author id, video URL, timestamp start, timestamp end, topic) of every authored entry
+        """
+        return zip(
+            self.entry_titles,
+            self.entry_authors,
+            self.entry_video_urls,
+            self.entry_timestamp_starts,
+            self.entry_timestamp_ends,
+            self.entry_topics,
+        )
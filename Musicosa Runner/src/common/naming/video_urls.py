@@ -0,0 +1,92 @@
+import re
+from functools import cache
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+YOUTUBE_HOSTS = {"youtube.com", "music.youtube.com", "youtube-nocookie.com", "youtu.be"}
+VIMEO_HOSTS = {"vimeo.com", "player.vimeo.com"}
+DAILYMOTION_HOSTS = {"dailymotion.com", "dai.ly"}
+BILIBILI_HOSTS = {"bilibili.com"}
+
+YOUTUBE_VIDEO_ID_REGEX = re.compile(r"^[A-Za-z0-9_-]{11}$")
+YOUTUBE_PATH_VIDEO_ID_REGEX = re.compile(r"^/(?:embed|shorts|live|v|e)/([A-Za-z0-9_-]{11})(?:[/?]|$)")
+VIMEO_PATH_VIDEO_ID_REGEX = re.compile(r"/(\d+)(?:/|$)")
+DAILYMOTION_PATH_VIDEO_ID_REGEX = re.compile(r"^/(?:video/|embed/video/)?(x[0-9a-z]+)", re.IGNORECASE)
+BILIBILI_PATH_VIDEO_ID_REGEX = re.compile(r"^/video/(BV[0-9A-Za-z]{10}|av\d+)", re.IGNORECASE)
+
+TRACKING_QUERY_PARAMS = {"si", "feature", "pp", "fbclid", "gclid", "igshid", "ref", "ref_src", "share"}
+TRACKING_QUERY_PARAM_PREFIXES = ("utm_",)
+STRIPPED_HOST_PREFIXES = ("www.", "m.")
+
+
+@cache
+def canonical_video_key(video_url: str) -> str | None:
+    """
+    Get a stable key identifying the video a URL points to, regardless of its shape (short links, embeds, mobile
+    hosts, tracking parameters...). Pure parsing, no network access. Memoized, so it can be called for every entry
+    :param video_url: Video URL
+    :return: '<provider>:<video id>' for known providers (youtube, vimeo, dailymotion, bilibili), 'url:<normalized
+        URL>' for the rest, or None if it isn't an absolute URL
+    """
+    url = video_url.strip()
+
+    if "://" not in url:
+        url = f"https://{url}"
+
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return None
+
+    host = (parts.hostname or "").lower()
+
+    for prefix in STRIPPED_HOST_PREFIXES:
+        host = host.removeprefix(prefix)
+
+    if not host or "." not in host:
+        return None
+
+    query = parse_qsl(parts.query, keep_blank_values=True)
+
+    if host in YOUTUBE_HOSTS and (video_id := youtube_video_id(host, parts.path, query)):
+        return f"youtube:{video_id}"
+
+    if host in VIMEO_HOSTS and (match := VIMEO_PATH_VIDEO_ID_REGEX.search(parts.path)):
+        return f"vimeo:{match.group(1)}"
+
+    if host in DAILYMOTION_HOSTS and (match := DAILYMOTION_PATH_VIDEO_ID_REGEX.match(parts.path)):
+        return f"dailymotion:{match.group(1).lower()}"
+
+    if host in BILIBILI_HOSTS and (match := BILIBILI_PATH_VIDEO_ID_REGEX.match(parts.path)):
+        return f"bilibili:{match.group(1)}"
+
+    kept_query = sorted(
+        (name, value)
+        for name, value in query
+        if name.lower() not in TRACKING_QUERY_PARAMS and not name.lower().startswith(TRACKING_QUERY_PARAM_PREFIXES)
+    )
+    path = parts.path.rstrip("/")
+    port_suffix = f":{port}" if port and port not in (80, 443) else ""
+
+    return f"url:{host}{port_suffix}{path}{f'?{urlencode(kept_query)}' if kept_query else ''}"
+
+
+def youtube_video_id(host: str, path: str, query: list[tuple[str, str]]) -> str | None:
+    if host == "youtu.be":
+        video_id = path.strip("/").split("/", 1)[0]
+        return video_id if YOUTUBE_VIDEO_ID_REGEX.match(video_id) else None
+
+    if match := YOUTUBE_PATH_VIDEO_ID_REGEX.match(path):
+        return match.group(1)
+
+    params = dict(query)
+
+    if (video_id := params.get("v", "")) and YOUTUBE_VIDEO_ID_REGEX.match(video_id):
+        return video_id
+
+    # Attribution links wrap the watch URL in a parameter: /attribution_link?u=/watch%3Fv%3D<id>
+    if path == "/attribution_link" and (wrapped_url := params.get("u")):
+        wrapped_parts = urlsplit(unquote(wrapped_url))
+        return youtube_video_id(host, wrapped_parts.path, parse_qsl(wrapped_parts.query))
+
+    return None
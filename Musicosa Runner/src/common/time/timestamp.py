@@ -0,0 +1,85 @@
+import re
+from dataclasses import dataclass
+from functools import cache
+
+from common.constants import VIDEO_TIMESTAMP_SEPARATOR
+
+TIME_STR_REGEX = re.compile(r"^(?:([0-9]{0,2}):)?([0-9]{0,2}):([0-9]{2})(?:[.,][0-9]+)?$")
+
+
+@dataclass(frozen=True, slots=True, order=True)
+class Timestamp:
+    """
+    Point in a video, in whole seconds. Its text form is 'HH:MM:SS', as stored in the DB
+    """
+
+    seconds: int
+
+    def __str__(self) -> str:
+        return f"{self.seconds // 3600:02}:{self.seconds % 3600 // 60:02}:{self.seconds % 60:02}"
+
+
+@dataclass(frozen=True, slots=True)
+class ClipRange:
+    """
+    Segment of a video. Its text form is 'HH:MM:SS-HH:MM:SS'
+    """
+
+    start: Timestamp
+    end: Timestamp
+
+    @property
+    def duration(self) -> int:
+        return self.end.seconds - self.start.seconds
+
+    def __str__(self) -> str:
+        return f"{self.start}{VIDEO_TIMESTAMP_SEPARATOR}{self.end}"
+
+
+@cache
+def parse_timestamp(time_str: str) -> Timestamp | None:
+    """
+    :param time_str: Time in '[HH:]MM:SS' format (hours and minutes can be a single digit or empty, and fractions of
+        a second are truncated)
+    :return: The timestamp, or None if the format or the values are invalid
+    """
+    if not (match := TIME_STR_REGEX.match(time_str)):
+        return None
+
+    hours, minutes, seconds = int(match.group(1) or 0), int(match.group(2) or 0), int(match.group(3))
+
+    if hours > 23 or minutes > 59 or seconds > 59:
+        return None
+
+    return Timestamp(hours * 3600 + minutes * 60 + seconds)
+
+
+@cache
+def parse_clip_range(clip_range_str: str) -> ClipRange | None:
+    """
+    :param clip_range_str: Segment in '[HH:]MM:SS-[HH:]MM:SS' format (spaces are ignored)
+    :return: The clip range, or None if any of its timestamps is invalid. The order of the timestamps isn't checked
+    """
+    clip_range_bits = clip_range_str.replace(" ", "").split(VIDEO_TIMESTAMP_SEPARATOR)
+
+    if len(clip_range_bits) != 2:
+        return None
+
+    start, end = parse_timestamp(clip_range_bits[0]), parse_timestamp(clip_range_bits[1])
+
+    return ClipRange(start, end) if start is not None and end is not None else None
+
+
+def validate_clip_range_str(clip_range_str: str, duration: int | None = None) -> bool:
+    """
+    :param duration: Seconds the clip range must last, if any
+    """
+    clip_range = parse_clip_range(clip_range_str)
+
+    if clip_range is None or clip_range.start >= clip_range.end:
+        return False
+
+    if duration and clip_range.duration != duration:
+        return False
+
+    return True
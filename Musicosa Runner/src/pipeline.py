@@ -2,18 +2,17 @@ import argparse
 import functools
 import inspect
 import random
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from time import sleep
-from typing import Any, Literal, Never, Protocol
+from typing import Any, Literal, Never, Protocol, cast
 
 from peewee import PeeweeException
 
 from common.config.config import Config
 from common.config.loader import load_config
-from common.constants import VIDEO_TIMESTAMP_SEPARATOR
 from common.custom_types import STAGE_FIVE, STAGE_FOUR, STAGE_ONE, STAGE_SIX, STAGE_THREE, STAGE_TWO, TemplateType
 from common.db.database import db
-from common.db.peewee_helpers import bulk_pack
+from common.db.peewee_helpers import bulk_write, bulk_write_rows
 from common.formatting.tabulate import tab
 from common.input.better_input import better_input
 from common.model.metadata import get_metadata_by_field
@@ -23,6 +22,7 @@ from common.model.models import (
     ContestantStats,
     Entry,
     EntryStats,
+    EntryStrategyStats,
     EntryTopic,
     MetadataFields,
     Scoring,
@@ -30,23 +30,35 @@ from common.model.models import (
     Template,
     VideoOptions,
 )
+from common.model.ranking_snapshot import RankingSnapshot, save_ranking_snapshot
+from common.model.settings import load_settings_snapshot
+from common.model.submission_store import NO_TIMESTAMP, SubmissionStore
 from common.naming.identifiers import generate_contestant_uuid5, generate_entry_uuid5
-from common.time.utils import parse_time
+from common.naming.video_urls import canonical_video_key
+from common.time.timestamp import ClipRange, Timestamp
 from stage_1_validation.custom_types import ContestantSubmission, StageOneInput, StageOneOutput
 from stage_1_validation.execute import execute as execute_stage_1
-from stage_1_validation.stage_input import get_entry_topics_from_db, get_submissions_from_forms_folder, get_valid_titles
+from stage_1_validation.logic.helpers import build_submission_store
+from stage_1_validation.logic.validation import IncrementalValidator
+from stage_1_validation.stage_input import (
+    get_entry_topics_from_db,
+    get_submissions,
+    get_valid_titles,
+    open_parsed_forms_cache,
+)
 from stage_1_validation.summary import stage_summary as stage_1_summary
 from stage_2_ranking.custom_types import Contestant as S2_Contestant
 from stage_2_ranking.custom_types import Entry as S2_Entry
 from stage_2_ranking.custom_types import Musicosa as S2_Musicosa
-from stage_2_ranking.custom_types import Score as S2_Score
-from stage_2_ranking.custom_types import StageTwoInput, StageTwoOutput
+from stage_2_ranking.custom_types import RankingEngine, RankingStrategy, StageTwoInput, StageTwoOutput
 from stage_2_ranking.execute import execute as execute_stage_2
+from stage_2_ranking.snapshots import take_ranking_snapshot
 from stage_2_ranking.stage_input import load_musicosa_from_db as load_s2_musicosa_from_db
 from stage_2_ranking.summary import stage_summary as stage_2_summary
 from stage_3_templates_pre_gen.custom_types import Musicosa as S3_Musicosa
 from stage_3_templates_pre_gen.custom_types import StageThreeInput, StageThreeOutput
 from stage_3_templates_pre_gen.execute import execute as execute_stage_3
+from stage_3_templates_pre_gen.fulfillment_file import load_fulfillment_file
 from stage_3_templates_pre_gen.stage_input import load_avatars_from_db
 from stage_3_templates_pre_gen.stage_input import load_musicosa_from_db as load_s3_musicosa_from_db
 from stage_3_templates_pre_gen.summary import stage_summary as stage_3_summary
@@ -59,7 +71,7 @@ from stage_5_videoclips_acquisition.custom_types import StageFiveInput, StageFiv
 from stage_5_videoclips_acquisition.execute import execute as execute_stage_5
 from stage_5_videoclips_acquisition.stage_input import load_entries_from_db
 from stage_5_videoclips_acquisition.summary import stage_summary as stage_5_summary
-from stage_6_video_gen.custom_types import EntryVideoOptions, StageSixInput, StageSixOutput, Timestamp
+from stage_6_video_gen.custom_types import EntryVideoOptions, StageSixInput, StageSixOutput
 from stage_6_video_gen.execute import execute as execute_stage_6
 from stage_6_video_gen.stage_input import load_entries_video_options_from_db
 from stage_6_video_gen.summary import stage_summary as stage_6_summary
@@ -333,9 +345,11 @@ class PipelineStateManager:
     new_avatars_paired: list[tuple[Contestant, Avatar.Insert]]
     contestants: list[Contestant]
     entries: list[Entry]
-    scoring_entries: list[Scoring]
+    submission_store: SubmissionStore
     contestant_stats_collection: list[ContestantStats]
     entry_stats_collection: list[EntryStats]
+    entry_strategy_stats_collection: list[EntryStrategyStats]
+    ranking_snapshot: RankingSnapshot | None
     templates: list[Template]
     settings: list[Setting]
     video_options: list[VideoOptions]
@@ -350,9 +364,11 @@ class PipelineStateManager:
         self.new_avatars_paired = []
         self.contestants = []
         self.entries = []
-        self.scoring_entries = []
+        self.submission_store = SubmissionStore()
         self.contestant_stats_collection = []
         self.entry_stats_collection = []
+        self.entry_strategy_stats_collection = []
+        self.ranking_snapshot = None
         self.templates = []
         self.settings = []
         self.video_options = []
@@ -370,6 +386,16 @@ class PipelineStateManager:
         entries = [entry.to_domain() for entry in Entry.ORM.select()]
         self.entries_by_title = dict([(entry.title, entry) for entry in entries])
 
+    def scoring_rows(self) -> Iterator[tuple[str, str, float]]:
+        store = self.submission_store
+        contestant_ids = [self.contestants_by_name[name].id for name in store.contestant_names]
+        entry_ids = [self.entries_by_title[title].id for title in store.titles]
+
+        return (
+            (contestant_ids[contestant_id], entry_ids[title_id], score)
+            for contestant_id, title_id, score in store.scores()
+        )
+
     def checkpoint(self):
         with db.atomic() as tx:
             try:
@@ -379,90 +405,88 @@ class PipelineStateManager:
                         self.contestants_by_name[contestant.name].avatar = inserted_avatar.to_domain()
 
                 if len(self.contestants) > 0:
-                    Contestant.ORM.replace_many(bulk_pack(self.contestants)).execute()
+                    bulk_write(Contestant, self.contestants, replace=True)
 
                 if len(self.entries) > 0:
-                    Entry.ORM.replace_many(bulk_pack(self.entries)).execute()
-
-                if len(self.scoring_entries) > 0:
-                    Scoring.ORM.replace_many(bulk_pack(self.scoring_entries)).execute()
+                    bulk_write(Entry, self.entries, replace=True)
+
+                if len(self.submission_store) > 0:
+                    bulk_write_rows(
+                        Scoring.ORM,
+                        [Scoring.ORM.contestant, Scoring.ORM.entry, Scoring.ORM.score],
+                        self.scoring_rows(),
+                        replace=True,
+                    )
 
                 if len(self.contestant_stats_collection) > 0:
-                    ContestantStats.ORM.replace_many(bulk_pack(self.contestant_stats_collection)).execute()
+                    bulk_write(ContestantStats, self.contestant_stats_collection, replace=True)
 
                 if len(self.entry_stats_collection) > 0:
-                    EntryStats.ORM.replace_many(bulk_pack(self.entry_stats_collection)).execute()
+                    bulk_write(EntryStats, self.entry_stats_collection, replace=True)
+
+                if self.ranking_snapshot is not None:
+                    # A new ranking, the rankings by strategies no longer configured are cleared as well
+                    EntryStrategyStats.ORM.delete().execute()
+
+                if len(self.entry_strategy_stats_collection) > 0:
+                    bulk_write(EntryStrategyStats, self.entry_strategy_stats_collection, replace=True)
+
+                if self.ranking_snapshot is not None:
+                    save_ranking_snapshot(self.ranking_snapshot, "ranking")
 
                 if len(self.settings) > 0:
-                    Setting.ORM.replace_many(bulk_pack(self.settings)).execute()
+                    bulk_write(Setting, self.settings, replace=True)
 
                 if len(self.templates) > 0:
-                    Template.ORM.replace_many(bulk_pack(self.templates)).execute()
+                    bulk_write(Template, self.templates, replace=True)
 
                 if len(self.video_options) > 0:
-                    VideoOptions.ORM.replace_many(bulk_pack(self.video_options)).execute()
+                    bulk_write(VideoOptions, self.video_options, replace=True)
             except PeeweeException as error:
                 tx.rollback()
                 raise RuntimeError(f"DB transaction was rolled back due to an error: {error}") from error
 
     def register_submissions(self, submissions: list[ContestantSubmission]) -> None:
-        # First iteration. Register new contestants and entries
-        for sub in submissions:
-            new_contestant = Contestant(id=generate_contestant_uuid5(sub.name).hex, name=sub.name, avatar=None)
+        store = build_submission_store(submissions)
+        self.submission_store = store
+
+        # Register contestants and entries. Scores stay in the store columns
+        for name in store.contestant_names:
+            new_contestant = Contestant(id=generate_contestant_uuid5(name).hex, name=name, avatar=None)
 
             self.contestants.append(new_contestant)
-            self.contestants_by_name[sub.name] = new_contestant
-
-            for entry in sub.entries:
-                if entry.is_author:
-                    entry_topic = EntryTopic(designation=entry.topic) if entry.topic else None
-
-                    new_entry = Entry(
-                        id=generate_entry_uuid5(entry.title).hex,
-                        title=entry.title,
-                        author=new_contestant,
-                        video_url=entry.video_url,  # pyright: ignore [reportArgumentType]
-                        topic=entry_topic,
-                    )
+            self.contestants_by_name[name] = new_contestant
+
+        for title_id, author_id, video_url, timestamp_start, timestamp_end, topic in store.entries():
+            title = store.titles[title_id]
+            entry_topic = EntryTopic(designation=topic) if topic else None
+
+            new_entry = Entry(
+                id=generate_entry_uuid5(title).hex,
+                title=title,
+                author=self.contestants_by_name[store.contestant_names[author_id]],
+                video_url=video_url,  # pyright: ignore [reportArgumentType]
+                video_key=canonical_video_key(video_url) if video_url else None,
+                topic=entry_topic,
+            )
 
-                    if entry.video_timestamp:
-                        start, end = entry.video_timestamp.split(VIDEO_TIMESTAMP_SEPARATOR)
-                        self.video_options.append(
-                            VideoOptions(
-                                entry=new_entry, timestamp_start=parse_time(start), timestamp_end=parse_time(end)
-                            )
-                        )
-
-                    self.entries.append(new_entry)
-                    self.entries_by_title[entry.title] = new_entry
-
-        # Second iteration. Register scores with helper indices
-        for sub in submissions:
-            for entry in sub.entries:
-                self.scoring_entries.append(
-                    Scoring(
-                        contestant=self.contestants_by_name[sub.name],
-                        entry=self.entries_by_title[entry.title],
-                        score=entry.score,
+            if timestamp_start != NO_TIMESTAMP:
+                self.video_options.append(
+                    VideoOptions(
+                        entry=new_entry,
+                        timestamp_start=Timestamp(timestamp_start),
+                        timestamp_end=Timestamp(timestamp_end),
                     )
                 )
 
-    def produce_stage_2_input(self) -> StageTwoInput:
-        s2_contestants: list[S2_Contestant] = []
-
-        for contestant in self.contestants:
-            contestant_scorings = [s for s in self.scoring_entries if s.contestant.id == contestant.id]  # pyright: ignore [reportOptionalMemberAccess]
-
-            s2_contestants.append(
-                S2_Contestant(
-                    name=contestant.name,
-                    scores=[S2_Score(scoring.entry.title, scoring.score) for scoring in contestant_scorings],
-                )
-            )
+            self.entries.append(new_entry)
+            self.entries_by_title[title] = new_entry
 
+    def produce_stage_2_input(self) -> StageTwoInput:
+        s2_contestants = [S2_Contestant(contestant.name) for contestant in self.contestants]
         s2_entries = [S2_Entry(entry.title, entry.author.name) for entry in self.entries]  # pyright: ignore [reportOptionalMemberAccess]
 
-        return StageTwoInput(S2_Musicosa(s2_contestants, s2_entries))
+        return StageTwoInput(S2_Musicosa(s2_contestants, s2_entries, self.submission_store))
 
     def register_stage_2_output(self, stage_output: StageTwoOutput) -> None:
         self.contestant_stats_collection.extend(
@@ -488,6 +512,21 @@ class PipelineStateManager:
             ]
         )
 
+        self.entry_strategy_stats_collection.extend(
+            [
+                EntryStrategyStats(
+                    entry=self.entries_by_title[stat.entry.title],
+                    strategy=stat.strategy,
+                    score=stat.score,
+                    ranking_place=stat.ranking_place,
+                    ranking_sequence=stat.ranking_sequence,
+                )
+                for stat in stage_output.strategies_stats
+            ]
+        )
+
+        self.ranking_snapshot = take_ranking_snapshot(stage_output.entries_stats)
+
     def produce_stage_3_input(self) -> StageThreeInput:
         unfulfilled_contestants = [c for c in self.contestants if c.avatar is None]
 
@@ -571,7 +610,11 @@ class PipelineStateManager:
                     entry_title=entry_title,
                     ranking_place=ranking_place,  # pyright: ignore [reportArgumentType]
                     sequence_number=sequence_number,  # pyright: ignore [reportArgumentType]
-                    timestamp=Timestamp(start=str(video_options.timestamp_start), end=str(video_options.timestamp_end)),
+                    timestamp=(
+                        ClipRange(video_options.timestamp_start, video_options.timestamp_end)
+                        if video_options.timestamp_start is not None and video_options.timestamp_end is not None
+                        else None
+                    ),
                     width=template.video_box_width_px,
                     height=template.video_box_height_px,
                     position_top=template.video_box_position_top_px,
@@ -589,6 +632,7 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser()
     parser.add_argument("--config_file")
+    parser.add_argument("--clear_parsing_cache", action="store_true")
     arguments = parser.parse_args()
 
     configuration_file = arguments.config_file.strip() if arguments.config_file else None
@@ -618,11 +662,27 @@ if __name__ == "__main__":
 
     # STAGE 1
 
+    # Opened once, so retries and data reloads only re-parse the forms that changed since the previous attempt
+    parsed_forms_cache = (
+        open_parsed_forms_cache(
+            configuration.stage_1.parsing_cache_file, configuration.stage_1.parsing_cache_hash_contents
+        )
+        if configuration.start_from <= STAGE_ONE
+        else None
+    )
+
+    if parsed_forms_cache and arguments.clear_parsing_cache:
+        parsed_forms_cache.invalidate()
+
+    # Kept across attempts too, so only the submissions that changed since the previous attempt get revalidated
+    stage_1_validator = IncrementalValidator()
+
     @retry_or_reconfig(err_header="[Stage 1 | Input collection ERROR]", config_loader=configuration_loader)
     def stage_1_collect_input(config: Config) -> StageOneInput:
-        submissions = get_submissions_from_forms_folder(
-            config.stage_1.forms_folder, config.stage_1.contestant_name_coords, config.stage_1.entries_data_coords
-        )
+        if parsed_forms_cache:
+            parsed_forms_cache.reset_stats()
+
+        submissions = get_submissions(config.stage_1, parsed_forms_cache)
         valid_titles = get_valid_titles(config.stage_1.forms_folder, config.stage_1.valid_titles_file)
         entry_topics = get_entry_topics_from_db()
 
@@ -634,13 +694,26 @@ if __name__ == "__main__":
         data_collector=stage_1_collect_input,
     )
     def stage_1_do_execute(config: Config, stage_input: StageOneInput) -> StageOneOutput:
-        result = execute_stage_1(stage_input)
+        result = execute_stage_1(
+            stage_input, load_settings_snapshot(), stage_1_validator, config.stage_2.ranking_engine == "sparse"
+        )
 
         if result.validation_errors:
             for validation_error in result.validation_errors:
                 print(validation_error)
 
-        print(stage_1_summary(config, stage_input))
+        if result.validation_warnings:
+            for validation_warning in result.validation_warnings:
+                print(validation_warning)
+
+        print(
+            stage_1_summary(
+                config,
+                stage_input,
+                parsed_forms_cache.stats if parsed_forms_cache else None,
+                stage_1_validator.revalidated_count,
+            )
+        )
 
         return result
 
@@ -656,16 +729,37 @@ if __name__ == "__main__":
 
     # STAGE 2
 
+    stage_2_ranking_engine: RankingEngine = cast(RankingEngine, configuration.stage_2.ranking_engine)
+
+    # Submissions validated in this run are only stored at the checkpoint (after Stage 3), so ranking inside the DB
+    # needs the pipeline to start from Stage 2
+    if stage_2_ranking_engine == "sqlite" and configuration.start_from < STAGE_TWO:
+        print("[Stage 2] The 'sqlite' ranking engine needs stored submissions (start from Stage 2). Using 'python'")
+        stage_2_ranking_engine = "python"
+
+    stage_2_ranking_strategies = cast(list[RankingStrategy], configuration.stage_2.ranking_strategies)
+
     @retry(err_header="[Stage 2 | Input collection ERROR]")
     def stage_2_collect_input() -> StageTwoInput:
         if configuration.start_from == STAGE_TWO:
-            return StageTwoInput(load_s2_musicosa_from_db())
+            return StageTwoInput(
+                load_s2_musicosa_from_db(
+                    load_scores=stage_2_ranking_engine != "sqlite" or bool(stage_2_ranking_strategies)
+                )
+            )
         else:
             return state_manager.produce_stage_2_input()
 
     @configless_stage(err_header="[Stage 2 | Execution ERROR]", data_collector=stage_2_collect_input)
     def stage_2_do_execute(stage_input: StageTwoInput) -> StageTwoOutput:
-        result = execute_stage_2(stage_input)
+        result = execute_stage_2(
+            stage_input,
+            load_settings_snapshot(),
+            stage_2_ranking_engine,
+            configuration.stage_2.min_votes,
+            stage_2_ranking_strategies,
+            configuration.stage_2.trimmed_mean_proportion,
+        )
 
         print(stage_2_summary(stage_input, result))
 
@@ -692,7 +786,11 @@ if __name__ == "__main__":
 
     @configless_stage(err_header="[Stage 3 | Execution ERROR]", data_collector=stage_3_collect_input)
     def stage_3_do_execute(stage_input: StageThreeInput) -> StageThreeOutput:
-        result = execute_stage_3(stage_input)
+        # Loaded on each attempt, so a mistake in the file can be fixed and retried
+        fulfillment_file = configuration.stage_3.fulfillment_file
+        fulfillment = load_fulfillment_file(fulfillment_file) if fulfillment_file else None
+
+        result = execute_stage_3(stage_input, load_settings_snapshot(), fulfillment)
 
         print(stage_3_summary(result))
 
@@ -743,7 +841,7 @@ if __name__ == "__main__":
         data_collector=stage_4_collect_input,
     )
     def stage_4_do_execute(config: Config, stage_input: StageFourInput) -> StageFourOutput:
-        result = execute_stage_4(config, stage_input)
+        result = execute_stage_4(config, stage_input, load_settings_snapshot())
 
         print(stage_4_summary(config, stage_input, result))
 
@@ -799,7 +897,7 @@ if __name__ == "__main__":
         data_collector=stage_6_collect_input,
     )
     def stage_6_do_execute(config: Config, stage_input: StageSixInput) -> StageSixOutput:
-        result = execute_stage_6(config, stage_input)
+        result = execute_stage_6(config, stage_input, load_settings_snapshot())
 
         print(stage_6_summary(config, stage_input, result))
 
@@ -1,5 +1,25 @@
 CSV_SEPARATOR = ";"
 CSV_FIELDS_COUNT = 6
+CONSOLIDATED_CSV_FIELDS_COUNT = 7
+CONSOLIDATED_CSV_HEADER = ["contestant", "title", "score", "author", "video_url", "video_timestamp", "topic"]
 
 ALLOWED_DECIMAL_SEPARATOR_CHARS = [",", "'"]
 NORMALIZED_DECIMAL_SEPARATOR_CHAR = "."
+
+PARSED_FORMS_CACHE_FORMAT_VERSION = 2
+
+XLSX_LOCK_FILE_PREFIX = "~$"
+
+WATCH_DEBOUNCE_SECONDS = 1.5
+WATCH_POLL_INTERVAL_SECONDS = 2.0
+
+XLSX_SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+XLSX_RELS_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+XLSX_PACKAGE_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+XLSX_OFFICE_DOCUMENT_REL_TYPE = f"{XLSX_RELS_NS}/officeDocument"
+XLSX_SHARED_STRINGS_REL_TYPE = f"{XLSX_RELS_NS}/sharedStrings"
+XLSX_STYLES_REL_TYPE = f"{XLSX_RELS_NS}/styles"
+XLSX_BUILTIN_DATE_NUM_FMT_IDS = frozenset([*range(14, 23), *range(27, 37), *range(45, 48), *range(50, 59)])
+
+TITLE_SUGGESTIONS_LIMIT = 3
+TITLE_SUGGESTION_MIN_SIMILARITY = 0.5
@@ -1,6 +1,12 @@
 from dataclasses import dataclass
+from typing import Iterable, Literal
 
 from common.model.models import EntryTopic
+from common.time.timestamp import ClipRange
+
+FormsFormat = Literal["xlsx", "xlsx_workbook", "consolidated_csv"]
+
+XlsxReader = Literal["stream", "openpyxl"]
 
 
 @dataclass
@@ -9,7 +15,7 @@ class ContestantSubmissionEntry:
     score: float
     is_author: bool
     video_url: str | None
-    video_timestamp: str | None
+    video_timestamp: ClipRange | None
     topic: str | None
 
 
@@ -29,3 +35,18 @@ class StageOneInput:
 @dataclass
 class StageOneOutput:
     validation_errors: list[str] | None
+    # Findings that don't make the submissions invalid (e.g. entries sharing a video)
+    validation_warnings: list[str] | None = None
+
+
+@dataclass
+class StageOneStreamInput:
+    submissions: Iterable[ContestantSubmission]
+    valid_titles: list[str]
+    entry_topics: list[EntryTopic] | None
+
+
+@dataclass
+class StageOneBatch:
+    submission: ContestantSubmission
+    validation_errors: list[str]
@@ -1,32 +1,85 @@
+from typing import Iterator
+
 from common.custom_types import StageException
 from common.model.models import SettingKeys
-from common.model.settings import is_setting_set
-from stage_1_validation.custom_types import StageOneInput, StageOneOutput
-from stage_1_validation.logic.validation import validate_contestant_submission_collection
+from common.model.settings import SettingsSnapshot
+from stage_1_validation.custom_types import StageOneBatch, StageOneInput, StageOneOutput, StageOneStreamInput
+from stage_1_validation.logic.validation import IncrementalValidator, StreamingValidator, build_validation_index
 
 
-def execute(stage_input: StageOneInput) -> StageOneOutput:
+def execute(
+    stage_input: StageOneInput,
+    settings: SettingsSnapshot,
+    validator: IncrementalValidator | None = None,
+    partial_ballots: bool = False,
+) -> StageOneOutput:
+    """
+    Validate the whole submission collection at once. With an incremental validator, only the submissions changed
+    since its previous run are validated again. Otherwise, the collection goes through the streaming execution
+    :param partial_ballots: Whether contestants score only some of the entries (Ranked by the 'sparse' engine)
+    """
     submissions, valid_titles, entry_topics = (
         stage_input.submissions,
         stage_input.valid_titles,
         stage_input.entry_topics,
     )
 
-    if not is_setting_set(SettingKeys.GLOBAL_ROUND_COUNT):
+    if validator is not None:
+        check_stage_requirements(valid_titles, settings)
+        validation_errors = validator.validate(
+            submissions, build_validation_index(valid_titles, entry_topics, settings, partial_ballots)
+        )
+
+        return StageOneOutput(validation_errors, validator.collection_warnings() or None)
+
+    stream_validator = StreamingValidator()
+    stream = execute_streaming(
+        StageOneStreamInput(submissions, valid_titles, entry_topics), settings, stream_validator, partial_ballots
+    )
+    submissions_errors = [batch.validation_errors for batch in stream]
+
+    # Same layout as the incremental validator: collection errors first, then each submission with its entry count
+    validation_errors = stream_validator.collection_errors()
+
+    for entry_count_error, submission_errors in zip(stream_validator.entry_count_errors(), submissions_errors):
+        if entry_count_error:
+            validation_errors.append(entry_count_error)
+
+        validation_errors.extend(submission_errors)
+
+    return StageOneOutput(validation_errors or None, stream_validator.collection_warnings() or None)
+
+
+def execute_streaming(
+    stage_input: StageOneStreamInput,
+    settings: SettingsSnapshot,
+    validator: StreamingValidator,
+    partial_ballots: bool = False,
+) -> Iterator[StageOneBatch]:
+    """
+    Validate the submissions one at a time, as they are pulled from the input. Each batch carries a submission and
+    its own validation errors. The errors of the whole collection are available from the validator once the stream
+    is exhausted
+    """
+    check_stage_requirements(stage_input.valid_titles, settings)
+    index = build_validation_index(stage_input.valid_titles, stage_input.entry_topics, settings, partial_ballots)
+
+    for submission in stage_input.submissions:
+        yield StageOneBatch(submission, validator.validate(submission, index))
+
+
+def check_stage_requirements(valid_titles: list[str], settings: SettingsSnapshot) -> None:
+    if not settings.is_set(SettingKeys.GLOBAL_ROUND_COUNT):
         raise StageException(f"Setting '{SettingKeys.GLOBAL_ROUND_COUNT}' not set")
 
-    if not is_setting_set(SettingKeys.VALIDATION_SCORE_MIN_VALUE):
+    if not settings.is_set(SettingKeys.VALIDATION_SCORE_MIN_VALUE):
         raise StageException(f"Setting '{SettingKeys.VALIDATION_SCORE_MIN_VALUE}' not set")
 
-    if not is_setting_set(SettingKeys.VALIDATION_SCORE_MAX_VALUE):
+    if not settings.is_set(SettingKeys.VALIDATION_SCORE_MAX_VALUE):
         raise StageException(f"Setting '{SettingKeys.VALIDATION_SCORE_MAX_VALUE}' not set")
 
-    if not is_setting_set(SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS):
+    if not settings.is_set(SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS):
         raise StageException(f"Setting '{SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS}' not set")
 
     if not valid_titles:
         raise StageException("Valid entry titles list is empty")
-
-    validation_errors = validate_contestant_submission_collection(submissions, valid_titles, entry_topics)
-
-    return StageOneOutput(validation_errors)
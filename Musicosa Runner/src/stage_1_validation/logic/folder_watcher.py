@@ -0,0 +1,186 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Callable
+
+from common.custom_types import StageException
+
+# inotify(7) constants
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+INOTIFY_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+INOTIFY_READ_SIZE = 64 * 1024
+
+type FileFilter = Callable[[str], bool]
+
+
+class FolderWatcher(ABC):
+    """
+    Blocking watcher of the files directly inside a folder. Subclasses tell how changes are detected
+    """
+
+    folder: str
+    file_filter: FileFilter
+
+    def __init__(self, folder: str, file_filter: FileFilter):
+        self.folder = folder
+        self.file_filter = file_filter
+
+    def wait_for_changes(self, debounce_seconds: float) -> set[str]:
+        """
+        Block until a file accepted by the filter changes, then keep collecting changes until the folder stays quiet
+        for the debounce period (so that a file written in several steps, or a batch of files, triggers one update)
+        :return: Names of the files created, modified, moved or deleted
+        """
+        while True:
+            changes = self._poll_changes(None)
+
+            while more_changes := self._poll_changes(debounce_seconds):
+                changes |= more_changes
+
+            if relevant_changes := {file for file in changes if self.file_filter(file)}:
+                return relevant_changes
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "FolderWatcher":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @abstractmethod
+    def _poll_changes(self, timeout: float | None) -> set[str]:
+        """
+        :param timeout: Seconds to wait for changes (forever if None)
+        :return: Names of the changed files, empty if none changed before the timeout
+        """
+
+
+class InotifyFolderWatcher(FolderWatcher):
+    _fd: int
+
+    def __init__(self, folder: str, file_filter: FileFilter):
+        super().__init__(folder, file_filter)
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+
+        if (fd := libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)) < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_init1 failed: {os.strerror(ctypes.get_errno())}")
+
+        if libc.inotify_add_watch(fd, os.fsencode(folder), INOTIFY_WATCH_MASK | IN_DELETE_SELF | IN_MOVE_SELF) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f"inotify_add_watch failed on '{folder}': {os.strerror(errno)}")
+
+        self._fd = fd
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _poll_changes(self, timeout: float | None) -> set[str]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+
+        if not readable:
+            return set()
+
+        try:
+            buffer = os.read(self._fd, INOTIFY_READ_SIZE)
+        except BlockingIOError:
+            return set()
+
+        changes: set[str] = set()
+        offset = 0
+
+        while offset < len(buffer):
+            _, mask, _, name_length = INOTIFY_EVENT_HEADER.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset : offset + name_length].rstrip(b"\0"))
+            offset += name_length
+
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                raise StageException(f"Watched folder '{self.folder}' was removed or moved")
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, so every file has to be considered changed
+                changes.update(os.listdir(self.folder))
+            elif name:
+                changes.add(name)
+
+        return changes
+
+
+class PollingFolderWatcher(FolderWatcher):
+    poll_interval: float
+    _snapshot: dict[str, tuple[int, int]]
+
+    def __init__(self, folder: str, file_filter: FileFilter, poll_interval: float):
+        super().__init__(folder, file_filter)
+
+        self.poll_interval = poll_interval
+        self._snapshot = self._take_snapshot()
+
+    def _poll_changes(self, timeout: float | None) -> set[str]:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        while True:
+            time.sleep(self.poll_interval if timeout is None else min(self.poll_interval, timeout))
+
+            snapshot = self._take_snapshot()
+            changes = {
+                file
+                for file in snapshot.keys() | self._snapshot.keys()
+                if snapshot.get(file) != self._snapshot.get(file)
+            }
+            self._snapshot = snapshot
+
+            if changes or (deadline is not None and time.monotonic() >= deadline):
+                return changes
+
+    def _take_snapshot(self) -> dict[str, tuple[int, int]]:
+        snapshot: dict[str, tuple[int, int]] = {}
+
+        with os.scandir(self.folder) as folder_entries:
+            for folder_entry in folder_entries:
+                try:
+                    if folder_entry.is_file():
+                        stat = folder_entry.stat()
+                        snapshot[folder_entry.name] = (stat.st_size, stat.st_mtime_ns)
+                except FileNotFoundError:
+                    continue
+
+        return snapshot
+
+
+def open_folder_watcher(folder: str, file_filter: FileFilter, poll_interval: float) -> FolderWatcher:
+    """
+    Watch a folder with inotify where available (Linux), falling back to polling its contents
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyFolderWatcher(folder, file_filter)
+        except (OSError, AttributeError):
+            pass
+
+    return PollingFolderWatcher(folder, file_filter, poll_interval)
@@ -1,5 +1,8 @@
 from typing import Iterable
 
+from common.model.submission_store import NO_TIMESTAMP, SubmissionStore
+from stage_1_validation.custom_types import ContestantSubmission
+
 
 def find_duplicates[T](collection: Iterable[T]) -> list[tuple[T, int]] | None:
     duplicates_registry: dict[T, int] = {}
@@ -15,3 +18,29 @@ def find_duplicates[T](collection: Iterable[T]) -> list[tuple[T, int]] | None:
                 duplicates_registry[item] = 1
 
     return [duplicate for duplicate in duplicates_registry.items()] or None
+
+
+def build_submission_store(submissions: list[ContestantSubmission]) -> SubmissionStore:
+    """
+    Load parsed submissions into a columnar submission store, in one pass
+    """
+    store = SubmissionStore()
+
+    for submission in submissions:
+        contestant_id = store.add_contestant(submission.name)
+
+        for entry in submission.entries:
+            title_id = store.add_title(entry.title)
+            store.append_score(contestant_id, title_id, entry.score, entry.is_author)
+
+            if entry.is_author:
+                timestamp_start, timestamp_end = NO_TIMESTAMP, NO_TIMESTAMP
+
+                if (clip_range := entry.video_timestamp) and clip_range.start < clip_range.end:
+                    timestamp_start, timestamp_end = clip_range.start.seconds, clip_range.end.seconds
+
+                store.append_entry(
+                    title_id, contestant_id, entry.video_url, timestamp_start, timestamp_end, entry.topic
+                )
+
+    return store
@@ -0,0 +1,119 @@
+import hashlib
+import os
+import pickle
+from os import path
+from typing import NamedTuple
+
+from stage_1_validation.constants import PARSED_FORMS_CACHE_FORMAT_VERSION
+from stage_1_validation.custom_types import ContestantSubmission
+
+
+class FormFingerprint(NamedTuple):
+    size: int
+    mtime_ns: int
+    content_hash: str | None
+
+
+class ParsedFormsCacheStats(NamedTuple):
+    hits: int
+    misses: int
+
+
+class ParsedFormsCache:
+    """
+    On-disk cache of parsed contestant forms. Entries are keyed by the absolute path of the form file and are only
+    served while the file fingerprint (size + mtime, plus a content hash if enabled) and the form layout are unchanged.
+    Without a cache file, the cache lives in memory only
+    """
+
+    cache_file: str | None
+    hash_contents: bool
+    _entries: dict[str, tuple[FormFingerprint, tuple[str, ...], ContestantSubmission]]
+    _hits: int
+    _misses: int
+    _dirty: bool
+
+    def __init__(self, cache_file: str | None, hash_contents: bool = False):
+        self.cache_file = cache_file
+        self.hash_contents = hash_contents
+        self._entries = {}
+        self._hits = 0
+        self._misses = 0
+        self._dirty = False
+
+        self._load()
+
+    @property
+    def stats(self) -> ParsedFormsCacheStats:
+        return ParsedFormsCacheStats(self._hits, self._misses)
+
+    def get(self, form_file: str, layout: tuple[str, ...]) -> ContestantSubmission | None:
+        cached = self._entries.get(path.abspath(form_file))
+
+        if cached is not None:
+            fingerprint, cached_layout, submission = cached
+
+            if cached_layout == layout and fingerprint == self._fingerprint(form_file):
+                self._hits += 1
+                return submission
+
+        self._misses += 1
+        return None
+
+    def put(self, form_file: str, layout: tuple[str, ...], submission: ContestantSubmission) -> None:
+        self._entries[path.abspath(form_file)] = (self._fingerprint(form_file), layout, submission)
+        self._dirty = True
+
+    def invalidate(self, form_file: str | None = None) -> None:
+        """
+        Drop a single form from the cache or, when no form is given, the whole cache
+        """
+        if form_file is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(path.abspath(form_file), None)
+
+        self._dirty = True
+
+    def reset_stats(self) -> None:
+        self._hits = 0
+        self._misses = 0
+
+    def save(self) -> None:
+        if not self._dirty or self.cache_file is None:
+            return
+
+        if cache_folder := path.dirname(self.cache_file):
+            os.makedirs(cache_folder, exist_ok=True)
+
+        # Write to a temp file first so an interrupted run never leaves a truncated cache behind
+        tmp_cache_file = f"{self.cache_file}.tmp"
+        with open(tmp_cache_file, "wb") as file:
+            pickle.dump((PARSED_FORMS_CACHE_FORMAT_VERSION, self._entries), file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_cache_file, self.cache_file)
+
+        self._dirty = False
+
+    def _load(self) -> None:
+        if self.cache_file is None or not path.isfile(self.cache_file):
+            return
+
+        try:
+            with open(self.cache_file, "rb") as file:
+                version, entries = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError, TypeError):
+            # An unreadable cache is just a cold cache
+            return
+
+        if version == PARSED_FORMS_CACHE_FORMAT_VERSION:
+            self._entries = entries
+
+    def _fingerprint(self, form_file: str) -> FormFingerprint:
+        stat = os.stat(form_file)
+        content_hash = None
+
+        if self.hash_contents:
+            with open(form_file, "rb") as file:
+                content_hash = hashlib.file_digest(file, "sha256").hexdigest()
+
+        return FormFingerprint(stat.st_size, stat.st_mtime_ns, content_hash)
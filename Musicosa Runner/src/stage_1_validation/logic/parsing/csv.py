@@ -1,8 +1,15 @@
+import csv
 import os
 from os.path import basename
 
 from common.custom_types import StageException
-from stage_1_validation.constants import CSV_FIELDS_COUNT, CSV_SEPARATOR
+from common.formatting.tabulate import tab
+from stage_1_validation.constants import (
+    CONSOLIDATED_CSV_FIELDS_COUNT,
+    CONSOLIDATED_CSV_HEADER,
+    CSV_FIELDS_COUNT,
+    CSV_SEPARATOR,
+)
 from stage_1_validation.custom_types import ContestantSubmission, ContestantSubmissionEntry
 from stage_1_validation.logic.parsing.utils import parse_entry_topic_str, parse_score_str, parse_video_timestamp_str
 
@@ -34,12 +41,66 @@ def parse_contestant_form_csv(form_file: str) -> ContestantSubmission:
     return ContestantSubmission(contestant_name, entries)
 
 
+def parse_consolidated_csv(csv_file: str) -> list[ContestantSubmission]:
+    """
+    Parse a single long-format CSV holding the entries of every contestant, one per row
+    (contestant; title; score; author flag; video URL; video timestamp; topic). Rows are streamed and grouped by
+    contestant on the fly, in order of first appearance. A leading header row is skipped
+    """
+    entries_by_contestant: dict[str, list[ContestantSubmissionEntry]] = {}
+    parsing_errors: list[str] = []
+
+    try:
+        with open(csv_file, "r", encoding="UTF-8-SIG", newline="") as file:
+            reader = csv.reader(file, delimiter=CSV_SEPARATOR)
+
+            for row in reader:
+                if not any(field.strip() for field in row):
+                    continue
+
+                if reader.line_num == 1 and [field.strip().lower() for field in row] == CONSOLIDATED_CSV_HEADER:
+                    continue
+
+                if len(row) != CONSOLIDATED_CSV_FIELDS_COUNT:
+                    parsing_errors.append(f"Line {reader.line_num}: Field count mismatch ('{row}')")
+                    continue
+
+                if not (contestant_name := row[0].strip()):
+                    parsing_errors.append(f"Line {reader.line_num}: Missing contestant name")
+                    continue
+
+                try:
+                    entry = parse_entry_csv_fields(row[1:])
+                except StageException as err:
+                    parsing_errors.append(f"Line {reader.line_num}: [{contestant_name}] {err}")
+                    continue
+
+                if (entries := entries_by_contestant.get(contestant_name)) is None:
+                    entries_by_contestant[contestant_name] = entries = []
+
+                entries.append(entry)
+    except IOError as err:
+        raise StageException(f"Error opening consolidated CSV file '{csv_file}': {err}") from err
+
+    if parsing_errors:
+        raise StageException(
+            f"Failed to parse {len(parsing_errors)} row(s) of '{basename(csv_file)}':\n"
+            f"{'\n'.join([tab(1, f'* {error}') for error in parsing_errors])}"
+        )
+
+    return [ContestantSubmission(name, entries) for name, entries in entries_by_contestant.items()]
+
+
 def parse_entry_csv(entry_line: str) -> ContestantSubmissionEntry:
     line = entry_line.strip().split(CSV_SEPARATOR)
 
     if len(line) != CSV_FIELDS_COUNT:
         raise StageException(f"Field count mismatch ('{line}')")
 
+    return parse_entry_csv_fields(line)
+
+
+def parse_entry_csv_fields(line: list[str]) -> ContestantSubmissionEntry:
     title = line[0].strip()
 
     try:
@@ -1,5 +1,5 @@
 from common.constants import VIDEO_TIMESTAMP_SEPARATOR
-from common.time.utils import time_str_zfill, validate_time_str
+from common.time.timestamp import ClipRange, parse_timestamp
 from stage_1_validation.constants import ALLOWED_DECIMAL_SEPARATOR_CHARS, NORMALIZED_DECIMAL_SEPARATOR_CHAR
 
 
@@ -16,7 +16,7 @@ def parse_score_str(score_str: str) -> float:
         raise
 
 
-def parse_video_timestamp_str(video_timestamp_str: str) -> str:
+def parse_video_timestamp_str(video_timestamp_str: str) -> ClipRange:
     video_timestamp = video_timestamp_str.replace(" ", "").split(VIDEO_TIMESTAMP_SEPARATOR)
 
     if len(video_timestamp) != 2:
@@ -24,13 +24,13 @@ def parse_video_timestamp_str(video_timestamp_str: str) -> str:
 
     timestamp_start, timestamp_end = video_timestamp
 
-    if not validate_time_str(timestamp_start):
+    if (start := parse_timestamp(timestamp_start)) is None:
         raise ValueError(f"Error parsing video timestamp start '{timestamp_start}'")
 
-    if not validate_time_str(timestamp_end):
+    if (end := parse_timestamp(timestamp_end)) is None:
         raise ValueError(f"Error parsing video timestamp end '{timestamp_end}'")
 
-    return f"{time_str_zfill(timestamp_start)}{VIDEO_TIMESTAMP_SEPARATOR}{time_str_zfill(timestamp_end)}"
+    return ClipRange(start, end)
 
 
 def parse_entry_topic_str(topic_str: str) -> str:
@@ -1,47 +1,306 @@
 import os
-
-from openpyxl.reader.excel import load_workbook
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import batched
+from os.path import basename
+from typing import Any, Iterator, cast, get_args
 
 from common.custom_types import StageException
-from stage_1_validation.custom_types import ContestantSubmission, ContestantSubmissionEntry
+from common.formatting.tabulate import tab
+from stage_1_validation.constants import XLSX_LOCK_FILE_PREFIX
+from stage_1_validation.custom_types import ContestantSubmission, ContestantSubmissionEntry, XlsxReader
+from stage_1_validation.logic.parsing.cache import ParsedFormsCache
 from stage_1_validation.logic.parsing.utils import parse_entry_topic_str, parse_score_str, parse_video_timestamp_str
+from stage_1_validation.logic.parsing.xlsx_stream import XlsxStreamReader, XlsxStreamUnsupportedError
 
 
 def parse_contestant_forms_xlsx_folder(
-    forms_folder: str, contestant_name_coords: str, entries_data_coords: str
+    forms_folder: str,
+    contestant_name_coords: str,
+    entries_data_coords: str,
+    workers: int = 1,
+    cache: ParsedFormsCache | None = None,
+    reader: XlsxReader = "stream",
+) -> list[ContestantSubmission]:
+    """
+    Parse every XLSX form of a folder (see iter_contestant_forms_xlsx_folder)
+    :return: The parsed submissions, ordered by form file name
+    """
+    return list(
+        iter_contestant_forms_xlsx_folder(
+            forms_folder, contestant_name_coords, entries_data_coords, workers, cache, reader
+        )
+    )
+
+
+def iter_contestant_forms_xlsx_folder(
+    forms_folder: str,
+    contestant_name_coords: str,
+    entries_data_coords: str,
+    workers: int = 1,
+    cache: ParsedFormsCache | None = None,
+    reader: XlsxReader = "stream",
+) -> Iterator[ContestantSubmission]:
+    """
+    Parse every XLSX form of a folder lazily, fanning the work out over a process pool when more than one worker is
+    allowed. Forms are parsed in windows of as many forms as workers, so at most a window of submissions is held in
+    memory at once. Forms that fail to parse don't stop the iteration: their errors are raised together at the end
+    :param forms_folder: Folder containing the contestant forms
+    :param contestant_name_coords: Coordinates of the cell with the contestant name
+    :param entries_data_coords: Coordinates of the range of cells with the entries data
+    :param workers: Maximum number of worker processes (1 parses sequentially in the current process)
+    :param cache: Parsed forms cache. Only the forms missing from it (or changed since) are parsed
+    :param reader: XLSX reader implementation ('stream' falls back to 'openpyxl' for forms it can't handle)
+    :return: The parsed submissions, ordered by form file name
+    """
+    if workers < 1:
+        raise StageException(f"Invalid parsing workers count '{workers}' (Should be a positive integer)")
+
+    if reader not in get_args(XlsxReader):
+        raise StageException(f"Invalid XLSX reader '{reader}' (Should be one of {get_args(XlsxReader)})")
+
+    form_files = sorted([f"{forms_folder}/{file}" for file in os.listdir(forms_folder) if is_xlsx_form_file(file)])
+    layout = (contestant_name_coords, entries_data_coords)
+
+    parse_form = partial(
+        try_parse_contestant_form_xlsx,
+        contestant_name_coords=contestant_name_coords,
+        entries_data_coords=entries_data_coords,
+        reader=reader,
+    )
+    parsing_errors: list[str] = []
+
+    # The pool is only started once a window has more than one form left to parse
+    executor: ProcessPoolExecutor | None = None
+
+    try:
+        for form_files_window in batched(form_files, workers):
+            results: dict[str, ContestantSubmission | str] = {}
+
+            if cache is not None:
+                for form_file in form_files_window:
+                    if (cached_submission := cache.get(form_file, layout)) is not None:
+                        results[form_file] = cached_submission
+
+            pending_form_files = [form_file for form_file in form_files_window if form_file not in results]
+
+            if len(pending_form_files) <= 1:
+                parsed_results = map(parse_form, pending_form_files)
+            else:
+                executor = executor or ProcessPoolExecutor(max_workers=workers)
+                # Results are yielded in submission order, so the output doesn't depend on which worker finishes first
+                parsed_results = executor.map(parse_form, pending_form_files)
+
+            for form_file, result in zip(pending_form_files, parsed_results):
+                results[form_file] = result
+
+                if cache is not None and isinstance(result, ContestantSubmission):
+                    cache.put(form_file, layout, result)
+
+            for form_file in form_files_window:
+                if isinstance(result := results[form_file], ContestantSubmission):
+                    yield result
+                else:
+                    parsing_errors.append(f"'{basename(form_file)}': {result}")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+        # Also reached if the consumer stops early, so the forms parsed so far aren't parsed again next time
+        if cache is not None:
+            cache.save()
+
+    if parsing_errors:
+        raise StageException(
+            f"Failed to parse {len(parsing_errors)} of {len(form_files)} forms:\n"
+            f"{'\n'.join([tab(1, f'* {error}') for error in parsing_errors])}"
+        )
+
+
+def parse_contestant_forms_xlsx_workbook(
+    workbook_file: str, contestant_name_coords: str, entries_data_coords: str, reader: XlsxReader = "stream"
 ) -> list[ContestantSubmission]:
-    submissions: list[ContestantSubmission] = []
-    form_files = [file for file in os.listdir(forms_folder) if file.endswith(".xlsx")]
+    """
+    Parse every form of a shared workbook (see iter_contestant_forms_xlsx_workbook)
+    :return: The parsed submissions, in sheet order
+    """
+    return list(iter_contestant_forms_xlsx_workbook(workbook_file, contestant_name_coords, entries_data_coords, reader))
+
+
+def iter_contestant_forms_xlsx_workbook(
+    workbook_file: str, contestant_name_coords: str, entries_data_coords: str, reader: XlsxReader = "stream"
+) -> Iterator[ContestantSubmission]:
+    """
+    Parse lazily a shared workbook holding one form per worksheet, all of them with the same layout. The workbook is
+    opened once and its sheets are streamed one after another, so the archive, the shared strings table and the
+    styles are loaded once for every form instead of once per form file. Sheets that fail to parse don't stop the
+    iteration: their errors are raised together at the end
+    :param workbook_file: Workbook containing the contestant forms
+    :param contestant_name_coords: Coordinates of the cell with the contestant name (in every sheet)
+    :param entries_data_coords: Coordinates of the range of cells with the entries data (in every sheet)
+    :param reader: XLSX reader implementation ('stream' falls back to 'openpyxl' for the sheets it can't handle)
+    :return: The parsed submissions, in sheet order
+    """
+    if reader not in get_args(XlsxReader):
+        raise StageException(f"Invalid XLSX reader '{reader}' (Should be one of {get_args(XlsxReader)})")
+
+    stream_workbook: XlsxStreamReader | None = None
+    openpyxl_workbook: Any = None
+
+    if reader == "stream":
+        try:
+            stream_workbook = XlsxStreamReader(workbook_file)
+        except XlsxStreamUnsupportedError:
+            pass
+
+    def read_sheet(sheet_name: str) -> tuple[Any, list[list[Any]]]:
+        nonlocal openpyxl_workbook
+
+        if stream_workbook is not None:
+            try:
+                return read_contestant_form_xlsx_stream_sheet(
+                    stream_workbook, contestant_name_coords, entries_data_coords, sheet_name
+                )
+            except XlsxStreamUnsupportedError:
+                pass
+
+        # Only opened (once) if a sheet isn't handled by the stream reader
+        if openpyxl_workbook is None:
+            openpyxl_workbook = load_openpyxl_workbook(workbook_file)
+
+        return read_contestant_form_openpyxl_sheet(
+            openpyxl_workbook[sheet_name], contestant_name_coords, entries_data_coords
+        )
+
+    parsing_errors: list[str] = []
+
+    try:
+        if stream_workbook is not None:
+            sheet_names = stream_workbook.sheet_names
+        else:
+            openpyxl_workbook = load_openpyxl_workbook(workbook_file)
+            sheet_names = openpyxl_workbook.sheetnames
+
+        for sheet_name in sheet_names:
+            try:
+                submission = build_contestant_submission(*read_sheet(sheet_name))
+            except Exception as err:
+                parsing_errors.append(f"'{sheet_name}': {err}")
+                continue
+
+            yield submission
+    finally:
+        if stream_workbook is not None:
+            stream_workbook.close()
+
+        if openpyxl_workbook is not None:
+            openpyxl_workbook.close()
 
-    for form_file in form_files:
-        submissions.append(
-            parse_contestant_form_xlsx(f"{forms_folder}/{form_file}", contestant_name_coords, entries_data_coords)
+    if parsing_errors:
+        raise StageException(
+            f"Failed to parse {len(parsing_errors)} of {len(sheet_names)} sheets of '{basename(workbook_file)}':\n"
+            f"{'\n'.join([tab(1, f'* {error}') for error in parsing_errors])}"
         )
 
-    return submissions
+
+def is_xlsx_form_file(file_name: str) -> bool:
+    # Office leaves '~$' lock files next to the forms being edited. They share the extension but aren't workbooks
+    return file_name.endswith(".xlsx") and not file_name.startswith(XLSX_LOCK_FILE_PREFIX)
+
+
+def try_parse_contestant_form_xlsx(
+    form_file: str, contestant_name_coords: str, entries_data_coords: str, reader: XlsxReader = "stream"
+) -> ContestantSubmission | str:
+    # Errors are returned as plain strings so a failing form neither aborts the batch nor has to be pickled back
+    try:
+        return parse_contestant_form_xlsx(form_file, contestant_name_coords, entries_data_coords, reader)
+    except Exception as err:
+        return str(err)
 
 
 def parse_contestant_form_xlsx(
-    form_file: str, contestant_name_coords: str, entries_data_coords: str
+    form_file: str, contestant_name_coords: str, entries_data_coords: str, reader: XlsxReader = "stream"
 ) -> ContestantSubmission:
-    submission_entries: list[ContestantSubmissionEntry] = []
+    if reader == "stream":
+        try:
+            contestant_name, data_rows = read_contestant_form_xlsx_stream(
+                form_file, contestant_name_coords, entries_data_coords
+            )
+        except XlsxStreamUnsupportedError:
+            contestant_name, data_rows = read_contestant_form_xlsx_openpyxl(
+                form_file, contestant_name_coords, entries_data_coords
+            )
+    else:
+        contestant_name, data_rows = read_contestant_form_xlsx_openpyxl(
+            form_file, contestant_name_coords, entries_data_coords
+        )
+
+    return build_contestant_submission(contestant_name, data_rows)
+
+
+def read_contestant_form_xlsx_stream(
+    form_file: str, contestant_name_coords: str, entries_data_coords: str
+) -> tuple[Any, list[list[Any]]]:
+    with XlsxStreamReader(form_file) as workbook:
+        return read_contestant_form_xlsx_stream_sheet(workbook, contestant_name_coords, entries_data_coords)
+
 
-    workbook = load_workbook(form_file, data_only=True, read_only=True)
+def read_contestant_form_xlsx_stream_sheet(
+    workbook: XlsxStreamReader, contestant_name_coords: str, entries_data_coords: str, sheet_name: str | None = None
+) -> tuple[Any, list[list[Any]]]:
+    contestant_name_matrix, data_rows = workbook.read_ranges([contestant_name_coords, entries_data_coords], sheet_name)
+
+    return contestant_name_matrix[0][0], cast(list[list[Any]], data_rows)
+
+
+def read_contestant_form_xlsx_openpyxl(
+    form_file: str, contestant_name_coords: str, entries_data_coords: str
+) -> tuple[Any, list[list[Any]]]:
+    workbook = load_openpyxl_workbook(form_file)
     worksheet = workbook.active
 
     if worksheet is None:
         raise StageException(f"Error loading worksheet from workbook (file '{form_file}')")
 
+    contestant_name, data_rows = read_contestant_form_openpyxl_sheet(
+        worksheet, contestant_name_coords, entries_data_coords
+    )
+    workbook.close()
+
+    return contestant_name, data_rows
+
+
+def read_contestant_form_openpyxl_sheet(
+    worksheet: Any, contestant_name_coords: str, entries_data_coords: str
+) -> tuple[Any, list[list[Any]]]:
     contestant_name = worksheet[contestant_name_coords].value
-    data_cells_matrix = worksheet[entries_data_coords]
+    data_rows = [[cell.value for cell in data_cells_row] for data_cells_row in worksheet[entries_data_coords]]
+
+    return contestant_name, data_rows
 
-    for data_cells_row in data_cells_matrix:
-        raw_title = data_cells_row[0].value
-        raw_score = data_cells_row[1].value
-        raw_is_author = data_cells_row[2].value
-        raw_video_url = data_cells_row[3].value
-        raw_video_timestamp = data_cells_row[4].value
-        raw_topic = data_cells_row[5].value
+
+def load_openpyxl_workbook(workbook_file: str) -> Any:
+    # Deferred so that runs served entirely by the stream reader (and every worker process) skip the import cost
+    from openpyxl.reader.excel import load_workbook
+
+    return load_workbook(workbook_file, data_only=True, read_only=True)
+
+
+def build_contestant_submission(contestant_name: Any, data_rows: list[list[Any]]) -> ContestantSubmission:
+    submission_entries: list[ContestantSubmissionEntry] = []
+
+    for data_row in data_rows:
+        # Rows left blank (the entries a contestant doesn't score, with partial ballots). Reported by the validation if
+        # the entries were expected
+        if all(cell is None or (isinstance(cell, str) and not cell.strip()) for cell in data_row):
+            continue
+
+        raw_title = data_row[0]
+        raw_score = data_row[1]
+        raw_is_author = data_row[2]
+        raw_video_url = data_row[3]
+        raw_video_timestamp = data_row[4]
+        raw_topic = data_row[5]
 
         title = raw_title.strip() if raw_title else raw_title
 
@@ -67,6 +326,5 @@ def parse_contestant_form_xlsx(
         topic = parse_entry_topic_str(raw_topic) if raw_topic else None
 
         submission_entries.append(ContestantSubmissionEntry(title, score, is_author, video_url, video_timestamp, topic))
-    workbook.close()
 
     return ContestantSubmission(contestant_name, submission_entries)
@@ -0,0 +1,358 @@
+import posixpath
+import re
+from typing import IO, Iterator
+from xml.etree.ElementTree import XML, Element, iterparse
+from zipfile import BadZipFile, ZipFile
+
+from stage_1_validation.constants import (
+    XLSX_BUILTIN_DATE_NUM_FMT_IDS,
+    XLSX_OFFICE_DOCUMENT_REL_TYPE,
+    XLSX_PACKAGE_RELS_NS,
+    XLSX_RELS_NS,
+    XLSX_SHARED_STRINGS_REL_TYPE,
+    XLSX_SPREADSHEET_NS,
+    XLSX_STYLES_REL_TYPE,
+)
+
+type CellValue = str | int | float | bool | None
+
+CELL_COORDS_REGEX = re.compile(r"^\$?([A-Z]{1,3})\$?(\d+)$")
+CELL_RANGE_COORDS_REGEX = re.compile(r"^\$?([A-Z]{1,3})\$?(\d+)(?::\$?([A-Z]{1,3})\$?(\d+))?$")
+DATE_NUM_FMT_REGEX = re.compile(r"[dmyhs]", re.IGNORECASE)
+NUM_FMT_LITERALS_REGEX = re.compile(r'"[^"]*"|\[[^]]*]|\\.')
+
+SST_ITEM_TAG = f"{{{XLSX_SPREADSHEET_NS}}}si"
+TEXT_TAG = f"{{{XLSX_SPREADSHEET_NS}}}t"
+PHONETIC_RUN_TAG = f"{{{XLSX_SPREADSHEET_NS}}}rPh"
+ROW_TAG = f"{{{XLSX_SPREADSHEET_NS}}}row"
+CELL_TAG = f"{{{XLSX_SPREADSHEET_NS}}}c"
+VALUE_TAG = f"{{{XLSX_SPREADSHEET_NS}}}v"
+INLINE_STRING_TAG = f"{{{XLSX_SPREADSHEET_NS}}}is"
+WORKBOOK_VIEW_TAG = f"{{{XLSX_SPREADSHEET_NS}}}workbookView"
+SHEET_TAG = f"{{{XLSX_SPREADSHEET_NS}}}sheet"
+RELATIONSHIP_TAG = f"{{{XLSX_PACKAGE_RELS_NS}}}Relationship"
+
+
+class XlsxStreamUnsupportedError(Exception):
+    """
+    The workbook uses a feature the stream reader doesn't handle (the caller should fall back to openpyxl)
+    """
+
+    pass
+
+
+class XlsxStreamReader:
+    """
+    Minimal read-only XLSX reader for fixed-layout forms. Sheets are streamed straight from the zip archive with
+    iterparse, only the requested cell ranges are kept, and parsing stops as soon as the last requested row is read.
+    Shared strings and styles are only loaded (as far as needed) when a requested cell references them.
+    Cell values follow openpyxl's 'data_only' semantics, except date-formatted numbers, which are unsupported
+    """
+
+    workbook_file: str
+    _archive: ZipFile
+    _sheet_paths: dict[str, str]
+    _active_sheet_name: str
+    _shared_strings_path: str | None
+    _styles_path: str | None
+    _shared_strings: list[str]
+    _shared_strings_iterator: Iterator[tuple[str, Element]] | None
+    _shared_strings_file: IO[bytes] | None
+    _date_style_ids: frozenset[int] | None
+
+    def __init__(self, workbook_file: str):
+        self.workbook_file = workbook_file
+
+        try:
+            self._archive = ZipFile(workbook_file)
+        except BadZipFile as err:
+            raise XlsxStreamUnsupportedError(f"Not a zip archive ({err})") from err
+
+        self._shared_strings = []
+        self._shared_strings_iterator = None
+        self._shared_strings_file = None
+        self._date_style_ids = None
+
+        try:
+            self._load_workbook_structure()
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> "XlsxStreamReader":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def sheet_names(self) -> list[str]:
+        return list(self._sheet_paths.keys())
+
+    @property
+    def active_sheet_name(self) -> str:
+        return self._active_sheet_name
+
+    def close(self) -> None:
+        if self._shared_strings_file is not None:
+            self._shared_strings_file.close()
+            self._shared_strings_file = None
+
+        self._archive.close()
+
+    def read_ranges(self, ranges_coords: list[str], sheet_name: str | None = None) -> list[list[list[CellValue]]]:
+        """
+        Read cell ranges from a sheet in a single pass
+        :param ranges_coords: Range coordinates ('C6:H17') or single cell coordinates ('F2')
+        :param sheet_name: Name of the sheet to read (the active sheet if omitted)
+        :return: One row-major matrix of values per range. Missing cells are None
+        """
+        sheet_name = sheet_name if sheet_name is not None else self._active_sheet_name
+
+        if sheet_name not in self._sheet_paths:
+            raise ValueError(f"Sheet '{sheet_name}' not found in workbook")
+
+        bounds = [parse_range_coords(coords) for coords in ranges_coords]
+        matrices: list[list[list[CellValue]]] = [
+            [[None] * (max_col - min_col + 1) for _ in range(max_row - min_row + 1)]
+            for min_col, min_row, max_col, max_row in bounds
+        ]
+
+        last_row = max(max_row for _, _, _, max_row in bounds)
+        min_col = min(min_col for min_col, _, _, _ in bounds)
+        max_col = max(max_col for _, _, max_col, _ in bounds)
+
+        for row_idx, col_idx, value in self._iter_sheet_cells(
+            self._sheet_paths[sheet_name], last_row, min_col, max_col
+        ):
+            for (range_min_col, range_min_row, range_max_col, range_max_row), matrix in zip(bounds, matrices):
+                if range_min_row <= row_idx <= range_max_row and range_min_col <= col_idx <= range_max_col:
+                    matrix[row_idx - range_min_row][col_idx - range_min_col] = value
+
+        return matrices
+
+    def read_cell(self, coords: str, sheet_name: str | None = None) -> CellValue:
+        return self.read_ranges([coords], sheet_name)[0][0][0]
+
+    def _iter_sheet_cells(
+        self, sheet_path: str, last_row: int, min_col: int, max_col: int
+    ) -> Iterator[tuple[int, int, CellValue]]:
+        # Only 'end' events are handled (half the callbacks of 'start' + 'end'), so cells are located by their own
+        # reference. Every mainstream writer emits it, and sheets without one are left to openpyxl
+        with self._archive.open(sheet_path) as sheet_file:
+            for _, element in iterparse(sheet_file, events=("end",)):
+                tag = element.tag
+
+                if tag == CELL_TAG:
+                    if not (cell_ref := element.get("r")):
+                        raise XlsxStreamUnsupportedError("Cell without reference")
+
+                    col_idx, row_idx = parse_cell_coords(cell_ref)
+
+                    if row_idx > last_row:
+                        return
+
+                    if min_col <= col_idx <= max_col:
+                        yield row_idx, col_idx, self._cell_value(element)
+                elif tag == ROW_TAG:
+                    if int(element.get("r", "0")) >= last_row:
+                        return
+
+                    # Rows are done with once closed. Emptying them keeps memory flat on long sheets
+                    element.clear()
+
+    def _cell_value(self, cell: Element) -> CellValue:
+        data_type = cell.get("t", "n")
+
+        if data_type == "inlineStr":
+            inline_string = cell.find(INLINE_STRING_TAG)
+            return rich_text(inline_string) if inline_string is not None else None
+
+        raw_value = cell.findtext(VALUE_TAG)
+
+        if raw_value is None:
+            return None
+
+        match data_type:
+            case "s":
+                return self._shared_string(int(raw_value))
+            case "str" | "e":
+                return raw_value
+            case "b":
+                return raw_value == "1"
+            case "n":
+                if (style_id := cell.get("s")) and int(style_id) in self._load_date_style_ids():
+                    raise XlsxStreamUnsupportedError(f"Date formatted cell '{cell.get('r')}'")
+                return cast_number(raw_value)
+            case _:
+                raise XlsxStreamUnsupportedError(f"Unknown cell data type '{data_type}'")
+
+    def _shared_string(self, index: int) -> str:
+        # The shared strings table is parsed incrementally, only as far as the highest index referenced so far
+        if index >= len(self._shared_strings) and self._shared_strings_path is not None:
+            if self._shared_strings_iterator is None:
+                self._shared_strings_file = self._archive.open(self._shared_strings_path)
+                self._shared_strings_iterator = iterparse(self._shared_strings_file, events=("end",))
+
+            for _, element in self._shared_strings_iterator:
+                if element.tag == SST_ITEM_TAG:
+                    self._shared_strings.append(rich_text(element))
+                    element.clear()
+
+                    if index < len(self._shared_strings):
+                        break
+
+        if index >= len(self._shared_strings):
+            raise XlsxStreamUnsupportedError(f"Shared string index out of bounds ({index})")
+
+        return self._shared_strings[index]
+
+    def _load_date_style_ids(self) -> frozenset[int]:
+        if self._date_style_ids is not None:
+            return self._date_style_ids
+
+        date_style_ids: set[int] = set()
+
+        if self._styles_path is not None:
+            with self._archive.open(self._styles_path) as styles_file:
+                custom_date_formats: set[int] = set()
+                style_idx = 0
+                in_cell_xfs = False
+
+                for event, element in iterparse(styles_file, events=("start", "end")):
+                    local_tag = element.tag.rsplit("}", 1)[-1]
+
+                    if local_tag == "cellXfs":
+                        in_cell_xfs = event == "start"
+                    elif event == "end" and local_tag == "numFmt":
+                        if is_date_num_fmt(element.get("formatCode", "")):
+                            custom_date_formats.add(int(element.get("numFmtId", "-1")))
+                    elif event == "end" and local_tag == "xf" and in_cell_xfs:
+                        num_fmt_id = int(element.get("numFmtId", "0"))
+
+                        if num_fmt_id in XLSX_BUILTIN_DATE_NUM_FMT_IDS or num_fmt_id in custom_date_formats:
+                            date_style_ids.add(style_idx)
+
+                        style_idx += 1
+
+        self._date_style_ids = frozenset(date_style_ids)
+
+        return self._date_style_ids
+
+    def _load_workbook_structure(self) -> None:
+        workbook_path = self._find_rel_target("", XLSX_OFFICE_DOCUMENT_REL_TYPE) or "xl/workbook.xml"
+        workbook_rels = self._read_rels(workbook_path)
+
+        self._shared_strings_path = next(
+            (target for target, rel_type in workbook_rels.values() if rel_type == XLSX_SHARED_STRINGS_REL_TYPE), None
+        )
+        self._styles_path = next(
+            (target for target, rel_type in workbook_rels.values() if rel_type == XLSX_STYLES_REL_TYPE), None
+        )
+
+        sheets: list[tuple[str, str]] = []
+        active_tab: int | None = None
+
+        # Package parts other than the sheets are tiny, so they are parsed in one go
+        workbook = XML(self._archive.read(workbook_path))
+
+        if (workbook_view := workbook.find(f"{{{XLSX_SPREADSHEET_NS}}}bookViews/{WORKBOOK_VIEW_TAG}")) is not None:
+            active_tab = int(workbook_view.get("activeTab", "0"))
+
+        for element in workbook.iter(SHEET_TAG):
+            rel_id = element.get(f"{{{XLSX_RELS_NS}}}id")
+
+            if rel_id not in workbook_rels:
+                raise XlsxStreamUnsupportedError(f"Sheet '{element.get('name')}' has no relationship")
+
+            sheets.append((element.get("name", ""), workbook_rels[rel_id][0]))
+
+        if not sheets:
+            raise XlsxStreamUnsupportedError("No sheets found (Is it a strict OOXML workbook?)")
+
+        if active_tab is None or not 0 <= active_tab < len(sheets):
+            active_tab = 0
+
+        self._sheet_paths = dict(sheets)
+        self._active_sheet_name = sheets[active_tab][0]
+
+    def _find_rel_target(self, part_path: str, rel_type: str) -> str | None:
+        return next((target for target, type_ in self._read_rels(part_path).values() if type_ == rel_type), None)
+
+    def _read_rels(self, part_path: str) -> dict[str, tuple[str, str]]:
+        part_folder, part_name = posixpath.split(part_path)
+        rels_path = posixpath.join(part_folder, "_rels", f"{part_name}.rels")
+
+        if rels_path not in self._archive.NameToInfo:
+            return {}
+
+        rels: dict[str, tuple[str, str]] = {}
+
+        for element in XML(self._archive.read(rels_path)).iter(RELATIONSHIP_TAG):
+            target = element.get("Target", "")
+            target = (
+                target.lstrip("/")
+                if target.startswith("/")
+                else posixpath.normpath(posixpath.join(part_folder, target))
+            )
+            rels[element.get("Id", "")] = (target, element.get("Type", ""))
+
+        return rels
+
+
+def parse_cell_coords(coords: str) -> tuple[int, int]:
+    """
+    :return: The (column, row) 1-based indices of the cell
+    """
+    if not (match := CELL_COORDS_REGEX.match(coords.upper())):
+        raise ValueError(f"Invalid cell coordinates '{coords}'")
+
+    column_letters, row = match.groups()
+
+    return column_index(column_letters), int(row)
+
+
+def parse_range_coords(coords: str) -> tuple[int, int, int, int]:
+    """
+    :return: The (min column, min row, max column, max row) 1-based boundaries of the range
+    """
+    if not (match := CELL_RANGE_COORDS_REGEX.match(coords.strip().upper())):
+        raise ValueError(f"Invalid range coordinates '{coords}'")
+
+    start_column, start_row, end_column, end_row = match.groups()
+    min_col, min_row = column_index(start_column), int(start_row)
+    max_col, max_row = (column_index(end_column), int(end_row)) if end_column else (min_col, min_row)
+
+    return min(min_col, max_col), min(min_row, max_row), max(min_col, max_col), max(min_row, max_row)
+
+
+def column_index(column_letters: str) -> int:
+    index = 0
+    for letter in column_letters:
+        index = index * 26 + ord(letter) - ord("A") + 1
+
+    return index
+
+
+def cast_number(raw_value: str) -> int | float:
+    # Same rule as openpyxl: anything that looks like a decimal or exponent is a float
+    if "." in raw_value or "E" in raw_value or "e" in raw_value:
+        return float(raw_value)
+
+    return int(raw_value)
+
+
+def rich_text(element: Element) -> str:
+    # Phonetic runs hold reading hints, not cell content
+    return "".join(
+        text_element.text or ""
+        for container in element.iter()
+        if container.tag != PHONETIC_RUN_TAG
+        for text_element in container
+        if text_element.tag == TEXT_TAG
+    )
+
+
+def is_date_num_fmt(format_code: str) -> bool:
+    # Date/time formats are the ones with date or time placeholders outside of literals and bracketed modifiers
+    return bool(DATE_NUM_FMT_REGEX.search(NUM_FMT_LITERALS_REGEX.sub("", format_code.split(";")[0])))
@@ -0,0 +1,81 @@
+import re
+from array import array
+from collections import Counter
+from itertools import chain
+from math import ceil
+
+from stage_1_validation.constants import TITLE_SUGGESTION_MIN_SIMILARITY, TITLE_SUGGESTIONS_LIMIT
+
+NON_ALPHANUMERIC_REGEX = re.compile(r"[\W_]+")
+
+
+class TitleTrigramIndex:
+    """
+    Fuzzy matching index over the valid entry titles, to suggest the intended title of an invalid one. Titles are
+    normalized (casefolded, punctuation and spacing collapsed) and split into padded character trigrams, with an
+    inverted list of titles per trigram. A lookup only visits the titles sharing at least one trigram with the query
+    and ranks them by trigram similarity (Dice coefficient), instead of computing an edit distance against every valid
+    title. Lookups are memoized, as the same typo tends to show up in several submissions
+    """
+
+    titles: list[str]
+    _trigram_counts: array
+    _postings: dict[str, array]
+    _suggestions: dict[str, list[str]]
+
+    def __init__(self, titles: list[str]):
+        self.titles = list(dict.fromkeys(titles))
+        self._trigram_counts = array("I")
+        self._postings = {}
+        self._suggestions = {}
+
+        for title_id, title in enumerate(self.titles):
+            title_trigrams = trigrams(title)
+            self._trigram_counts.append(len(title_trigrams))
+
+            for trigram in title_trigrams:
+                self._postings.setdefault(trigram, array("I")).append(title_id)
+
+    def suggest(self, title: str) -> list[str]:
+        """
+        :return: Valid titles similar to the given one, most similar first (up to TITLE_SUGGESTIONS_LIMIT, with a
+            similarity of at least TITLE_SUGGESTION_MIN_SIMILARITY)
+        """
+        if (suggestions := self._suggestions.get(title)) is not None:
+            return suggestions
+
+        query_trigrams = trigrams(title)
+        query_size = len(query_trigrams)
+
+        # Shared trigram counts of every title with at least one in common, tallied by Counter over the inverted lists.
+        # A title similar enough shares at least 'min_shared' of them, which discards most before scoring
+        shared_trigrams = Counter(chain.from_iterable([self._postings.get(trigram, ()) for trigram in query_trigrams]))
+        min_shared = ceil(TITLE_SUGGESTION_MIN_SIMILARITY * query_size / (2 - TITLE_SUGGESTION_MIN_SIMILARITY))
+        candidates: list[tuple[float, str]] = []
+
+        for title_id, shared in shared_trigrams.items():
+            if shared < min_shared:
+                continue
+
+            similarity = 2 * shared / (query_size + self._trigram_counts[title_id])
+
+            if similarity >= TITLE_SUGGESTION_MIN_SIMILARITY:
+                candidates.append((-similarity, self.titles[title_id]))
+
+        suggestions = [candidate for _, candidate in sorted(candidates)[:TITLE_SUGGESTIONS_LIMIT]]
+        self._suggestions[title] = suggestions
+
+        return suggestions
+
+
+def normalize_title(title: str) -> str:
+    return NON_ALPHANUMERIC_REGEX.sub(" ", title.casefold()).strip()
+
+
+def trigrams(title: str) -> set[str]:
+    """
+    Character trigrams of a normalized title, padded so that word starts and ends weigh in
+    """
+    padded_title = f"  {normalize_title(title)} "
+
+    return {padded_title[i : i + 3] for i in range(len(padded_title) - 2)}
@@ -1,117 +1,480 @@
+from dataclasses import dataclass, field
+
 from validators import ValidationError
 from validators import url as validate_url
 
-from common.constants import VIDEO_TIMESTAMP_SEPARATOR
 from common.formatting.tabulate import tab
-from common.model.models import EntryTopic, SettingKeys
-from common.model.settings import get_setting_by_key
-from common.time.utils import parse_time, seconds_between, validate_time_str
+from common.model.models import EntryTopic
+from common.model.settings import SettingsSnapshot
+from common.naming.video_urls import canonical_video_key
+from common.time.timestamp import ClipRange
 from stage_1_validation.custom_types import ContestantSubmission, ContestantSubmissionEntry
-from stage_1_validation.logic.helpers import find_duplicates
+from stage_1_validation.logic.title_index import TitleTrigramIndex
+
+
+@dataclass(frozen=True)
+class ValidationIndex:
+    """
+    Lookup structures shared by every submission of a validation run, so they are built once instead of per
+    submission or per entry
+    """
+
+    round_count: int
+    min_score: float
+    max_score: float
+    video_duration: int
+    valid_titles: frozenset[str]
+    entry_topics: tuple[EntryTopic, ...]
+    topic_designations: frozenset[str]
+    # Contestants score only some of the entries (for the 'sparse' ranking engine), so submissions aren't expected to
+    # list every valid title
+    partial_ballots: bool
+    # Derived from the valid titles, which already take part in the comparison
+    title_index: TitleTrigramIndex = field(compare=False)
+
+
+def build_validation_index(
+    valid_titles: list[str],
+    entry_topics: list[EntryTopic] | None,
+    settings: SettingsSnapshot,
+    partial_ballots: bool = False,
+) -> ValidationIndex:
+    topics = tuple(entry_topics or ())
+
+    return ValidationIndex(
+        round_count=settings.round_count,
+        min_score=settings.score_min_value,
+        max_score=settings.score_max_value,
+        video_duration=settings.entry_video_duration_seconds,
+        valid_titles=frozenset(valid_titles),
+        entry_topics=topics,
+        topic_designations=frozenset(topic.designation.casefold() for topic in topics),
+        partial_ballots=partial_ballots,
+        title_index=TitleTrigramIndex(valid_titles),
+    )
 
 
-def validate_contestant_submission_collection(
-    submissions: list[ContestantSubmission], valid_titles: list[str], entry_topics: list[EntryTopic] | None
-) -> list[str] | None:
-    contestant_count = len(submissions)
-    validation_errors: list[str] = []
+type SubmissionKey = tuple[str, int]
 
-    if len(submissions) != contestant_count:
-        validation_errors.append(f"Submission form count mismatch ({len(submissions)}) (Should be {contestant_count})")
 
-    # Validate that each entry has exactly one author across all submissions
+class AuthorRegistry:
+    """
+    Cross-submission aggregates of a submission collection: the contestants claiming each entry and the entries
+    pointing to each video. Submissions can be added and removed, updating the aggregates with their own
+    contributions alone, and the submissions themselves aren't kept
+    """
 
-    author_registry: dict[str, set[str]] = {}
+    _title_listings: dict[str, int]
+    _title_authors: dict[str, dict[str, int]]
+    _titles_no_author: set[str]
+    _titles_multiple_authors: set[str]
+    _video_key_titles: dict[str, dict[str, int]]
+    _video_keys_shared: set[str]
 
-    for sub in submissions:
-        contestant_name, entries = sub.name, sub.entries
-        for entry in entries:
-            title, is_author = entry.title, entry.is_author
-            if is_author and title in author_registry:
-                author_registry[title].add(contestant_name)
-            elif is_author:
-                author_registry[title] = {contestant_name}  # CAREFUL: Using 'set()' here would make a set of chars
-            elif title not in author_registry:
-                author_registry[title] = set()
+    def __init__(self):
+        self._title_listings = {}
+        self._title_authors = {}
+        self._titles_no_author = set()
+        self._titles_multiple_authors = set()
+        self._video_key_titles = {}
+        self._video_keys_shared = set()
 
-    if entries_no_author := [entry for entry, authors in author_registry.items() if len(authors) == 0]:
-        validation_errors.append(
-            f"Entries with no author ({len(entries_no_author)}):\n"
-            f"{'\n'.join([tab(1, f'* {title}') for title in entries_no_author])}"
-        )
+    def add(self, submission: ContestantSubmission) -> None:
+        contestant_name = submission.name
+
+        for entry in submission.entries:
+            title = entry.title
+            self._title_listings[title] = self._title_listings.get(title, 0) + 1
+
+            if entry.is_author:
+                authors = self._title_authors.setdefault(title, {})
+                authors[contestant_name] = authors.get(contestant_name, 0) + 1
+
+                if entry.video_url and (video_key := canonical_video_key(entry.video_url)):
+                    video_titles = self._video_key_titles.setdefault(video_key, {})
+                    video_titles[title] = video_titles.get(title, 0) + 1
+                    self._refresh_video_key(video_key)
+
+            self._refresh_title(title)
+
+    def remove(self, submission: ContestantSubmission) -> None:
+        contestant_name = submission.name
+
+        for entry in submission.entries:
+            title = entry.title
+
+            if (listings := self._title_listings[title] - 1) > 0:
+                self._title_listings[title] = listings
+            else:
+                del self._title_listings[title]
+
+            if entry.is_author:
+                authors = self._title_authors[title]
+
+                if (claims := authors[contestant_name] - 1) > 0:
+                    authors[contestant_name] = claims
+                else:
+                    del authors[contestant_name]
+
+                if not authors:
+                    del self._title_authors[title]
+
+                if entry.video_url and (video_key := canonical_video_key(entry.video_url)):
+                    video_titles = self._video_key_titles[video_key]
+
+                    if (claims := video_titles[title] - 1) > 0:
+                        video_titles[title] = claims
+                    else:
+                        del video_titles[title]
+
+                    if not video_titles:
+                        del self._video_key_titles[video_key]
 
-    if entries_multiple_authors := [entry for entry, authors in author_registry.items() if len(authors) > 1]:
-        for title, authors in entries_multiple_authors:
+                    self._refresh_video_key(video_key)
+
+            self._refresh_title(title)
+
+    def errors(self, unlisted_titles: frozenset[str] | None = None) -> list[str]:
+        """
+        :param unlisted_titles: Valid titles to report as having no author if no submission lists them (Only needed
+            with partial ballots, otherwise every submission lists every valid title)
+        """
+        validation_errors: list[str] = []
+
+        # Validate that each entry has exactly one author across all submissions. Titles are sorted by their string form,
+        # as empty title cells (already reported by each submission) are listed as None
+
+        titles_no_author = self._titles_no_author
+
+        if unlisted_titles:
+            titles_no_author = titles_no_author | (unlisted_titles - self._title_listings.keys())
+
+        if entries_no_author := sorted(titles_no_author, key=str):
             validation_errors.append(
-                f"Entry '{title}' has multiple authors ({len(authors)}):"
-                f" {', '.join([f'{author}' for author in authors])}"
+                f"Entries with no author ({len(entries_no_author)}):\n"
+                f"{'\n'.join([tab(1, f'* {title}') for title in entries_no_author])}"
             )
 
-    # Validate each contestant submission
+        for title in sorted(self._titles_multiple_authors, key=str):
+            authors = sorted(self._title_authors[title])
+            validation_errors.append(
+                f"Entry '{title}' has multiple authors ({len(authors)}): {', '.join([f'{author}' for author in authors])}"
+            )
+
+        return validation_errors
+
+    def warnings(self) -> list[str]:
+        """
+        Findings worth a look that don't make the collection invalid
+        """
+        validation_warnings: list[str] = []
+
+        # Entries pointing to the same video (whatever the shape of their URLs). Not an error, as they may be different
+        # segments of a long or compilation video
+
+        for video_key in sorted(self._video_keys_shared):
+            titles = sorted(self._video_key_titles[video_key], key=str)
+            validation_warnings.append(
+                f"[WARNING] Entries share the same video '{video_key}' ({len(titles)}): "
+                f"{', '.join([f'{title}' for title in titles])}"
+            )
+
+        return validation_warnings
+
+    def _refresh_title(self, title: str) -> None:
+        authors_count = len(self._title_authors.get(title, ()))
+
+        if title in self._title_listings and authors_count == 0:
+            self._titles_no_author.add(title)
+        else:
+            self._titles_no_author.discard(title)
+
+        if authors_count > 1:
+            self._titles_multiple_authors.add(title)
+        else:
+            self._titles_multiple_authors.discard(title)
+
+    def _refresh_video_key(self, video_key: str) -> None:
+        if len(self._video_key_titles.get(video_key, ())) > 1:
+            self._video_keys_shared.add(video_key)
+        else:
+            self._video_keys_shared.discard(video_key)
+
+
+class IncrementalValidator:
+    """
+    Validator of a submission collection that keeps its results between runs. Each run only validates the
+    submissions that were added or changed since the previous one (unchanged ones are recognized by identity first,
+    then equality) and updates the cross-submission author registry with their contributions alone. Per-submission
+    results that depend on the contestant count are recomputed on the fly, and a change of validation index
+    (valid titles, entry topics or settings) starts over from scratch
+    """
+
+    _index: ValidationIndex | None
+    _submissions: dict[SubmissionKey, ContestantSubmission]
+    _submission_results: dict[SubmissionKey, list[str]]
+    _registry: AuthorRegistry
+    _revalidated_count: int
+
+    def __init__(self):
+        self._index = None
+        self._reset()
+
+    @property
+    def revalidated_count(self) -> int:
+        """
+        Number of submissions validated in the last run (the rest were served from previous runs)
+        """
+        return self._revalidated_count
+
+    def validate(self, submissions: list[ContestantSubmission], index: ValidationIndex) -> list[str] | None:
+        if index != self._index:
+            self._index = index
+            self._reset()
+
+        current_submissions = keyed_submissions(submissions)
+
+        for key in [key for key in self._submissions if key not in current_submissions]:
+            self._remove(key)
+
+        self._revalidated_count = 0
+
+        for key, submission in current_submissions.items():
+            if (previous := self._submissions.get(key)) is submission or previous == submission:
+                continue
+
+            if previous is not None:
+                self._remove(key)
+
+            self._add(key, submission, index)
+            self._revalidated_count += 1
+
+        return self._collect_errors(current_submissions, index)
+
+    def collection_warnings(self) -> list[str]:
+        """
+        :return: Validation warnings of the cross-submission author registry, as of the last run
+        """
+        return self._registry.warnings()
+
+    def _reset(self) -> None:
+        self._submissions = {}
+        self._submission_results = {}
+        self._registry = AuthorRegistry()
+        self._revalidated_count = 0
+
+    def _add(self, key: SubmissionKey, submission: ContestantSubmission, index: ValidationIndex) -> None:
+        self._registry.add(submission)
+        self._submissions[key] = submission
+        self._submission_results[key] = [
+            f"[{submission.name}] {err_msg}" for err_msg in validate_contestant_submission_contents(submission, index)
+        ]
+
+    def _remove(self, key: SubmissionKey) -> None:
+        self._registry.remove(self._submissions.pop(key))
+        del self._submission_results[key]
+
+    def _collect_errors(
+        self, submissions: dict[SubmissionKey, ContestantSubmission], index: ValidationIndex
+    ) -> list[str] | None:
+        contestant_count = len(submissions)
+        validation_errors = self._registry.errors(index.valid_titles if index.partial_ballots else None)
+
+        # Validate each contestant submission
+
+        for key, submission in submissions.items():
+            if entry_count_error := validate_submission_entry_count(len(submission.entries), contestant_count, index):
+                validation_errors.append(f"[{submission.name}] {entry_count_error}")
+
+            validation_errors.extend(self._submission_results[key])
+
+        return validation_errors or None
+
+
+class StreamingValidator:
+    """
+    Validator of submissions fed one at a time, that doesn't hold on to them. Each submission is validated on its
+    own as it comes, and only leaves behind its contributions to the author registry and its entry count. The
+    validations that need the whole collection (authorship, entry counts) are available once the stream ends
+    """
+
+    _index: ValidationIndex | None
+    _registry: AuthorRegistry
+    _entry_counts: list[tuple[str, int]]
+
+    def __init__(self):
+        self._index = None
+        self._registry = AuthorRegistry()
+        self._entry_counts = []
+
+    @property
+    def contestant_entry_counts(self) -> list[tuple[str, int]]:
+        """
+        (Contestant name, entry count) of every submission validated so far, in stream order
+        """
+        return self._entry_counts
+
+    def validate(self, submission: ContestantSubmission, index: ValidationIndex) -> list[str]:
+        """
+        :return: Validation errors of the submission alone
+        """
+        self._index = index
+        self._registry.add(submission)
+        self._entry_counts.append((submission.name, len(submission.entries)))
+
+        return [
+            f"[{submission.name}] {err_msg}" for err_msg in validate_contestant_submission_contents(submission, index)
+        ]
+
+    def collection_errors(self) -> list[str]:
+        """
+        :return: Validation errors of the cross-submission author registry
+        """
+        index = self._index
 
-    for sub in submissions:
-        if submission_errors := validate_contestant_submission(sub, contestant_count, valid_titles, entry_topics):
-            validation_errors.extend(submission_errors)
+        return self._registry.errors(index.valid_titles if index is not None and index.partial_ballots else None)
 
-    return [err_msg for err_msg in validation_errors] or None
+    def collection_warnings(self) -> list[str]:
+        """
+        :return: Validation warnings of the cross-submission author registry
+        """
+        return self._registry.warnings()
+
+    def entry_count_errors(self) -> list[str | None]:
+        """
+        :return: Entry count validation error of every submission (None if valid), in stream order
+        """
+        if (index := self._index) is None:
+            return []
+
+        contestant_count = len(self._entry_counts)
+
+        return [
+            f"[{name}] {error}" if (error := validate_submission_entry_count(count, contestant_count, index)) else None
+            for name, count in self._entry_counts
+        ]
+
+
+def keyed_submissions(submissions: list[ContestantSubmission]) -> dict[SubmissionKey, ContestantSubmission]:
+    """
+    Key submissions by contestant name, plus the occurrence number of that name to tell apart repeated names
+    """
+    name_occurrences: dict[str, int] = {}
+    keyed: dict[SubmissionKey, ContestantSubmission] = {}
+
+    for submission in submissions:
+        occurrence = name_occurrences.get(submission.name, 0)
+        name_occurrences[submission.name] = occurrence + 1
+        keyed[(submission.name, occurrence)] = submission
+
+    return keyed
+
+
+def validate_contestant_submission_collection(
+    submissions: list[ContestantSubmission], index: ValidationIndex
+) -> list[str] | None:
+    return IncrementalValidator().validate(submissions, index)
 
 
 def validate_contestant_submission(
-    submission: ContestantSubmission,
-    contestants_count: int,
-    valid_titles: list[str],
-    entry_topics: list[EntryTopic] | None,
+    submission: ContestantSubmission, contestants_count: int, index: ValidationIndex
 ) -> list[str] | None:
-    round_count: int = get_setting_by_key(SettingKeys.GLOBAL_ROUND_COUNT).value  # pyright: ignore [reportOptionalMemberAccess, reportAssignmentType]
+    validation_errors: list[str] = []
+
+    if entry_count_error := validate_submission_entry_count(len(submission.entries), contestants_count, index):
+        validation_errors.append(entry_count_error)
+
+    validation_errors.extend(validate_contestant_submission_contents(submission, index))
+
+    return [f"[{submission.name}] {err_msg}" for err_msg in validation_errors] or None
+
+
+def validate_submission_entry_count(entries_count: int, contestants_count: int, index: ValidationIndex) -> str | None:
+    # With partial ballots, the entries listed are already checked to be valid and not duplicated
+    if index.partial_ballots:
+        return None
+
+    if entries_count != (entry_count := contestants_count * index.round_count):
+        return f"Submission entry count mismatch ({entries_count}) (Should be {entry_count})"
+
+    return None
+
+
+def validate_contestant_submission_contents(submission: ContestantSubmission, index: ValidationIndex) -> list[str]:
+    """
+    Validations of a submission that don't depend on the rest of the collection
+    """
+    round_count = index.round_count
 
     entries = submission.entries
-    entry_count = contestants_count * round_count
     validation_errors: list[str] = []
 
-    if len(entries) != entry_count:
-        validation_errors.append(f"Submission entry count mismatch ({len(entries)}) (Should be {entry_count})")
+    # Single pass over the entries, gathering everything the submission-level checks need
+
+    authored_entries_count = 0
+    title_occurrences: dict[str, int] = {}
+    entries_by_topic: dict[str, list[ContestantSubmissionEntry]] = {}
+    entries_errors: list[str] = []
 
-    if (authored_entries_count := len([entry for entry in entries if entry.is_author])) != round_count:
+    for entry in entries:
+        if entry.is_author:
+            authored_entries_count += 1
+
+        title_occurrences[entry.title] = title_occurrences.get(entry.title, 0) + 1
+
+        if entry.topic is not None:
+            entries_by_topic.setdefault(entry.topic.casefold(), []).append(entry)
+
+        if entry_errors := validate_entry(entry, index):
+            entries_errors.extend(entry_errors)
+
+    if authored_entries_count != round_count:
         validation_errors.append(f"Author claim count mismatch ({authored_entries_count}) (Should be {round_count})")
 
-    if duplicates := find_duplicates([entry.title for entry in entries]):
-        for title, count in duplicates:
+    for title, occurrences in title_occurrences.items():
+        if occurrences > 1:
+            count = occurrences - 1
             validation_errors.append(f"Entry '{title}' is duplicated {count} time{'s' if count > 1 else ''}")
 
-    titles = set([entry.title for entry in entries])
+    titles = title_occurrences.keys()
 
-    if invalid_titles := titles - set(valid_titles):
+    if invalid_titles := titles - index.valid_titles:
         validation_errors.append(
-            f"Invalid entries ({len(invalid_titles)}):\n{'\n'.join([tab(2, f'* {title}') for title in invalid_titles])}"
+            f"Invalid entries ({len(invalid_titles)}):\n"
+            f"{'\n'.join([tab(2, f'* {title}{title_suggestions(title, index)}') for title in invalid_titles])}"
         )
 
-    if missing_titles := set(valid_titles) - titles:
+    if not index.partial_ballots and (missing_titles := index.valid_titles - titles):
         validation_errors.append(
             f"Missing entries ({len(missing_titles)}):\n{'\n'.join([tab(2, f'* {title}') for title in missing_titles])}"
         )
 
-    for entry in entries:
-        if entry_errors := validate_entry(entry, entry_topics):
-            validation_errors.extend(entry_errors)
+    validation_errors.extend(entries_errors)
 
-    if entry_topics:
-        for topic in entry_topics:
-            entries_with_topic = [entry for entry in entries if entry.topic is not None]
-            occurrences = [e for e in entries_with_topic if e.topic.lower() == topic.designation.lower()]  # pyright: ignore [reportOptionalMemberAccess]
+    for topic in index.entry_topics:
+        occurrences = entries_by_topic.get(topic.designation.casefold(), [])
 
-            if len(occurrences) == 0:
-                validation_errors.append(f"There are no entries designated as '{topic.designation.upper()}'")
+        if len(occurrences) == 0:
+            validation_errors.append(f"There are no entries designated as '{topic.designation.upper()}'")
 
-            if len(occurrences) > 1:
-                validation_errors.append(
-                    f"There are multiple entries ({len(occurrences)}) of topic '{topic.designation.upper()}':\n"
-                    f"{'\n'.join([tab(1, f'* {entry.title}') for entry in occurrences])}"
-                )
+        if len(occurrences) > 1:
+            validation_errors.append(
+                f"There are multiple entries ({len(occurrences)}) of topic '{topic.designation.upper()}':\n"
+                f"{'\n'.join([tab(1, f'* {entry.title}') for entry in occurrences])}"
+            )
 
-    return [f"[{submission.name}] {err_msg}" for err_msg in validation_errors] or None
+    return validation_errors
+
+
+def title_suggestions(title: str, index: ValidationIndex) -> str:
+    # Empty title cells come as None, and are already reported by the entry validations
+    if isinstance(title, str) and (suggestions := index.title_index.suggest(title)):
+        return f" (Did you mean {' or '.join([f"'{suggestion}'" for suggestion in suggestions])}?)"
 
+    return ""
 
-def validate_entry(entry: ContestantSubmissionEntry, entry_topics: list[EntryTopic] | None) -> list[str] | None:
+
+def validate_entry(entry: ContestantSubmissionEntry, index: ValidationIndex) -> list[str] | None:
     title, score, is_author, video_url, video_timestamp, topic = (
         entry.title,
         entry.score,
@@ -131,12 +494,9 @@ def validate_entry(entry: ContestantSubmissionEntry, entry_topics: list[EntryTop
     if not is_author and topic:
         validation_errors.append("Topic is only allowed for authors")
 
-    min_score: int = get_setting_by_key(SettingKeys.VALIDATION_SCORE_MIN_VALUE).value  # pyright: ignore [reportAssignmentType, reportOptionalMemberAccess]
-    max_score: int = get_setting_by_key(SettingKeys.VALIDATION_SCORE_MAX_VALUE).value  # pyright: ignore [reportAssignmentType, reportOptionalMemberAccess]
-
     if errors := validate_title(title):
         validation_errors.append(errors)
-    if errors := validate_score(score, min_score, max_score):
+    if errors := validate_score(score, index.min_score, index.max_score):
         validation_errors.append(errors)
 
     if is_author and not video_url:
@@ -147,14 +507,14 @@ def validate_entry(entry: ContestantSubmissionEntry, entry_topics: list[EntryTop
             validation_errors.append(errors)
 
     if is_author and video_timestamp:
-        if errors := validate_video_timestamp(video_timestamp):
+        if errors := validate_video_timestamp(video_timestamp, index.video_duration):
             validation_errors.append(errors)
 
     if is_author and topic:
-        if not entry_topics:
+        if not index.entry_topics:
             validation_errors.append(f"Topic designation '{topic}' specified, but no entry topics are expected")
         else:
-            if errors := validate_topic(topic, entry_topics):
+            if errors := validate_topic(topic, index.topic_designations):
                 validation_errors.append(errors)
 
     return [f"[{title}] {err_msg}" for err_msg in validation_errors if err_msg is not None] or None
@@ -174,37 +534,18 @@ def validate_score(score: float, min_score: float, max_score: float) -> str | No
     return None
 
 
-def validate_video_timestamp(video_timestamp: str) -> str | None:
-    if not isinstance(video_timestamp, str) or not video_timestamp:
-        return "Video timestamp is not a string or is empty"
-
-    video_timestamp_bits = video_timestamp.split(VIDEO_TIMESTAMP_SEPARATOR)
-
-    if len(video_timestamp_bits) != 2:
-        return f"Invalid video timestamp format '{video_timestamp}' (Should be '[HH:]MM:SS-[HH:]MM:SS')"
-
-    start, end = video_timestamp_bits
-
-    # Is a valid time format
-
-    if not validate_time_str(start):
-        return f"Invalid start timestamp '{start}'"
-
-    if not validate_time_str(end):
-        return f"Invalid end timestamp '{end}'"
+def validate_video_timestamp(video_timestamp: ClipRange, allowed_video_duration: int) -> str | None:
+    if not isinstance(video_timestamp, ClipRange):
+        return "Video timestamp is not a clip range"
 
     # The start before the end
 
-    start_time, end_time = parse_time(start), parse_time(end)
-
-    if start_time >= end_time:  # pyright: ignore [reportOperatorIssue]
+    if video_timestamp.start >= video_timestamp.end:
         return f"Start is at or after the end ('{video_timestamp}')"
 
     # The duration is as set in the settings
 
-    allowed_video_duration: int = get_setting_by_key(SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS).value  # pyright: ignore [reportOptionalMemberAccess, reportAssignmentType]
-
-    if (duration := seconds_between(start_time, end_time)) != allowed_video_duration:  # pyright: ignore [reportArgumentType]
+    if (duration := video_timestamp.duration) != allowed_video_duration:
         return f"Invalid video duration ({duration}s [{video_timestamp}]) (Should be {allowed_video_duration} seconds)"
 
     return None
@@ -220,11 +561,14 @@ def validate_video_url(video_url: str) -> str | None:
     return None
 
 
-def validate_topic(topic: str, entry_topics: list[EntryTopic]) -> str | None:
+def validate_topic(topic: str, topic_designations: frozenset[str]) -> str | None:
+    """
+    :param topic_designations: Casefolded designations of the allowed entry topics
+    """
     if not isinstance(topic, str) or not topic:
         return "Topic is not a string or is empty"
 
-    if topic.lower() not in [valid_topic.designation.lower() for valid_topic in entry_topics]:
+    if topic.casefold() not in topic_designations:
         return f"Invalid topic designation '{topic}' (Should be one of the allowed designations)"
 
     return None
@@ -3,23 +3,31 @@ import argparse
 from peewee import PeeweeException
 
 from common.config.loader import load_config
-from common.constants import VIDEO_TIMESTAMP_SEPARATOR
 from common.custom_types import StageException
 from common.db.database import db
-from common.db.peewee_helpers import bulk_pack
-from common.model.models import Contestant, Entry, EntryTopic, Scoring, VideoOptions
-from common.naming.identifiers import generate_contestant_uuid5, generate_entry_uuid5
-from common.time.utils import parse_time
+from common.model.settings import load_settings_snapshot
 from stage_1_validation.custom_types import StageOneInput
 from stage_1_validation.execute import execute
-from stage_1_validation.stage_input import get_entry_topics_from_db, get_submissions_from_forms_folder, get_valid_titles
+from stage_1_validation.logic.helpers import build_submission_store
+from stage_1_validation.stage_input import (
+    get_entry_topics_from_db,
+    get_submissions,
+    get_valid_titles,
+    open_parsed_forms_cache,
+)
+from stage_1_validation.stage_output import persist_submission_store
+from stage_1_validation.stream_mode import stream_forms_folder
 from stage_1_validation.summary import stage_summary
+from stage_1_validation.watch_mode import watch_forms_folder
 
 if __name__ == "__main__":
     # Configuration
 
     parser = argparse.ArgumentParser()
     parser.add_argument("--config_file")
+    parser.add_argument("--clear_parsing_cache", action="store_true")
+    parser.add_argument("--watch", action="store_true")
+    parser.add_argument("--stream", action="store_true")
     args = parser.parse_args()
 
     try:
@@ -28,17 +36,45 @@ if __name__ == "__main__":
         print(f"[Stage 1 | Configuration] {err}")
         exit(1)
 
+    # Watch mode
+
+    if args.watch:
+        try:
+            watch_forms_folder(config, args.clear_parsing_cache)
+        except KeyboardInterrupt:
+            exit(0)
+        except Exception as err:
+            print(f"[Stage 1 | Watch] {err}")
+            exit(1)
+
+    # Streaming mode
+
+    if args.stream:
+        try:
+            stream_forms_folder(config, args.clear_parsing_cache)
+        except Exception as err:
+            print(f"[Stage 1 | Streaming] {err}")
+            exit(1)
+
+        exit(0)
+
     forms_folder = config.stage_1.forms_folder
     valid_titles_file = config.stage_1.valid_titles_file
-    contestant_name_coords = config.stage_1.contestant_name_coords
-    entries_data_coords = config.stage_1.entries_data_coords
+    parsing_cache_file = config.stage_1.parsing_cache_file
+    parsing_cache_hash_contents = config.stage_1.parsing_cache_hash_contents
 
     # Data retrieval
 
     try:
-        submissions = get_submissions_from_forms_folder(forms_folder, contestant_name_coords, entries_data_coords)
+        parsed_forms_cache = open_parsed_forms_cache(parsing_cache_file, parsing_cache_hash_contents)
+
+        if parsed_forms_cache and args.clear_parsing_cache:
+            parsed_forms_cache.invalidate()
+
+        submissions = get_submissions(config.stage_1, parsed_forms_cache)
         valid_titles = get_valid_titles(forms_folder, valid_titles_file)
         entry_topics = get_entry_topics_from_db()
+        settings = load_settings_snapshot()
     except Exception as err:
         print(f"[Stage 1 | Data retrieval] {err}")
         exit(1)
@@ -48,7 +84,7 @@ if __name__ == "__main__":
     # Stage execution
 
     try:
-        result = execute(stage_input)
+        result = execute(stage_input, settings, partial_ballots=config.stage_2.ranking_engine == "sparse")
     except StageException as err:
         print(f"[Stage 1 | Execution] {err}")
         exit(1)
@@ -57,56 +93,15 @@ if __name__ == "__main__":
         for validation_error in result.validation_errors:
             print(validation_error)
 
-    # Data persistence
+    if result.validation_warnings:
+        for validation_warning in result.validation_warnings:
+            print(validation_warning)
 
-    contestants_by_name: dict[str, Contestant] = {}
-    for sub in submissions:
-        contestants_by_name[sub.name] = Contestant(
-            id=generate_contestant_uuid5(sub.name).hex, name=sub.name, avatar=None
-        )
-
-    entries_by_title: dict[str, Entry] = {}
-    for sub in submissions:
-        for entry in sub.entries:
-            if entry.is_author:
-                # noinspection PyTypeChecker
-                topic = EntryTopic(designation=entry.topic) if entry.topic else None
-                entries_by_title[entry.title] = Entry(
-                    id=generate_entry_uuid5(entry.title).hex,
-                    title=entry.title,
-                    author=contestants_by_name[sub.name],
-                    video_url=entry.video_url,  # pyright: ignore [reportArgumentType]
-                    topic=topic,
-                )
-
-    scoring_entries: list[Scoring] = []
-    for sub in submissions:
-        for entry in sub.entries:
-            scoring_entries.append(
-                Scoring(
-                    contestant=contestants_by_name[sub.name], entry=entries_by_title[entry.title], score=entry.score
-                )
-            )
-
-    video_options: list[VideoOptions] = []
-    for sub in submissions:
-        for entry in sub.entries:
-            if entry.video_timestamp:
-                start, end = entry.video_timestamp.split(VIDEO_TIMESTAMP_SEPARATOR)
-                video_options.append(
-                    VideoOptions(
-                        entry=entries_by_title[entry.title],
-                        timestamp_start=parse_time(start),
-                        timestamp_end=parse_time(end),
-                    )
-                )
+    # Data persistence
 
     with db.atomic() as tx:
         try:
-            Contestant.ORM.insert_many(bulk_pack(contestants_by_name.values())).execute()
-            Entry.ORM.insert_many(bulk_pack(entries_by_title.values())).execute()
-            Scoring.ORM.insert_many(bulk_pack(scoring_entries)).execute()
-            VideoOptions.ORM.insert_many(bulk_pack(video_options)).execute()
+            persist_submission_store(build_submission_store(submissions))
         except PeeweeException as err:
             tx.rollback()
             print(f"[Stage 1 | Data persistence] {err}")
@@ -114,4 +109,4 @@ if __name__ == "__main__":
 
     # Stage execution summary
 
-    print(stage_summary(config, stage_input))
+    print(stage_summary(config, stage_input, parsed_forms_cache.stats if parsed_forms_cache else None))
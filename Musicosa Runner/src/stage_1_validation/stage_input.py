@@ -1,15 +1,131 @@
+from typing import Iterator, cast, get_args
+
+from common.config.config import StageOneConfig
 from common.custom_types import StageException
 from common.model.models import EntryTopic
-from stage_1_validation.custom_types import ContestantSubmission
-from stage_1_validation.logic.parsing.xlsx import parse_contestant_forms_xlsx_folder
+from stage_1_validation.custom_types import ContestantSubmission, FormsFormat, XlsxReader
+from stage_1_validation.logic.parsing.cache import ParsedFormsCache
+from stage_1_validation.logic.parsing.csv import parse_consolidated_csv
+from stage_1_validation.logic.parsing.xlsx import (
+    iter_contestant_forms_xlsx_folder,
+    iter_contestant_forms_xlsx_workbook,
+    parse_contestant_forms_xlsx_folder,
+    parse_contestant_forms_xlsx_workbook,
+)
+
+
+def open_parsed_forms_cache(cache_file: str, hash_contents: bool) -> ParsedFormsCache | None:
+    return ParsedFormsCache(cache_file, hash_contents) if cache_file else None
+
+
+def get_submissions(
+    stage_config: StageOneConfig, parsed_forms_cache: ParsedFormsCache | None = None
+) -> list[ContestantSubmission]:
+    """
+    Load the submissions in the format set in the stage configuration ('forms_format')
+    """
+    forms_format = stage_config.forms_format
+
+    if forms_format not in get_args(FormsFormat):
+        raise StageException(f"Invalid forms format '{forms_format}' (Should be one of {get_args(FormsFormat)})")
+
+    if forms_format == "consolidated_csv":
+        return get_submissions_from_consolidated_csv(stage_config.forms_folder, stage_config.consolidated_csv_file)
+
+    if forms_format == "xlsx_workbook":
+        return get_submissions_from_forms_workbook(
+            f"{stage_config.forms_folder}/{stage_config.forms_workbook_file}",
+            stage_config.contestant_name_coords,
+            stage_config.entries_data_coords,
+            stage_config.xlsx_reader,
+        )
+
+    return get_submissions_from_forms_folder(
+        stage_config.forms_folder,
+        stage_config.contestant_name_coords,
+        stage_config.entries_data_coords,
+        stage_config.parsing_workers,
+        parsed_forms_cache,
+        stage_config.xlsx_reader,
+    )
+
+
+def iter_submissions(
+    stage_config: StageOneConfig, parsed_forms_cache: ParsedFormsCache | None = None
+) -> Iterator[ContestantSubmission]:
+    """
+    Load the submissions lazily, in the format set in the stage configuration ('forms_format'). XLSX forms (files or
+    sheets of a shared workbook) are parsed as they are consumed. A consolidated CSV is parsed whole
+    """
+    forms_format = stage_config.forms_format
+
+    if forms_format not in get_args(FormsFormat):
+        raise StageException(f"Invalid forms format '{forms_format}' (Should be one of {get_args(FormsFormat)})")
+
+    if forms_format == "consolidated_csv":
+        yield from get_submissions_from_consolidated_csv(stage_config.forms_folder, stage_config.consolidated_csv_file)
+        return
+
+    try:
+        if forms_format == "xlsx_workbook":
+            yield from iter_contestant_forms_xlsx_workbook(
+                f"{stage_config.forms_folder}/{stage_config.forms_workbook_file}",
+                stage_config.contestant_name_coords,
+                stage_config.entries_data_coords,
+                cast(XlsxReader, stage_config.xlsx_reader),
+            )
+            return
+
+        yield from iter_contestant_forms_xlsx_folder(
+            stage_config.forms_folder,
+            stage_config.contestant_name_coords,
+            stage_config.entries_data_coords,
+            stage_config.parsing_workers,
+            parsed_forms_cache,
+            cast(XlsxReader, stage_config.xlsx_reader),
+        )
+    except Exception as err:
+        raise StageException(f"Error parsing submission forms: {err}") from err
+
+
+def get_submissions_from_consolidated_csv(forms_folder: str, consolidated_csv_file: str) -> list[ContestantSubmission]:
+    try:
+        contestant_submissions = parse_consolidated_csv(f"{forms_folder}/{consolidated_csv_file}")
+    except Exception as err:
+        raise StageException(f"Error parsing consolidated submissions CSV: {err}") from err
+
+    return contestant_submissions
+
+
+def get_submissions_from_forms_workbook(
+    workbook_file: str, contestant_name_coords: str, entries_data_coords: str, xlsx_reader: str = "stream"
+) -> list[ContestantSubmission]:
+    try:
+        contestant_submissions = parse_contestant_forms_xlsx_workbook(
+            workbook_file, contestant_name_coords, entries_data_coords, cast(XlsxReader, xlsx_reader)
+        )
+    except Exception as err:
+        raise StageException(f"Error parsing submission forms: {err}") from err
+
+    return contestant_submissions
 
 
 def get_submissions_from_forms_folder(
-    forms_folder: str, contestant_name_coords: str, entries_data_coords: str
+    forms_folder: str,
+    contestant_name_coords: str,
+    entries_data_coords: str,
+    parsing_workers: int = 1,
+    parsed_forms_cache: ParsedFormsCache | None = None,
+    xlsx_reader: str = "stream",
 ) -> list[ContestantSubmission]:
     try:
         contestant_submissions = parse_contestant_forms_xlsx_folder(
-            forms_folder, contestant_name_coords, entries_data_coords
+            forms_folder,
+            contestant_name_coords,
+            entries_data_coords,
+            parsing_workers,
+            parsed_forms_cache,
+            cast(XlsxReader, xlsx_reader),
         )
     except Exception as err:
         raise StageException(f"Error parsing submission forms: {err}") from err
@@ -0,0 +1,62 @@
+from common.db.peewee_helpers import bulk_write, bulk_write_rows
+from common.model.models import Contestant, Entry, EntryTopic, Scoring, VideoOptions
+from common.model.submission_store import NO_TIMESTAMP, SubmissionStore
+from common.naming.identifiers import generate_contestant_uuid5, generate_entry_uuid5
+from common.naming.video_urls import canonical_video_key
+from common.time.timestamp import Timestamp
+
+
+def persist_submission_store(store: SubmissionStore, written_ids: set[str] | None = None) -> None:
+    """
+    Write the contestants, entries, scorings and video options of a submission store (to be run in a transaction)
+    :param written_ids: Ids of the contestants and entries already written by previous calls (when persisting a
+        stream of stores). Those are skipped, and the ones written now are added
+    """
+    contestant_ids = [generate_contestant_uuid5(name).hex for name in store.contestant_names]
+    entry_ids = [generate_entry_uuid5(title).hex for title in store.titles]
+
+    contestants = [
+        Contestant(id=contestant_id, name=name, avatar=None)
+        for contestant_id, name in zip(contestant_ids, store.contestant_names)
+    ]
+
+    entries_by_title: dict[str, Entry] = {}
+    video_options: list[VideoOptions] = []
+    for title_id, author_id, video_url, timestamp_start, timestamp_end, topic in store.entries():
+        title = store.titles[title_id]
+        # noinspection PyTypeChecker
+        entries_by_title[title] = Entry(
+            id=entry_ids[title_id],
+            title=title,
+            author=contestants[author_id],
+            video_url=video_url,  # pyright: ignore [reportArgumentType]
+            video_key=canonical_video_key(video_url) if video_url else None,
+            topic=EntryTopic(designation=topic) if topic else None,
+        )
+
+        if timestamp_start != NO_TIMESTAMP:
+            video_options.append(
+                VideoOptions(
+                    entry=entries_by_title[title],
+                    timestamp_start=Timestamp(timestamp_start),
+                    timestamp_end=Timestamp(timestamp_end),
+                )
+            )
+
+    entries = list(entries_by_title.values())
+
+    if written_ids is not None:
+        contestants = [contestant for contestant in contestants if contestant.id not in written_ids]
+        entries = [entry for entry in entries if entry.id not in written_ids]
+        written_ids.update(contestant.id for contestant in contestants)
+        written_ids.update(entry.id for entry in entries)
+
+    # Scoring rows go straight from the store columns to the insert, without a domain object per row
+    scoring_rows = (
+        (contestant_ids[contestant_id], entry_ids[title_id], score) for contestant_id, title_id, score in store.scores()
+    )
+
+    bulk_write(Contestant, contestants)
+    bulk_write(Entry, entries)
+    bulk_write_rows(Scoring.ORM, [Scoring.ORM.contestant, Scoring.ORM.entry, Scoring.ORM.score], scoring_rows)
+    bulk_write(VideoOptions, video_options)
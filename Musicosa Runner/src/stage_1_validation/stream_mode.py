@@ -0,0 +1,76 @@
+from common.config.config import Config
+from common.db.database import db
+from common.model.settings import load_settings_snapshot
+from stage_1_validation.custom_types import StageOneStreamInput
+from stage_1_validation.execute import execute_streaming
+from stage_1_validation.logic.helpers import build_submission_store
+from stage_1_validation.logic.validation import StreamingValidator
+from stage_1_validation.stage_input import (
+    get_entry_topics_from_db,
+    get_valid_titles,
+    iter_submissions,
+    open_parsed_forms_cache,
+)
+from stage_1_validation.stage_output import persist_submission_store
+from stage_1_validation.summary import stream_summary
+
+
+def stream_forms_folder(config: Config, clear_parsing_cache: bool = False) -> None:
+    """
+    Validate and persist the submissions as a stream: each one is parsed, validated and written before the next one
+    is read, so memory is bounded by a window of forms (see 'parsing_workers') plus the cross-submission aggregates
+    instead of the whole edition. Errors of each submission are printed as it goes through, and the ones that need
+    the whole collection (authorship, entry counts) when the stream ends. Everything is written in one transaction
+    """
+    forms_folder = config.stage_1.forms_folder
+    valid_titles_file = config.stage_1.valid_titles_file
+
+    parsed_forms_cache = open_parsed_forms_cache(
+        config.stage_1.parsing_cache_file, config.stage_1.parsing_cache_hash_contents
+    )
+
+    if parsed_forms_cache and clear_parsing_cache:
+        parsed_forms_cache.invalidate()
+
+    stage_input = StageOneStreamInput(
+        iter_submissions(config.stage_1, parsed_forms_cache),
+        get_valid_titles(forms_folder, valid_titles_file),
+        get_entry_topics_from_db(),
+    )
+    validator = StreamingValidator()
+    written_ids: set[str] = set()
+    validation_errors_count = 0
+
+    with db.atomic():
+        # Scorings reference entries whose author may come later in the stream. Checked on commit instead
+        db.pragma("defer_foreign_keys", 1)
+
+        for batch in execute_streaming(
+            stage_input, load_settings_snapshot(), validator, config.stage_2.ranking_engine == "sparse"
+        ):
+            for validation_error in batch.validation_errors:
+                print(validation_error)
+
+            validation_errors_count += len(batch.validation_errors)
+            persist_submission_store(build_submission_store([batch.submission]), written_ids)
+
+        collection_errors = validator.collection_errors() + [
+            entry_count_error for entry_count_error in validator.entry_count_errors() if entry_count_error
+        ]
+
+        for validation_error in collection_errors:
+            print(validation_error)
+
+        validation_errors_count += len(collection_errors)
+
+        for validation_warning in validator.collection_warnings():
+            print(validation_warning)
+
+    print(
+        stream_summary(
+            config,
+            validator.contestant_entry_counts,
+            validation_errors_count,
+            parsed_forms_cache.stats if parsed_forms_cache else None,
+        )
+    )
@@ -1,9 +1,17 @@
+from datetime import datetime
+
 from common.config.config import Config
 from common.formatting.tabulate import tab
-from stage_1_validation.custom_types import StageOneInput
+from stage_1_validation.custom_types import StageOneInput, StageOneOutput
+from stage_1_validation.logic.parsing.cache import ParsedFormsCacheStats
 
 
-def stage_summary(config: Config, stage_input: StageOneInput) -> str:
+def stage_summary(
+    config: Config,
+    stage_input: StageOneInput,
+    parsing_cache_stats: ParsedFormsCacheStats | None = None,
+    revalidated_count: int | None = None,
+) -> str:
     forms_folder, valid_titles_file = (config.stage_1.forms_folder, config.stage_1.valid_titles_file)
     submissions = stage_input.submissions
 
@@ -16,7 +24,15 @@ def stage_summary(config: Config, stage_input: StageOneInput) -> str:
     f("[STAGE 1 SUMMARY | Submission Validation]")
     f("")
     f(f"Submission forms folder: '{forms_folder}'")
+    if config.stage_1.forms_format == "consolidated_csv":
+        f(f"Consolidated submissions CSV: '{config.stage_1.consolidated_csv_file}'")
+    if config.stage_1.forms_format == "xlsx_workbook":
+        f(f"Submission forms workbook: '{config.stage_1.forms_workbook_file}'")
     f(f"Valid titles file: '{valid_titles_file}'")
+    if parsing_cache_stats and config.stage_1.forms_format == "xlsx":
+        f(f"Parsed forms cache: {parsing_cache_stats.hits} hit(s), {parsing_cache_stats.misses} miss(es)")
+    if revalidated_count is not None:
+        f(f"Revalidated submissions: {revalidated_count} of {len(submissions)}")
     f("")
     f(
         f"Contestants ({len(submissions)}):\n"
@@ -25,3 +41,75 @@ def stage_summary(config: Config, stage_input: StageOneInput) -> str:
     f("")
 
     return "\n".join(log_lines)
+
+
+def stream_summary(
+    config: Config,
+    contestant_entry_counts: list[tuple[str, int]],
+    validation_errors_count: int,
+    parsing_cache_stats: ParsedFormsCacheStats | None = None,
+) -> str:
+    forms_folder, valid_titles_file = (config.stage_1.forms_folder, config.stage_1.valid_titles_file)
+
+    log_lines = []
+
+    def f(content: str) -> None:
+        log_lines.append(content)
+
+    f("")
+    f("[STAGE 1 SUMMARY | Submission Validation (Streaming)]")
+    f("")
+    f(f"Submission forms folder: '{forms_folder}'")
+    if config.stage_1.forms_format == "consolidated_csv":
+        f(f"Consolidated submissions CSV: '{config.stage_1.consolidated_csv_file}'")
+    if config.stage_1.forms_format == "xlsx_workbook":
+        f(f"Submission forms workbook: '{config.stage_1.forms_workbook_file}'")
+    f(f"Valid titles file: '{valid_titles_file}'")
+    if parsing_cache_stats and config.stage_1.forms_format == "xlsx":
+        f(f"Parsed forms cache: {parsing_cache_stats.hits} hit(s), {parsing_cache_stats.misses} miss(es)")
+    f(f"Validation errors: {validation_errors_count}")
+    f("")
+    f(
+        f"Contestants ({len(contestant_entry_counts)}):\n"
+        f"{'\n'.join([tab(1, f'* {name} ({count} entries)') for name, count in contestant_entry_counts])}"
+    )
+    f("")
+
+    return "\n".join(log_lines)
+
+
+def watch_status(
+    changed_files: set[str],
+    stage_input: StageOneInput,
+    stage_output: StageOneOutput,
+    parsing_cache_stats: ParsedFormsCacheStats | None,
+    revalidated_count: int,
+) -> str:
+    submissions, validation_errors = stage_input.submissions, stage_output.validation_errors
+
+    log_lines = []
+
+    def f(content: str) -> None:
+        log_lines.append(content)
+
+    f("")
+    f(
+        f"[STAGE 1 WATCH | {datetime.now().strftime('%H:%M:%S')}] "
+        f"{f'Changed: {", ".join(sorted(changed_files))}' if changed_files else 'Initial validation'}"
+    )
+    f("")
+    if validation_errors:
+        for validation_error in validation_errors:
+            f(validation_error)
+        f("")
+    if stage_output.validation_warnings:
+        for validation_warning in stage_output.validation_warnings:
+            f(validation_warning)
+        f("")
+    f(
+        f"Submissions: {len(submissions)} "
+        f"({f'parsed {parsing_cache_stats.misses}, ' if parsing_cache_stats else ''}revalidated {revalidated_count}) | "
+        f"{f'Validation errors: {len(validation_errors)} ✘' if validation_errors else 'All valid ✔'}"
+    )
+
+    return "\n".join(log_lines)
@@ -0,0 +1,84 @@
+from common.config.config import Config
+from common.model.settings import load_settings_snapshot
+from stage_1_validation.constants import WATCH_DEBOUNCE_SECONDS, WATCH_POLL_INTERVAL_SECONDS
+from stage_1_validation.custom_types import StageOneInput
+from stage_1_validation.execute import execute
+from stage_1_validation.logic.folder_watcher import open_folder_watcher
+from stage_1_validation.logic.parsing.cache import ParsedFormsCache
+from stage_1_validation.logic.parsing.xlsx import is_xlsx_form_file
+from stage_1_validation.logic.validation import IncrementalValidator
+from stage_1_validation.stage_input import (
+    get_entry_topics_from_db,
+    get_submissions,
+    get_valid_titles,
+    open_parsed_forms_cache,
+)
+from stage_1_validation.summary import watch_status
+
+
+def watch_forms_folder(config: Config, clear_parsing_cache: bool = False) -> None:
+    """
+    Validate the submission forms, then revalidate them every time the forms folder changes until interrupted.
+    The process stays warm across updates: imports and the DB connection are set up once, forms are parsed through
+    the parsed forms cache (kept in memory if no cache file is configured) and only changed submissions get
+    revalidated. Nothing is persisted
+    """
+    forms_folder = config.stage_1.forms_folder
+    valid_titles_file = config.stage_1.valid_titles_file
+
+    parsed_forms_cache = open_parsed_forms_cache(
+        config.stage_1.parsing_cache_file, config.stage_1.parsing_cache_hash_contents
+    ) or ParsedFormsCache(None, config.stage_1.parsing_cache_hash_contents)
+
+    if clear_parsing_cache:
+        parsed_forms_cache.invalidate()
+
+    validator = IncrementalValidator()
+
+    def is_watched_file(file_name: str) -> bool:
+        if config.stage_1.forms_format == "consolidated_csv":
+            return file_name in (config.stage_1.consolidated_csv_file, valid_titles_file)
+
+        if config.stage_1.forms_format == "xlsx_workbook":
+            return file_name in (config.stage_1.forms_workbook_file, valid_titles_file)
+
+        return is_xlsx_form_file(file_name) or file_name == valid_titles_file
+
+    def validate(changed_files: set[str]) -> None:
+        # Invalidating explicitly catches rewrites the size + mtime fingerprint could miss (coarse mtime resolution)
+        for file_name in changed_files:
+            if is_xlsx_form_file(file_name):
+                parsed_forms_cache.invalidate(f"{forms_folder}/{file_name}")
+
+        parsed_forms_cache.reset_stats()
+
+        try:
+            submissions = get_submissions(config.stage_1, parsed_forms_cache)
+            stage_input = StageOneInput(
+                submissions, get_valid_titles(forms_folder, valid_titles_file), get_entry_topics_from_db()
+            )
+            result = execute(
+                stage_input, load_settings_snapshot(), validator, config.stage_2.ranking_engine == "sparse"
+            )
+        except Exception as err:
+            # A half-copied or broken form must not end the session. The next change triggers another attempt
+            print(f"[Stage 1 | Watch] {err}")
+            return
+
+        print(
+            watch_status(
+                changed_files,
+                stage_input,
+                result,
+                parsed_forms_cache.stats if config.stage_1.forms_format == "xlsx" else None,
+                validator.revalidated_count,
+            )
+        )
+
+    with open_folder_watcher(forms_folder, is_watched_file, WATCH_POLL_INTERVAL_SECONDS) as watcher:
+        print(f"Watching '{forms_folder}' for changes ({type(watcher).__name__}). Press Ctrl+C to stop")
+
+        validate(set())
+
+        while True:
+            validate(watcher.wait_for_changes(WATCH_DEBOUNCE_SECONDS))
@@ -0,0 +1,183 @@
+from typing import Iterable, cast, get_args
+
+from common.config.config import Config
+from common.custom_types import StageException
+from common.db.database import db
+from common.db.peewee_helpers import bulk_write_rows
+from common.model.models import ContestantStats, EntryStats, EntryStrategyStats, Scoring
+from common.model.ranking_snapshot import save_ranking_snapshot
+from common.model.settings import load_settings_snapshot
+from common.naming.identifiers import generate_contestant_uuid5, generate_entry_uuid5
+from stage_2_ranking.custom_types import EntryStats as S2_EntryStats
+from stage_2_ranking.custom_types import RankingStrategy, ScoreCorrection
+from stage_2_ranking.logic.incremental import IncrementalRanking
+from stage_2_ranking.snapshots import take_ranking_snapshot
+from stage_2_ranking.stage_input import load_musicosa_from_db
+from stage_2_ranking.summary import correction_summary
+
+
+def correct_scores(config: Config, corrections: list[ScoreCorrection]) -> None:
+    """
+    Apply score corrections to an already ranked edition: the scorings are updated and only the stats that changed
+    are rewritten, instead of re-ranking and re-writing the whole edition. The ranking sequences whose entry, average
+    score or place changed are reported, so only those templates and video bits need to be generated again.
+    Corrections re-rank like the 'python' engine (and the ones that rank the same), so they can't be applied on an
+    edition ranked otherwise. The rankings by extra strategies stored, if any, are ranked again as a whole
+    """
+    if config.stage_2.ranking_engine == "sparse":
+        raise StageException(
+            "Score corrections rank like the 'python' engine, not like the configured 'sparse' one "
+            "(Run Stage 2 again with the corrected scores instead)"
+        )
+
+    settings = load_settings_snapshot()
+    musicosa = load_musicosa_from_db()
+
+    if EntryStats.ORM.select().count() != len(musicosa.entries):
+        raise StageException("The edition is not ranked yet (Run Stage 2 first)")
+
+    contestant_names = {contestant.name for contestant in musicosa.contestants}
+    entry_titles = {entry.title for entry in musicosa.entries}
+
+    for correction in corrections:
+        if correction.contestant_name not in contestant_names:
+            raise StageException(f"Unknown contestant '{correction.contestant_name}'")
+
+        if correction.entry_title not in entry_titles:
+            raise StageException(f"Unknown entry '{correction.entry_title}'")
+
+        if not (settings.score_min_value <= correction.score <= settings.score_max_value):
+            raise StageException(
+                f"Invalid score '{correction.score}' "
+                f"(Should be a number between {settings.score_min_value} and {settings.score_max_value})"
+            )
+
+    ranking = IncrementalRanking(musicosa, settings)
+
+    # Only the stats that change are rewritten, so the stored ones have to be the ones the corrections start from
+    if not stored_ranking_matches(ranking.stats()[1]):
+        raise StageException(
+            "The stored ranking doesn't match the one the corrections are applied on (It was ranked by another "
+            "engine, or the scores changed since. Run Stage 2 again first)"
+        )
+
+    for correction in corrections:
+        ranking.set_score(correction.contestant_name, correction.entry_title, correction.score)
+
+    update = ranking.rerank()
+
+    entry_stats_ids = [generate_entry_uuid5(stat.entry.title).hex for stat in update.entries_stats]
+
+    stored_strategy_rows = cast(
+        Iterable[tuple[RankingStrategy]],
+        EntryStrategyStats.ORM.select(EntryStrategyStats.ORM.strategy).distinct().tuples(),
+    )
+    stored_strategies = {strategy for (strategy,) in stored_strategy_rows}
+    ranked_strategies = [strategy for strategy in get_args(RankingStrategy) if strategy in stored_strategies]
+
+    with db.atomic():
+        bulk_write_rows(
+            Scoring.ORM,
+            [Scoring.ORM.contestant, Scoring.ORM.entry, Scoring.ORM.score],
+            (
+                (
+                    generate_contestant_uuid5(correction.contestant_name).hex,
+                    generate_entry_uuid5(correction.entry_title).hex,
+                    correction.score,
+                )
+                for correction in corrections
+            ),
+            replace=True,
+        )
+
+        bulk_write_rows(
+            ContestantStats.ORM,
+            [
+                ContestantStats.ORM.contestant,
+                ContestantStats.ORM.avg_given_score,
+                ContestantStats.ORM.avg_received_score,
+            ],
+            (
+                (generate_contestant_uuid5(stat.contestant.name).hex, stat.avg_given_score, stat.avg_received_score)
+                for stat in update.contestants_stats
+            ),
+            replace=True,
+        )
+
+        # Rewritten as a whole, as ranking sequences are unique and the changed ones may have been swapped around
+        EntryStats.ORM.delete().where(EntryStats.ORM.entry.in_(entry_stats_ids)).execute()
+        bulk_write_rows(
+            EntryStats.ORM,
+            [
+                EntryStats.ORM.entry,
+                EntryStats.ORM.avg_score,
+                EntryStats.ORM.ranking_place,
+                EntryStats.ORM.ranking_sequence,
+            ],
+            (
+                (entry_id, stat.avg_score, stat.ranking_place, stat.ranking_sequence)
+                for entry_id, stat in zip(entry_stats_ids, update.entries_stats)
+            ),
+        )
+
+        if ranked_strategies:
+            # Imported on demand, NumPy is only needed by the extra strategies
+            from stage_2_ranking.logic.strategies import rank_musicosa_strategies
+
+            # Ranked from scratch on the corrected scorings, as written above (median and trimmed mean can't be
+            # updated from what changed alone)
+            strategies_stats = rank_musicosa_strategies(
+                load_musicosa_from_db(),
+                ranking.stats()[0],
+                settings,
+                ranked_strategies,
+                config.stage_2.trimmed_mean_proportion,
+            )
+
+            bulk_write_rows(
+                EntryStrategyStats.ORM,
+                [
+                    EntryStrategyStats.ORM.entry,
+                    EntryStrategyStats.ORM.strategy,
+                    EntryStrategyStats.ORM.score,
+                    EntryStrategyStats.ORM.ranking_place,
+                    EntryStrategyStats.ORM.ranking_sequence,
+                ],
+                (
+                    (
+                        generate_entry_uuid5(stat.entry.title).hex,
+                        stat.strategy,
+                        stat.score,
+                        stat.ranking_place,
+                        stat.ranking_sequence,
+                    )
+                    for stat in strategies_stats
+                ),
+                replace=True,
+            )
+
+        # The whole ranking after the corrections, to diff against the previous runs
+        save_ranking_snapshot(take_ranking_snapshot(ranking.stats()[1]), "correction")
+
+    print(correction_summary(corrections, update, ranked_strategies))
+
+
+def stored_ranking_matches(entries_stats: list[S2_EntryStats]) -> bool:
+    stored_entry_stats_rows = cast(
+        Iterable[tuple[str, float | None, int | None, int | None]],
+        EntryStats.ORM.select(
+            EntryStats.ORM.entry,
+            EntryStats.ORM.avg_score,
+            EntryStats.ORM.ranking_place,
+            EntryStats.ORM.ranking_sequence,
+        ).tuples(),
+    )
+    stored_entries_stats = {
+        entry_id: (avg_score, ranking_place, ranking_sequence)
+        for entry_id, avg_score, ranking_place, ranking_sequence in stored_entry_stats_rows
+    }
+
+    return stored_entries_stats == {
+        generate_entry_uuid5(stat.entry.title).hex: (stat.avg_score, stat.ranking_place, stat.ranking_sequence)
+        for stat in entries_stats
+    }
@@ -1,10 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Literal
 
+from common.model.submission_store import SubmissionStore
 
-@dataclass
-class Score:
-    entry_title: str
-    value: float
+RankingEngine = Literal["python", "numpy", "sqlite", "sparse", "fixed_point"]
+SimulationMethod = Literal["bootstrap", "leave_one_out"]
+RankingStrategy = Literal["mean", "mean_excluding_self", "median", "trimmed_mean"]
 
 
 @dataclass
@@ -16,13 +17,13 @@ class Entry:
 @dataclass
 class Contestant:
     name: str
-    scores: list[Score]
 
 
 @dataclass
 class Musicosa:
     contestants: list[Contestant]
     entries: list[Entry]
+    scores: SubmissionStore
 
 
 @dataclass
@@ -40,6 +41,15 @@ class EntryStats:
     ranking_sequence: int | None
 
 
+@dataclass
+class EntryStrategyStats:
+    entry: Entry
+    strategy: RankingStrategy
+    score: float | None
+    ranking_place: int
+    ranking_sequence: int
+
+
 @dataclass
 class StageTwoInput:
     musicosa: Musicosa
@@ -49,3 +59,43 @@ class StageTwoInput:
 class StageTwoOutput:
     contestants_stats: list[ContestantStats]
     entries_stats: list[EntryStats]
+    # Rankings by the extra strategies, if any. The official one is 'entries_stats'
+    strategies_stats: list[EntryStrategyStats] = field(default_factory=list)
+    # Scores cast for each entry (by title), if ranked by the 'sparse' engine
+    entries_vote_counts: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class ScoreCorrection:
+    contestant_name: str
+    entry_title: str
+    score: float
+
+
+@dataclass
+class RankingUpdate:
+    contestants_stats: list[ContestantStats]
+    entries_stats: list[EntryStats]
+    changed_ranking_sequences: list[int]
+
+
+@dataclass
+class EntryPlaceDistribution:
+    entry: Entry
+    ranking_place: int
+    mean_place: float
+    median_place: float
+    place_interval: tuple[int, int]
+    best_place: int
+    worst_place: int
+    top_places_rate: float
+
+
+@dataclass
+class RankingStability:
+    method: SimulationMethod
+    resamples: int
+    confidence_level: float
+    top_places: int
+    top_places_change_rate: float
+    entries: list[EntryPlaceDistribution]
@@ -1,14 +1,38 @@
+from typing import get_args
+
+from common.config.defaults import DEFAULT_MIN_VOTES, DEFAULT_TRIMMED_MEAN_PROPORTION
 from common.custom_types import StageException
 from common.model.models import SettingKeys
-from common.model.settings import is_setting_set
-from stage_2_ranking.custom_types import StageTwoInput, StageTwoOutput
+from common.model.settings import SettingsSnapshot
+from stage_2_ranking.custom_types import (
+    EntryStrategyStats,
+    RankingEngine,
+    RankingStrategy,
+    StageTwoInput,
+    StageTwoOutput,
+)
 from stage_2_ranking.logic.ranking import rank_musicosa
+from stage_2_ranking.logic.ranking_fixed_point import rank_musicosa_fixed_point
+from stage_2_ranking.logic.ranking_sparse import rank_musicosa_sparse
 
 
-def execute(stage_input: StageTwoInput) -> StageTwoOutput:
+def execute(
+    stage_input: StageTwoInput,
+    settings: SettingsSnapshot,
+    ranking_engine: RankingEngine = "python",
+    min_votes: int = DEFAULT_MIN_VOTES,
+    ranking_strategies: list[RankingStrategy] | None = None,
+    trimmed_mean_proportion: float = DEFAULT_TRIMMED_MEAN_PROPORTION,
+) -> StageTwoOutput:
+    """
+    :param min_votes: Scores an entry needs to be ranked along the rest (Only used by the 'sparse' engine)
+    :param ranking_strategies: Extra ranking strategies to rank the entries by, besides the official ranking (which
+        is the one the rest of stages use)
+    :param trimmed_mean_proportion: Proportion of the lowest and highest scores left out by the 'trimmed_mean' strategy
+    """
     musicosa = stage_input.musicosa
 
-    if not is_setting_set(SettingKeys.RANKING_SIGNIFICANT_DECIMAL_DIGITS):
+    if not settings.is_set(SettingKeys.RANKING_SIGNIFICANT_DECIMAL_DIGITS):
         raise StageException(f"Setting '{SettingKeys.RANKING_SIGNIFICANT_DECIMAL_DIGITS}' not set")
 
     if not musicosa:
@@ -20,6 +44,42 @@ def execute(stage_input: StageTwoInput) -> StageTwoOutput:
     if len(musicosa.contestants) == 0:
         raise StageException("Contestant list is empty")
 
-    contestants_stats, entries_stats = rank_musicosa(musicosa)
+    if ranking_engine not in get_args(RankingEngine):
+        raise StageException(f"Invalid ranking engine '{ranking_engine}' (Should be one of {get_args(RankingEngine)})")
+
+    for strategy in ranking_strategies or []:
+        if strategy not in get_args(RankingStrategy):
+            raise StageException(
+                f"Invalid ranking strategy '{strategy}' (Should be one of {get_args(RankingStrategy)})"
+            )
+
+    entries_vote_counts: dict[str, int] = {}
+
+    if ranking_engine == "numpy":
+        # Imported on demand, NumPy is only needed by this engine
+        from stage_2_ranking.logic.ranking_numpy import rank_musicosa_numpy
+
+        contestants_stats, entries_stats = rank_musicosa_numpy(musicosa, settings)
+    elif ranking_engine == "sqlite":
+        # Ranks the scorings stored in the DB, the ones in the stage input (if loaded) are not used
+        from stage_2_ranking.logic.ranking_sql import rank_musicosa_in_db
+
+        contestants_stats, entries_stats = rank_musicosa_in_db(musicosa, settings)
+    elif ranking_engine == "fixed_point":
+        contestants_stats, entries_stats = rank_musicosa_fixed_point(musicosa, settings)
+    elif ranking_engine == "sparse":
+        contestants_stats, entries_stats, entries_vote_counts = rank_musicosa_sparse(musicosa, settings, min_votes)
+    else:
+        contestants_stats, entries_stats = rank_musicosa(musicosa, settings)
+
+    strategies_stats: list[EntryStrategyStats] = []
+
+    if ranking_strategies:
+        # Imported on demand, NumPy is only needed by the extra strategies
+        from stage_2_ranking.logic.strategies import rank_musicosa_strategies
+
+        strategies_stats = rank_musicosa_strategies(
+            musicosa, contestants_stats, settings, list(dict.fromkeys(ranking_strategies)), trimmed_mean_proportion
+        )
 
-    return StageTwoOutput(contestants_stats, entries_stats)
+    return StageTwoOutput(contestants_stats, entries_stats, strategies_stats, entries_vote_counts)
@@ -0,0 +1,292 @@
+from array import array
+from bisect import bisect_left, insort
+from functools import reduce
+from math import isnan, nan
+
+from common.model.settings import SettingsSnapshot
+from stage_2_ranking.custom_types import Contestant, ContestantStats, Entry, EntryStats, Musicosa, RankingUpdate
+
+
+class IncrementalRanking:
+    """
+    Ranking of an edition that is kept up to date as scores get corrected, instead of being recalculated from scratch.
+    It keeps the per-entry score sums and the per-contestant given score sums and counts, so each score change is
+    applied in O(1), and re-ranking only recalculates the averages of what changed and the ranking positions between
+    the old and new positions of the entries that moved (plus the draw groups at their ends).
+    The initial sums are accumulated like rank_musicosa does, and so is the ranking. Score changes are applied as
+    deltas, which are exact for scores that are binary fractions (integers, halves, quarters...). With other scores an
+    updated sum may differ in its last bit from the one of a full ranking
+    """
+
+    significant_decimal_digits: int
+
+    # Contestants and entries, by index (in musicosa order)
+
+    contestants: list[Contestant]
+    entries: list[Entry]
+    contestant_indexes: dict[str, int]
+    entry_indexes: dict[str, int]
+    entry_authors: list[int]
+    authored_entries: list[list[int]]
+
+    # Scores (contestant-major, NaN if missing) and their sums
+
+    scores: array
+    entry_scores_sums: list[float]
+    given_scores_sums: list[float]
+    given_scores_counts: list[int]
+
+    # Stats and ranking (entry indexes in ascending ranking order, and the position of each entry in it)
+
+    entry_avg_scores: list[float]
+    contestant_avg_given_scores: list[float]
+    contestant_avg_received_scores: list[float]
+    ranking: list[int]
+    ranking_positions: list[int]
+    ranking_places: list[int]
+    ranking_sequences: list[int]
+
+    # Changes not re-ranked yet
+
+    _changed_entries: set[int]
+    _changed_contestants: set[int]
+
+    def __init__(self, musicosa: Musicosa, settings: SettingsSnapshot):
+        self.significant_decimal_digits = settings.significant_decimal_digits
+
+        self.contestants = musicosa.contestants
+        self.entries = musicosa.entries
+        self.contestant_indexes = {contestant.name: idx for idx, contestant in enumerate(self.contestants)}
+        self.entry_indexes = {entry.title: idx for idx, entry in enumerate(self.entries)}
+        self.entry_authors = [self.contestant_indexes[entry.author_name] for entry in self.entries]
+        self.authored_entries = [[] for _ in self.contestants]
+
+        for entry_idx, author_idx in enumerate(self.entry_authors):
+            self.authored_entries[author_idx].append(entry_idx)
+
+        contestant_count, entry_count = len(self.contestants), len(self.entries)
+
+        self.scores = array("d", [nan]) * (contestant_count * entry_count)
+        self.entry_scores_sums = [0.0] * entry_count
+        self.given_scores_sums = [0.0] * contestant_count
+        self.given_scores_counts = [0] * contestant_count
+
+        store = musicosa.scores
+        store_contestant_indexes = [self.contestant_indexes[name] for name in store.contestant_names]
+        store_entry_indexes = [self.entry_indexes[title] for title in store.titles]
+
+        # Accumulated in store row order, as rank_musicosa does
+        for store_contestant_id, store_title_id, score in store.scores():
+            contestant_idx, entry_idx = (
+                store_contestant_indexes[store_contestant_id],
+                store_entry_indexes[store_title_id],
+            )
+
+            self.scores[contestant_idx * entry_count + entry_idx] = score
+            self.entry_scores_sums[entry_idx] += score
+            self.given_scores_sums[contestant_idx] += score
+            self.given_scores_counts[contestant_idx] += 1
+
+        self.entry_avg_scores = [self.calculate_entry_avg_score(idx) for idx in range(entry_count)]
+        self.contestant_avg_given_scores = [self.calculate_avg_given_score(idx) for idx in range(contestant_count)]
+        self.contestant_avg_received_scores = [
+            self.calculate_avg_received_score(idx) for idx in range(contestant_count)
+        ]
+
+        self.ranking = sorted(range(entry_count), key=self.ranking_key)
+        self.ranking_positions = [0] * entry_count
+        self.ranking_places = [0] * entry_count
+        self.ranking_sequences = [0] * entry_count
+        self.update_ranking_span(0, entry_count - 1)
+
+        self._changed_entries = set()
+        self._changed_contestants = set()
+
+    def calculate_entry_avg_score(self, entry_idx: int) -> float:
+        return round(self.entry_scores_sums[entry_idx] / len(self.contestants), self.significant_decimal_digits)
+
+    def calculate_avg_given_score(self, contestant_idx: int) -> float:
+        return round(
+            self.given_scores_sums[contestant_idx] / self.given_scores_counts[contestant_idx],
+            self.significant_decimal_digits,
+        )
+
+    def calculate_avg_received_score(self, contestant_idx: int) -> float:
+        authored_entries = self.authored_entries[contestant_idx]
+
+        return round(
+            reduce(lambda acc, entry_idx: acc + self.entry_avg_scores[entry_idx], authored_entries, 0)
+            / len(authored_entries),
+            self.significant_decimal_digits,
+        )
+
+    def ranking_key(self, entry_idx: int) -> tuple[float, float, int]:
+        # Ascending average score, draws broken by the author's average given score, then by entries order
+        return (
+            self.entry_avg_scores[entry_idx],
+            self.contestant_avg_given_scores[self.entry_authors[entry_idx]],
+            entry_idx,
+        )
+
+    def set_score(self, contestant_name: str, entry_title: str, score: float) -> None:
+        """
+        Set the score a contestant gives to an entry (a new one or a correction). Applied to the sums right away, and
+        to the stats and the ranking on the next 'rerank'
+        """
+        contestant_idx, entry_idx = self.contestant_indexes[contestant_name], self.entry_indexes[entry_title]
+        score_idx = contestant_idx * len(self.entries) + entry_idx
+        previous_score = self.scores[score_idx]
+
+        if isnan(previous_score):
+            previous_score = 0.0
+            self.given_scores_counts[contestant_idx] += 1
+
+        self.scores[score_idx] = score
+        self.entry_scores_sums[entry_idx] += score - previous_score
+        self.given_scores_sums[contestant_idx] += score - previous_score
+
+        self._changed_entries.add(entry_idx)
+        self._changed_contestants.add(contestant_idx)
+
+    def rerank(self) -> RankingUpdate:
+        """
+        Apply the score changes since the last call to the stats and the ranking
+        :return: The contestant and entry stats that changed, and the ranking sequences whose entry, average score or
+            ranking place changed (the ones to re-render downstream)
+        """
+        avg_changed_entries: set[int] = set()
+        moved_entries: set[int] = set()
+        changed_contestants: set[int] = set()
+        authors_to_update: set[int] = set()
+
+        for entry_idx in self._changed_entries:
+            avg_score = self.calculate_entry_avg_score(entry_idx)
+
+            if avg_score != self.entry_avg_scores[entry_idx]:
+                avg_changed_entries.add(entry_idx)
+                self.entry_avg_scores[entry_idx] = avg_score
+                moved_entries.add(entry_idx)
+                authors_to_update.add(self.entry_authors[entry_idx])
+
+        for contestant_idx in self._changed_contestants:
+            avg_given_score = self.calculate_avg_given_score(contestant_idx)
+
+            if avg_given_score != self.contestant_avg_given_scores[contestant_idx]:
+                self.contestant_avg_given_scores[contestant_idx] = avg_given_score
+                changed_contestants.add(contestant_idx)
+                # Draw tiebreaker of the contestant's entries
+                moved_entries.update(self.authored_entries[contestant_idx])
+
+        for contestant_idx in authors_to_update:
+            avg_received_score = self.calculate_avg_received_score(contestant_idx)
+
+            if avg_received_score != self.contestant_avg_received_scores[contestant_idx]:
+                self.contestant_avg_received_scores[contestant_idx] = avg_received_score
+                changed_contestants.add(contestant_idx)
+
+        self._changed_entries.clear()
+        self._changed_contestants.clear()
+
+        changed_entries: list[int] = []
+        changed_ranking_sequences: set[int] = set()
+
+        if moved_entries:
+            # Every entry between the old and new positions of the moved ones shifts
+            span_start, span_end = len(self.entries) - 1, 0
+
+            for entry_idx in sorted(moved_entries, key=self.ranking_positions.__getitem__, reverse=True):
+                position = self.ranking_positions[entry_idx]
+                span_start, span_end = min(span_start, position), max(span_end, position)
+                del self.ranking[position]
+
+            for entry_idx in moved_entries:
+                insort(self.ranking, entry_idx, key=self.ranking_key)
+
+            for entry_idx in moved_entries:
+                position = bisect_left(self.ranking, self.ranking_key(entry_idx), key=self.ranking_key)
+                span_start, span_end = min(span_start, position), max(span_end, position)
+
+            # Places depend on where draw groups end, so the draw groups next to the span are recalculated too
+            span_start = self.draw_group_start(max(span_start - 1, 0))
+            span_end = self.draw_group_end(min(span_end + 1, len(self.entries) - 1))
+
+            previous_places_and_sequences = {
+                entry_idx: (self.ranking_places[entry_idx], self.ranking_sequences[entry_idx])
+                for entry_idx in self.ranking[span_start : span_end + 1]
+            }
+
+            self.update_ranking_span(span_start, span_end)
+
+            for entry_idx, (previous_place, previous_sequence) in previous_places_and_sequences.items():
+                place, sequence = self.ranking_places[entry_idx], self.ranking_sequences[entry_idx]
+
+                # Entries that only got their draw tiebreaker changed may have kept their place and sequence
+                if entry_idx in avg_changed_entries or place != previous_place or sequence != previous_sequence:
+                    changed_entries.append(entry_idx)
+                    changed_ranking_sequences.update((previous_sequence, sequence))
+
+        return RankingUpdate(
+            [self.contestant_stats(idx) for idx in sorted(changed_contestants)],
+            [self.entry_stats(idx) for idx in changed_entries],
+            sorted(changed_ranking_sequences),
+        )
+
+    def draw_group_start(self, position: int) -> int:
+        avg_score = self.entry_avg_scores[self.ranking[position]]
+
+        while position > 0 and self.entry_avg_scores[self.ranking[position - 1]] == avg_score:
+            position -= 1
+
+        return position
+
+    def draw_group_end(self, position: int) -> int:
+        avg_score = self.entry_avg_scores[self.ranking[position]]
+
+        while position < len(self.ranking) - 1 and self.entry_avg_scores[self.ranking[position + 1]] == avg_score:
+            position += 1
+
+        return position
+
+    def update_ranking_span(self, span_start: int, span_end: int) -> None:
+        """
+        Recalculate the positions, places and sequences of the entries within a span of the ranking, which has to
+        start and end with a whole draw group
+        """
+        entry_count = len(self.entries)
+        position = span_start
+
+        while position <= span_end:
+            draw_group_end = self.draw_group_end(position)
+
+            for draw_group_position in range(position, draw_group_end + 1):
+                entry_idx = self.ranking[draw_group_position]
+                self.ranking_positions[entry_idx] = draw_group_position
+                # A draw group shares the highest place among its entries
+                self.ranking_places[entry_idx] = entry_count - draw_group_end
+                self.ranking_sequences[entry_idx] = entry_count - draw_group_position
+
+            position = draw_group_end + 1
+
+    def contestant_stats(self, contestant_idx: int) -> ContestantStats:
+        return ContestantStats(
+            self.contestants[contestant_idx],
+            self.contestant_avg_given_scores[contestant_idx],
+            self.contestant_avg_received_scores[contestant_idx],
+        )
+
+    def entry_stats(self, entry_idx: int) -> EntryStats:
+        return EntryStats(
+            self.entries[entry_idx],
+            self.entry_avg_scores[entry_idx],
+            self.ranking_places[entry_idx],
+            self.ranking_sequences[entry_idx],
+        )
+
+    def stats(self) -> tuple[list[ContestantStats], list[EntryStats]]:
+        """
+        :return: Current stats of every contestant and entry, as rank_musicosa returns them
+        """
+        return (
+            [self.contestant_stats(idx) for idx in range(len(self.contestants))],
+            [self.entry_stats(idx) for idx in sorted(range(len(self.entries)), key=self.entry_avg_scores.__getitem__)],
+        )
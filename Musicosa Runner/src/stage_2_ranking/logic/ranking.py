@@ -1,26 +1,24 @@
 from functools import reduce
 
-from common.model.models import SettingKeys
-from common.model.settings import get_setting_by_key
-from stage_2_ranking.custom_types import Contestant, ContestantStats, Entry, EntryStats, Musicosa, Score
+from common.model.settings import SettingsSnapshot
+from common.model.submission_store import SubmissionStore
+from stage_2_ranking.custom_types import Contestant, ContestantStats, Entry, EntryStats, Musicosa
 
 
-def rank_musicosa(musicosa: Musicosa) -> tuple[list[ContestantStats], list[EntryStats]]:
-    significant_decimal_digits: int = get_setting_by_key(SettingKeys.RANKING_SIGNIFICANT_DECIMAL_DIGITS).value  # pyright: ignore [reportOptionalMemberAccess, reportAssignmentType]
+def rank_musicosa(musicosa: Musicosa, settings: SettingsSnapshot) -> tuple[list[ContestantStats], list[EntryStats]]:
+    significant_decimal_digits = settings.significant_decimal_digits
 
     # Entry average scores -> To calculate contestants' average received scores
 
     entries_avg_scores = calculate_entries_avg_scores(
-        [score for contestant in musicosa.contestants for score in contestant.scores],
-        len(musicosa.contestants),
-        significant_decimal_digits,
+        musicosa.scores, len(musicosa.contestants), significant_decimal_digits
     )
     entries_avg_scores_by_title = {title: avg_score for title, avg_score in entries_avg_scores}
 
     # Contestant's average given score
 
     contestants_avg_given_scores = calculate_contestants_avg_given_scores(
-        musicosa.contestants, significant_decimal_digits
+        musicosa.contestants, musicosa.scores, significant_decimal_digits
     )
     contestants_avg_given_scores_by_name = {name: avg_score for name, avg_score in contestants_avg_given_scores}
 
@@ -80,15 +78,22 @@ def rank_musicosa(musicosa: Musicosa) -> tuple[list[ContestantStats], list[Entry
 
 
 def calculate_contestants_avg_given_scores(
-    contestants: list[Contestant], significant_decimal_digits: int
+    contestants: list[Contestant], scores: SubmissionStore, significant_decimal_digits: int
 ) -> list[tuple[str, float]]:
     contestants_avg_given_scores: list[tuple[str, float]] = []
 
+    given_scores_sums = [0.0] * len(scores.contestant_names)
+    given_scores_counts = [0] * len(scores.contestant_names)
+
+    for contestant_id, _, score in scores.scores():
+        given_scores_sums[contestant_id] += score
+        given_scores_counts[contestant_id] += 1
+
     for contestant in contestants:
-        avg_given_score = 0
-        for score in contestant.scores:
-            avg_given_score += score.value
-        avg_given_score = round(avg_given_score / len(contestant.scores), significant_decimal_digits)
+        contestant_id = scores.contestant_id(contestant.name)
+        avg_given_score = round(
+            given_scores_sums[contestant_id] / given_scores_counts[contestant_id], significant_decimal_digits
+        )
 
         contestants_avg_given_scores.append((contestant.name, avg_given_score))
 
@@ -118,17 +123,14 @@ def calculate_contestants_avg_received_scores(
 
 
 def calculate_entries_avg_scores(
-    all_contestant_scores: list[Score], contestants_count: int, significant_decimal_digits: int
+    scores: SubmissionStore, contestants_count: int, significant_decimal_digits: int
 ) -> list[tuple[str, float]]:
-    entries_avg_scores: dict[str, float] = {}
+    entries_scores_sums = [0.0] * len(scores.titles)
 
-    for score in all_contestant_scores:
-        if score.entry_title not in entries_avg_scores:
-            entries_avg_scores[score.entry_title] = 0
+    for _, title_id, score in scores.scores():
+        entries_scores_sums[title_id] += score
 
-        entries_avg_scores[score.entry_title] += score.value
-
-    for title, avg_score in entries_avg_scores.items():
-        entries_avg_scores[title] = round(avg_score / contestants_count, significant_decimal_digits)
-
-    return list(entries_avg_scores.items())
+    return [
+        (title, round(scores_sum / contestants_count, significant_decimal_digits))
+        for title, scores_sum in zip(scores.titles, entries_scores_sums)
+    ]
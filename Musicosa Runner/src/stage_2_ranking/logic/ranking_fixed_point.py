@@ -0,0 +1,251 @@
+from functools import reduce
+from typing import cast
+
+from common.custom_types import StageException
+from common.model.settings import SettingsSnapshot
+from stage_2_ranking.custom_types import ContestantStats, EntryStats, Musicosa
+
+
+class FixedPointScale:
+    """
+    Scores and averages as scaled integers: a value is kept as value * 10^significant_decimal_digits, so averages
+    rounded to their significant digits are integers and compare exactly. Scores, and so the score range (min and max
+    values), have to fit in that precision
+    """
+
+    significant_decimal_digits: int
+    factor: int
+
+    def __init__(self, significant_decimal_digits: int, score_min_value: float, score_max_value: float):
+        self.significant_decimal_digits = significant_decimal_digits
+        self.factor = 10**significant_decimal_digits
+
+        self.to_fixed(score_min_value)
+        self.to_fixed(score_max_value)
+
+    @staticmethod
+    def from_settings(settings: SettingsSnapshot) -> "FixedPointScale":
+        return FixedPointScale(settings.significant_decimal_digits, settings.score_min_value, settings.score_max_value)
+
+    def to_fixed(self, value: float) -> int:
+        fixed = round(value * self.factor)
+
+        if fixed / self.factor != value:
+            raise StageException(
+                f"Score '{value}' has more than {self.significant_decimal_digits} decimal digits "
+                f"(Can't be ranked with the 'fixed_point' engine)"
+            )
+
+        return fixed
+
+    def to_float(self, fixed: int) -> float:
+        # Correctly rounded, so it's the same float 'round' gives for that many decimal digits
+        return fixed / self.factor
+
+    def from_rounded_float(self, value: float) -> int:
+        return round(value * self.factor)
+
+
+def rank_musicosa_fixed_point(
+    musicosa: Musicosa, settings: SettingsSnapshot
+) -> tuple[list[ContestantStats], list[EntryStats]]:
+    """
+    Same ranking as rank_musicosa, with scores converted to fixed point (see FixedPointScale) as they are read from
+    the submission store. Sums are exact integer sums, averages are rounded with integer division, and draws and
+    ranking order are integer comparisons.
+    An average exactly halfway between two rounded values is rounded the way rank_musicosa does it (from the float sum
+    of the same scores, in the same order), as that depends on the float error of the sum. So the stats are the same
+    """
+    scale = FixedPointScale.from_settings(settings)
+    store = musicosa.scores
+
+    factor = scale.factor
+
+    # Scores take a handful of distinct values, each one is checked once
+    for score in set(store.row_scores):
+        scale.to_fixed(score)
+
+    entries_scores_sums = [0] * len(store.titles)
+    given_scores_sums = [0] * len(store.contestant_names)
+    given_scores_counts = [0] * len(store.contestant_names)
+
+    for store_contestant_id, store_title_id, score in store.scores():
+        fixed_score = round(score * factor)
+        entries_scores_sums[store_title_id] += fixed_score
+        given_scores_sums[store_contestant_id] += fixed_score
+        given_scores_counts[store_contestant_id] += 1
+
+    # Entry average scores (over every contestant) and contestants' average given scores
+
+    contestant_count = len(musicosa.contestants)
+    store_title_ids = [store.title_id(entry.title) for entry in musicosa.entries]
+    store_contestant_ids = [store.contestant_id(contestant.name) for contestant in musicosa.contestants]
+
+    for contestant, store_contestant_id in zip(musicosa.contestants, store_contestant_ids):
+        if given_scores_counts[store_contestant_id] == 0:
+            raise StageException(f"Contestant '{contestant.name}' has not scored any entry")
+
+    entries_avg_scores = [
+        divide_rounded(entries_scores_sums[store_title_id], contestant_count) for store_title_id in store_title_ids
+    ]
+    contestants_avg_given_scores = [
+        divide_rounded(given_scores_sums[store_contestant_id], given_scores_counts[store_contestant_id])
+        for store_contestant_id in store_contestant_ids
+    ]
+
+    if None in entries_avg_scores or None in contestants_avg_given_scores:
+        round_halfway_averages(
+            musicosa, scale, entries_avg_scores, contestants_avg_given_scores, store_title_ids, store_contestant_ids
+        )
+
+    # Every average is rounded by now
+    fixed_entries_avg_scores = cast(list[int], entries_avg_scores)
+    fixed_avg_given_scores = cast(list[int], contestants_avg_given_scores)
+
+    # Contestants' average received scores
+
+    contestant_indexes = {contestant.name: idx for idx, contestant in enumerate(musicosa.contestants)}
+    entry_authors = [contestant_indexes[entry.author_name] for entry in musicosa.entries]
+    authored_entries: list[list[int]] = [[] for _ in range(contestant_count)]
+
+    for entry_idx, author_idx in enumerate(entry_authors):
+        authored_entries[author_idx].append(entry_idx)
+
+    contestant_stats_collection: list[ContestantStats] = []
+
+    for contestant_idx, contestant in enumerate(musicosa.contestants):
+        if not (contestant_authored_entries := authored_entries[contestant_idx]):
+            raise StageException(f"Contestant '{contestant.name}' has not authored any entry")
+
+        avg_received_score = divide_rounded(
+            sum(fixed_entries_avg_scores[entry_idx] for entry_idx in contestant_authored_entries),
+            len(contestant_authored_entries),
+        )
+
+        if avg_received_score is None:
+            avg_received_score = scale.from_rounded_float(
+                round(
+                    reduce(
+                        lambda acc, entry_idx: acc + scale.to_float(fixed_entries_avg_scores[entry_idx]),
+                        contestant_authored_entries,
+                        0,
+                    )
+                    / len(contestant_authored_entries),
+                    scale.significant_decimal_digits,
+                )
+            )
+
+        contestant_stats_collection.append(
+            ContestantStats(
+                contestant,
+                scale.to_float(fixed_avg_given_scores[contestant_idx]),
+                scale.to_float(avg_received_score),
+            )
+        )
+
+    # Ranking algorithm
+
+    # Ascending average score, draws broken by the author's average given score, then by entries order
+    entry_count = len(musicosa.entries)
+    ranking = sorted(
+        range(entry_count),
+        key=lambda entry_idx: (
+            fixed_entries_avg_scores[entry_idx],
+            fixed_avg_given_scores[entry_authors[entry_idx]],
+            entry_idx,
+        ),
+    )
+    ranking_places = [0] * entry_count
+    ranking_sequences = [0] * entry_count
+
+    position = 0
+
+    while position < entry_count:
+        draw_group_end = position
+        avg_score = fixed_entries_avg_scores[ranking[position]]
+
+        while draw_group_end + 1 < entry_count and fixed_entries_avg_scores[ranking[draw_group_end + 1]] == avg_score:
+            draw_group_end += 1
+
+        for draw_group_position in range(position, draw_group_end + 1):
+            # A draw group shares the highest place among its entries
+            ranking_places[ranking[draw_group_position]] = entry_count - draw_group_end
+            ranking_sequences[ranking[draw_group_position]] = entry_count - draw_group_position
+
+        position = draw_group_end + 1
+
+    # Listed in ascending average score order, like rank_musicosa does
+    entry_stats_collection = [
+        EntryStats(
+            musicosa.entries[entry_idx],
+            scale.to_float(fixed_entries_avg_scores[entry_idx]),
+            ranking_places[entry_idx],
+            ranking_sequences[entry_idx],
+        )
+        for entry_idx in sorted(range(entry_count), key=fixed_entries_avg_scores.__getitem__)
+    ]
+
+    return contestant_stats_collection, entry_stats_collection
+
+
+def divide_rounded(dividend: int, divisor: int) -> int | None:
+    """
+    :return: Quotient rounded to the nearest integer, or None if it is exactly halfway between two
+    """
+    quotient, remainder = divmod(dividend, divisor)
+
+    if 2 * remainder == divisor:
+        return None
+
+    return quotient + 1 if 2 * remainder > divisor else quotient
+
+
+def round_halfway_averages(
+    musicosa: Musicosa,
+    scale: FixedPointScale,
+    entries_avg_scores: list[int | None],
+    contestants_avg_given_scores: list[int | None],
+    store_title_ids: list[int],
+    store_contestant_ids: list[int],
+) -> None:
+    """
+    Fill in the averages left unrounded (None) by divide_rounded, from float sums accumulated in store row order,
+    like rank_musicosa does. Only those entries and contestants are summed
+    """
+    store = musicosa.scores
+
+    halfway_titles = {
+        store_title_id: idx
+        for idx, (store_title_id, avg_score) in enumerate(zip(store_title_ids, entries_avg_scores))
+        if avg_score is None
+    }
+    halfway_contestants = {
+        store_contestant_id: idx
+        for idx, (store_contestant_id, avg_score) in enumerate(zip(store_contestant_ids, contestants_avg_given_scores))
+        if avg_score is None
+    }
+
+    entries_scores_sums = dict.fromkeys(halfway_titles, 0.0)
+    given_scores_sums = dict.fromkeys(halfway_contestants, 0.0)
+    given_scores_counts = dict.fromkeys(halfway_contestants, 0)
+
+    for store_contestant_id, store_title_id, score in store.scores():
+        if store_title_id in entries_scores_sums:
+            entries_scores_sums[store_title_id] += score
+
+        if store_contestant_id in given_scores_sums:
+            given_scores_sums[store_contestant_id] += score
+            given_scores_counts[store_contestant_id] += 1
+
+    for store_title_id, idx in halfway_titles.items():
+        entries_avg_scores[idx] = scale.from_rounded_float(
+            round(entries_scores_sums[store_title_id] / len(musicosa.contestants), scale.significant_decimal_digits)
+        )
+
+    for store_contestant_id, idx in halfway_contestants.items():
+        contestants_avg_given_scores[idx] = scale.from_rounded_float(
+            round(
+                given_scores_sums[store_contestant_id] / given_scores_counts[store_contestant_id],
+                scale.significant_decimal_digits,
+            )
+        )
@@ -0,0 +1,101 @@
+import numpy as np
+
+from common.custom_types import StageException
+from common.model.settings import SettingsSnapshot
+from stage_2_ranking.custom_types import ContestantStats, EntryStats, Musicosa
+
+
+def rank_musicosa_numpy(
+    musicosa: Musicosa, settings: SettingsSnapshot
+) -> tuple[list[ContestantStats], list[EntryStats]]:
+    """
+    Same ranking as rank_musicosa, with the per-row and per-entry accumulations done by NumPy over the submission
+    store columns instead of Python loops and per-contestant rescans of the entries. Sums are accumulated with
+    np.bincount, which adds in array order like the Python engine does (a pairwise-summed reduction would not), and
+    rounding goes through Python's round (np.round rounds differently), so the output is bit-identical
+    """
+    significant_decimal_digits = settings.significant_decimal_digits
+    scores = musicosa.scores
+
+    row_contestants = np.frombuffer(scores.row_contestants, dtype=scores.row_contestants.typecode)
+    row_titles = np.frombuffer(scores.row_titles, dtype=scores.row_titles.typecode)
+    row_scores = np.frombuffer(scores.row_scores, dtype=scores.row_scores.typecode)
+
+    contestant_ids = np.array([scores.contestant_id(contestant.name) for contestant in musicosa.contestants])
+    entry_title_ids = np.array([scores.title_id(entry.title) for entry in musicosa.entries])
+    entry_author_ids = np.array([scores.contestant_id(entry.author_name) for entry in musicosa.entries])
+
+    # Entry average scores (over every contestant, scored or not)
+
+    entries_scores_sums = np.bincount(row_titles, weights=row_scores, minlength=len(scores.titles))
+    entries_avg_scores = round_values(entries_scores_sums / len(musicosa.contestants), significant_decimal_digits)
+
+    # Contestants' average given and received scores
+
+    given_scores_sums = np.bincount(row_contestants, weights=row_scores, minlength=len(scores.contestant_names))
+    given_scores_counts = np.bincount(row_contestants, minlength=len(scores.contestant_names))
+
+    received_scores_sums = np.bincount(
+        entry_author_ids, weights=entries_avg_scores[entry_title_ids], minlength=len(scores.contestant_names)
+    )
+    authored_entries_counts = np.bincount(entry_author_ids, minlength=len(scores.contestant_names))
+
+    for contestant, contestant_id in zip(musicosa.contestants, contestant_ids.tolist()):
+        if given_scores_counts[contestant_id] == 0:
+            raise StageException(f"Contestant '{contestant.name}' has not scored any entry")
+
+        if authored_entries_counts[contestant_id] == 0:
+            raise StageException(f"Contestant '{contestant.name}' has not authored any entry")
+
+    contestants_avg_given_scores = round_values(
+        average(given_scores_sums, given_scores_counts), significant_decimal_digits
+    )
+    contestants_avg_received_scores = round_values(
+        average(received_scores_sums, authored_entries_counts), significant_decimal_digits
+    )
+
+    contestant_stats_collection = [
+        ContestantStats(contestant, avg_given, avg_received)
+        for contestant, avg_given, avg_received in zip(
+            musicosa.contestants,
+            contestants_avg_given_scores[contestant_ids].tolist(),
+            contestants_avg_received_scores[contestant_ids].tolist(),
+        )
+    ]
+
+    # Ranking algorithm
+
+    # Ranking order: ascending average score, draws broken by the author's average given score. Both sorts are
+    # stable, so remaining draws keep the entries order
+    entry_avg_scores = entries_avg_scores[entry_title_ids]
+    ranking_order = np.lexsort((contestants_avg_given_scores[entry_author_ids], entry_avg_scores))
+
+    # A draw group shares the highest place among its entries: the one of its last entry in ranking order
+    entry_count = len(musicosa.entries)
+    sorted_avg_scores = entry_avg_scores[ranking_order]
+    draw_group_ends = np.searchsorted(sorted_avg_scores, sorted_avg_scores, side="right")
+
+    ranking_places = np.empty(entry_count, dtype=np.int64)
+    ranking_places[ranking_order] = entry_count - draw_group_ends + 1
+    ranking_sequences = np.empty(entry_count, dtype=np.int64)
+    ranking_sequences[ranking_order] = np.arange(entry_count, 0, -1)
+
+    # Listed in ascending average score order, like the Python engine does
+    avg_scores, places, sequences = entry_avg_scores.tolist(), ranking_places.tolist(), ranking_sequences.tolist()
+    entry_stats_collection = [
+        EntryStats(musicosa.entries[entry_idx], avg_scores[entry_idx], places[entry_idx], sequences[entry_idx])
+        for entry_idx in np.argsort(entry_avg_scores, kind="stable").tolist()
+    ]
+
+    return contestant_stats_collection, entry_stats_collection
+
+
+def round_values(values: np.ndarray, significant_decimal_digits: int) -> np.ndarray:
+    return np.array([round(value, significant_decimal_digits) for value in values.tolist()], dtype=np.float64)
+
+
+def average(sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    :return: Element-wise averages, NaN where the count is 0
+    """
+    return np.divide(sums, counts, out=np.full(len(sums), np.nan), where=counts > 0)
@@ -0,0 +1,195 @@
+from array import array
+from functools import reduce
+
+from common.custom_types import StageException
+from common.model.settings import SettingsSnapshot
+from common.model.submission_store import SubmissionStore
+from stage_2_ranking.custom_types import ContestantStats, EntryStats, Musicosa
+
+
+class SparseScores:
+    """
+    Scores of an edition in compressed sparse row layout, one row per entry (in musicosa order): the scores cast for
+    entry 'i' are in [indptr[i], indptr[i + 1]) of 'scores'. Only the scores cast take space, and each row keeps the
+    store row order
+    """
+
+    indptr: array
+    scores: array
+
+    def __init__(self, indptr: array, scores: array):
+        self.indptr = indptr
+        self.scores = scores
+
+    @staticmethod
+    def from_store(musicosa: Musicosa) -> "SparseScores":
+        store: SubmissionStore = musicosa.scores
+
+        store_entry_indexes = array("i", [-1]) * len(store.titles)
+
+        for idx, entry in enumerate(musicosa.entries):
+            store_entry_indexes[store.title_id(entry.title)] = idx
+
+        # Counting sort of the store rows by entry (stable, so each row keeps the store row order)
+
+        indptr = array("I", [0]) * (len(musicosa.entries) + 1)
+
+        for store_title_id in store.row_titles:
+            indptr[store_entry_indexes[store_title_id] + 1] += 1
+
+        for entry_idx in range(len(musicosa.entries)):
+            indptr[entry_idx + 1] += indptr[entry_idx]
+
+        scores = array("d", [0.0]) * len(store)
+        cursors = indptr[:-1]
+
+        for _, store_title_id, score in store.scores():
+            entry_idx = store_entry_indexes[store_title_id]
+            cursor = cursors[entry_idx]
+
+            scores[cursor] = score
+            cursors[entry_idx] = cursor + 1
+
+        return SparseScores(indptr, scores)
+
+    def vote_count(self, entry_idx: int) -> int:
+        return self.indptr[entry_idx + 1] - self.indptr[entry_idx]
+
+    def entry_scores(self, entry_idx: int) -> array:
+        return self.scores[self.indptr[entry_idx] : self.indptr[entry_idx + 1]]
+
+
+def rank_musicosa_sparse(
+    musicosa: Musicosa, settings: SettingsSnapshot, min_votes: int = 1
+) -> tuple[list[ContestantStats], list[EntryStats], dict[str, int]]:
+    """
+    Ranking for editions where contestants score only some of the entries. Entry average scores are over the scores
+    cast for each entry (rank_musicosa counts the missing ones as 0), and entries with fewer scores than 'min_votes'
+    are ranked after every entry that has enough, by the same rules among themselves. Entries with no scores at all
+    have no average score and are ranked last. With full ballots the stats are the ones of rank_musicosa.
+    Everything is accumulated over the scores cast, so time and memory don't depend on the size of a full ballot
+    :param min_votes: Scores an entry needs to be ranked along the rest
+    :return: Contestant and entry stats, and the scores cast for each entry (by title)
+    """
+    if min_votes < 1:
+        raise StageException(f"Invalid minimum votes '{min_votes}' (Should be at least 1)")
+
+    significant_decimal_digits = settings.significant_decimal_digits
+    contestant_count, entry_count = len(musicosa.contestants), len(musicosa.entries)
+
+    sparse_scores = SparseScores.from_store(musicosa)
+
+    # Entry average scores (over the scores cast)
+
+    entries_vote_counts = [sparse_scores.vote_count(idx) for idx in range(entry_count)]
+    entries_avg_scores: list[float | None] = [
+        round(sum_in_order(sparse_scores.entry_scores(idx)) / vote_count, significant_decimal_digits)
+        if vote_count > 0
+        else None
+        for idx, vote_count in enumerate(entries_vote_counts)
+    ]
+
+    # Contestants' average given and received scores
+
+    store = musicosa.scores
+    given_scores_sums = [0.0] * len(store.contestant_names)
+    given_scores_counts = [0] * len(store.contestant_names)
+
+    # In store row order, like rank_musicosa accumulates them
+    for store_contestant_id, _, score in store.scores():
+        given_scores_sums[store_contestant_id] += score
+        given_scores_counts[store_contestant_id] += 1
+
+    contestant_indexes = {contestant.name: idx for idx, contestant in enumerate(musicosa.contestants)}
+    entry_authors = [contestant_indexes[entry.author_name] for entry in musicosa.entries]
+    authored_entries: list[list[int]] = [[] for _ in range(contestant_count)]
+
+    for entry_idx, author_idx in enumerate(entry_authors):
+        authored_entries[author_idx].append(entry_idx)
+
+    contestants_avg_given_scores: list[float | None] = []
+    contestant_stats_collection: list[ContestantStats] = []
+
+    for contestant_idx, contestant in enumerate(musicosa.contestants):
+        store_contestant_id = store.contestant_id(contestant.name)
+        avg_given_score = (
+            round(given_scores_sums[store_contestant_id] / count, significant_decimal_digits)
+            if (count := given_scores_counts[store_contestant_id]) > 0
+            else None
+        )
+        # Entries nobody scored have no average score to receive
+        received_avg_scores = [
+            avg_score
+            for entry_idx in authored_entries[contestant_idx]
+            if (avg_score := entries_avg_scores[entry_idx]) is not None
+        ]
+        avg_received_score = (
+            round(
+                reduce(lambda acc, avg_score: acc + avg_score, received_avg_scores, 0) / len(received_avg_scores),
+                significant_decimal_digits,
+            )
+            if received_avg_scores
+            else None
+        )
+
+        contestants_avg_given_scores.append(avg_given_score)
+        contestant_stats_collection.append(ContestantStats(contestant, avg_given_score, avg_received_score))
+
+    # Ranking algorithm
+
+    def draw_key(entry_idx: int) -> tuple[bool, float]:
+        avg_score = entries_avg_scores[entry_idx]
+
+        return entries_vote_counts[entry_idx] >= min_votes, avg_score if avg_score is not None else float("-inf")
+
+    def ranking_key(entry_idx: int) -> tuple[bool, float, float, int]:
+        # Draws broken by the author's average given score, then by entries order
+        avg_given_score = contestants_avg_given_scores[entry_authors[entry_idx]]
+
+        return *draw_key(entry_idx), avg_given_score if avg_given_score is not None else float("-inf"), entry_idx
+
+    ranking = sorted(range(entry_count), key=ranking_key)
+    ranking_places = [0] * entry_count
+    ranking_sequences = [0] * entry_count
+
+    position = 0
+
+    while position < entry_count:
+        draw_group_end = position
+
+        while draw_group_end + 1 < entry_count and draw_key(ranking[draw_group_end + 1]) == draw_key(ranking[position]):
+            draw_group_end += 1
+
+        for draw_group_position in range(position, draw_group_end + 1):
+            # A draw group shares the highest place among its entries
+            ranking_places[ranking[draw_group_position]] = entry_count - draw_group_end
+            ranking_sequences[ranking[draw_group_position]] = entry_count - draw_group_position
+
+        position = draw_group_end + 1
+
+    # Listed in ascending average score order (entries with too few scores first), like rank_musicosa does
+    entry_stats_collection = [
+        EntryStats(
+            musicosa.entries[entry_idx],
+            entries_avg_scores[entry_idx],
+            ranking_places[entry_idx],
+            ranking_sequences[entry_idx],
+        )
+        for entry_idx in sorted(range(entry_count), key=draw_key)
+    ]
+
+    entries_vote_counts_by_title = {
+        entry.title: vote_count for entry, vote_count in zip(musicosa.entries, entries_vote_counts)
+    }
+
+    return contestant_stats_collection, entry_stats_collection, entries_vote_counts_by_title
+
+
+def sum_in_order(values: array) -> float:
+    # Left to right, like the Python engine accumulates (the builtin sum is compensated since Python 3.12)
+    total = 0.0
+
+    for value in values:
+        total += value
+
+    return total
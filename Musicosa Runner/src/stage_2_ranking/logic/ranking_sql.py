@@ -0,0 +1,145 @@
+import sqlite3
+
+from peewee import PeeweeException
+
+from common.custom_types import StageException
+from common.db.database import db
+from common.model.settings import SettingsSnapshot
+from stage_2_ranking.custom_types import ContestantStats, EntryStats, Musicosa
+
+# The score sums and the rounding are the ones of the Python engine (SQLite's sum() uses compensated summation and its
+# round() takes ties away from zero), so the ranking is bit-identical
+
+
+@db.aggregate("ranking_sum", num_params=1)
+class RankingSum:
+    total: float
+
+    def __init__(self):
+        self.total = 0.0
+
+    def step(self, value: float | None) -> None:
+        if value is not None:
+            self.total += value
+
+    def finalize(self) -> float:
+        return self.total
+
+
+@db.func("ranking_round", num_params=2, deterministic=True)
+def ranking_round(value: float | None, significant_decimal_digits: int) -> float | None:
+    return round(value, significant_decimal_digits) if value is not None else None
+
+
+# Entry average scores (over every contestant, scored or not) and contestants' average given scores. Computed once
+# into temporary tables, as both stats queries need them
+RANKING_TEMP_TABLES_STATEMENTS = [
+    """
+    CREATE TEMP TABLE ranking_entry_avg_scores AS
+    SELECT e.id AS entry, e.rowid AS entry_order, e.author,
+           ranking_round(coalesce(es.scores_sum, 0.0) / (SELECT count(*) FROM contestants), :digits) AS avg_score
+    FROM entries e
+             LEFT JOIN (SELECT cge.entry, ranking_sum(cge.score ORDER BY c.rowid) AS scores_sum
+                        FROM contestants c
+                                 JOIN contestant_grades_entries cge ON c.id = cge.contestant
+                        GROUP BY cge.entry) es ON e.id = es.entry
+    """,
+    """
+    CREATE TEMP TABLE ranking_avg_given_scores AS
+    SELECT c.id AS contestant, ranking_round(ranking_sum(cge.score ORDER BY cge.entry) / count(*), :digits) AS avg_score
+    FROM contestants c
+             JOIN contestant_grades_entries cge ON c.id = cge.contestant
+    GROUP BY c.id
+    """,
+]
+
+DROP_RANKING_TEMP_TABLES_STATEMENTS = [
+    "DROP TABLE IF EXISTS temp.ranking_entry_avg_scores",
+    "DROP TABLE IF EXISTS temp.ranking_avg_given_scores",
+]
+
+CONTESTANT_STATS_QUERY = """
+WITH avg_received_scores AS (SELECT eas.author AS contestant,
+                                    ranking_round(ranking_sum(eas.avg_score ORDER BY eas.entry_order) / count(*),
+                                                  :digits) AS avg_score
+                             FROM ranking_entry_avg_scores eas
+                             GROUP BY eas.author)
+SELECT c.name, ags.avg_score, ars.avg_score
+FROM contestants c
+         LEFT JOIN ranking_avg_given_scores ags ON c.id = ags.contestant
+         LEFT JOIN avg_received_scores ars ON c.id = ars.contestant
+ORDER BY c.rowid
+"""
+
+# Counted from the top: a draw group shares the highest place among its entries (rank), and is sequenced by the
+# authors' average given scores, then by entries order (row_number)
+ENTRY_STATS_QUERY = """
+SELECT e.title,
+       eas.avg_score,
+       rank() OVER (ORDER BY eas.avg_score DESC),
+       row_number() OVER (ORDER BY eas.avg_score DESC, ags.avg_score DESC, eas.entry_order DESC)
+FROM ranking_entry_avg_scores eas
+         JOIN entries e ON eas.entry = e.id
+         LEFT JOIN ranking_avg_given_scores ags ON eas.author = ags.contestant
+ORDER BY eas.avg_score, eas.entry_order
+"""
+
+
+def rank_musicosa_in_db(
+    musicosa: Musicosa, settings: SettingsSnapshot
+) -> tuple[list[ContestantStats], list[EntryStats]]:
+    """
+    Same ranking as rank_musicosa, computed by SQLite with aggregates and window functions over the stored scorings,
+    so only the resulting stats rows are loaded into Python. The musicosa (which has to match what is stored) is only
+    used to pair those rows with its contestants and entries
+    """
+    # Sums are fed in the Python engine's order with ordered aggregates, supported since SQLite 3.44
+    if sqlite3.sqlite_version_info < (3, 44, 0):
+        raise StageException(f"The 'sqlite' ranking engine needs SQLite 3.44 or newer (Found {sqlite3.sqlite_version})")
+
+    params = {"digits": settings.significant_decimal_digits}
+
+    contestants_by_name = {contestant.name: contestant for contestant in musicosa.contestants}
+    entries_by_title = {entry.title: entry for entry in musicosa.entries}
+
+    try:
+        for statement in RANKING_TEMP_TABLES_STATEMENTS:
+            db.execute_sql(statement, params)
+
+        contestant_stats_rows = db.execute_sql(CONTESTANT_STATS_QUERY, params).fetchall()
+        entry_stats_rows = db.execute_sql(ENTRY_STATS_QUERY).fetchall()
+    except PeeweeException as err:
+        raise StageException(f"Couldn't rank the stored submissions. Cause: {err}") from err
+    finally:
+        for statement in DROP_RANKING_TEMP_TABLES_STATEMENTS:
+            db.execute_sql(statement)
+
+    contestant_stats_collection: list[ContestantStats] = []
+
+    for name, avg_given, avg_received in contestant_stats_rows:
+        if name not in contestants_by_name:
+            raise StageException(f"Contestant '{name}' is stored but not in the stage input")
+
+        if avg_given is None:
+            raise StageException(f"Contestant '{name}' has not scored any entry")
+
+        if avg_received is None:
+            raise StageException(f"Contestant '{name}' has not authored any entry")
+
+        contestant_stats_collection.append(ContestantStats(contestants_by_name[name], avg_given, avg_received))
+
+    entry_stats_collection: list[EntryStats] = []
+
+    for title, avg_score, ranking_place, ranking_sequence in entry_stats_rows:
+        if title not in entries_by_title:
+            raise StageException(f"Entry '{title}' is stored but not in the stage input")
+
+        entry_stats_collection.append(EntryStats(entries_by_title[title], avg_score, ranking_place, ranking_sequence))
+
+    if len(contestant_stats_collection) != len(musicosa.contestants):
+        raise StageException("Stored contestants do not match the stage input")
+
+    if len(entry_stats_collection) != len(musicosa.entries):
+        raise StageException("Stored entries do not match the stage input")
+
+    return contestant_stats_collection, entry_stats_collection
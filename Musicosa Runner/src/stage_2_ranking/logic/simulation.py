@@ -0,0 +1,217 @@
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import cast, get_args
+
+import numpy as np
+
+from common.custom_types import StageException
+from stage_2_ranking.custom_types import (
+    EntryPlaceDistribution,
+    EntryStats,
+    Musicosa,
+    RankingStability,
+    SimulationMethod,
+)
+
+# Resamples ranked together in each batch (and task of the pool). Fixed, so the results for a seed don't depend on
+# the number of workers
+RESAMPLES_BATCH_SIZE = 500
+
+
+@dataclass
+class ResamplesBatch:
+    """
+    Bootstrap batches draw 'size' resamples from their own seed. Leave-one-out batches drop the contestants with
+    indexes in [first_resample, first_resample + size)
+    """
+
+    first_resample: int
+    size: int
+    seed: np.random.SeedSequence | None
+
+
+def simulate_ranking_stability(
+    musicosa: Musicosa,
+    entries_stats: list[EntryStats],
+    significant_decimal_digits: int,
+    method: SimulationMethod = "bootstrap",
+    resamples: int = 10000,
+    top_places: int = 10,
+    confidence_level: float = 0.95,
+    workers: int = 1,
+    seed: int | None = None,
+) -> RankingStability:
+    """
+    Rank many resamples of the contestants that scored the edition to see how much each entry's place depends on who
+    scored it. 'bootstrap' draws as many contestants as there are with replacement for each resample, 'leave_one_out'
+    drops each contestant once (so there are as many resamples as contestants).
+    Resamples are ranked in batches: the entry average scores of a whole batch come from one product of the
+    per-resample contestant weights and the contestants x entries score matrix, and places from a row-wise sort.
+    Batches are spread over a process pool
+    :param entries_stats: Actual ranking (by rank_musicosa) to compare the resamples against
+    :return: Place distribution of each entry, in actual ranking order, and how often the top places change
+    """
+    if method not in get_args(SimulationMethod):
+        raise StageException(f"Invalid simulation method '{method}' (Should be one of {get_args(SimulationMethod)})")
+
+    if resamples < 1:
+        raise StageException(f"Invalid number of resamples '{resamples}' (Should be at least 1)")
+
+    if top_places < 1:
+        raise StageException(f"Invalid number of top places '{top_places}' (Should be at least 1)")
+
+    if not 0 < confidence_level < 1:
+        raise StageException(f"Invalid confidence level '{confidence_level}' (Should be between 0 and 1)")
+
+    contestant_count = len(musicosa.contestants)
+
+    if method == "leave_one_out":
+        if contestant_count < 2:
+            raise StageException("Leave-one-out needs at least 2 contestants")
+
+        resamples = contestant_count
+
+    scores_matrix = build_scores_matrix(musicosa)
+
+    if method == "bootstrap":
+        batch_seeds = np.random.SeedSequence(seed).spawn(-(-resamples // RESAMPLES_BATCH_SIZE))
+        batches = [
+            ResamplesBatch(first_resample, min(RESAMPLES_BATCH_SIZE, resamples - first_resample), batch_seed)
+            for first_resample, batch_seed in zip(range(0, resamples, RESAMPLES_BATCH_SIZE), batch_seeds)
+        ]
+    else:
+        batches = [
+            ResamplesBatch(first_resample, min(RESAMPLES_BATCH_SIZE, resamples - first_resample), None)
+            for first_resample in range(0, resamples, RESAMPLES_BATCH_SIZE)
+        ]
+
+    rank_batch = partial(
+        rank_resamples_batch, scores_matrix=scores_matrix, significant_decimal_digits=significant_decimal_digits
+    )
+
+    if workers <= 1 or len(batches) == 1:
+        resample_places = np.concatenate(list(map(rank_batch, batches)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            resample_places = np.concatenate(list(executor.map(rank_batch, batches)))
+
+    return summarize_resample_places(musicosa, entries_stats, resample_places, method, top_places, confidence_level)
+
+
+def build_scores_matrix(musicosa: Musicosa) -> np.ndarray:
+    """
+    :return: Contestants x entries matrix (in musicosa order) with the scores, 0 where missing, as missing scores
+        count as 0 in entry averages
+    """
+    scores = musicosa.scores
+
+    contestant_indexes = np.full(len(scores.contestant_names), -1)
+    contestant_indexes[[scores.contestant_id(contestant.name) for contestant in musicosa.contestants]] = np.arange(
+        len(musicosa.contestants)
+    )
+    entry_indexes = np.full(len(scores.titles), -1)
+    entry_indexes[[scores.title_id(entry.title) for entry in musicosa.entries]] = np.arange(len(musicosa.entries))
+
+    row_contestants = contestant_indexes[np.frombuffer(scores.row_contestants, dtype=scores.row_contestants.typecode)]
+    row_entries = entry_indexes[np.frombuffer(scores.row_titles, dtype=scores.row_titles.typecode)]
+    row_scores = np.frombuffer(scores.row_scores, dtype=scores.row_scores.typecode)
+
+    scores_matrix = np.zeros((len(musicosa.contestants), len(musicosa.entries)))
+    scores_matrix[row_contestants, row_entries] = row_scores
+
+    return scores_matrix
+
+
+def rank_resamples_batch(
+    batch: ResamplesBatch, scores_matrix: np.ndarray, significant_decimal_digits: int
+) -> np.ndarray:
+    """
+    :return: Resamples x entries matrix with the place of each entry in each resample
+    """
+    contestant_count = scores_matrix.shape[0]
+
+    # How many times each contestant is in each resample
+    if batch.seed is not None:
+        weights = np.random.default_rng(batch.seed).multinomial(
+            contestant_count, np.full(contestant_count, 1 / contestant_count), size=batch.size
+        )
+    else:
+        weights = np.ones((batch.size, contestant_count))
+        weights[np.arange(batch.size), np.arange(batch.first_resample, batch.first_resample + batch.size)] = 0
+
+    avg_scores = np.round((weights @ scores_matrix) / weights.sum(axis=1, keepdims=True), significant_decimal_digits)
+
+    return rank_places(avg_scores)
+
+
+def rank_places(avg_scores: np.ndarray) -> np.ndarray:
+    """
+    Row-wise ranking places, as rank_musicosa assigns them: a draw group shares the highest place among its entries
+    """
+    resample_count, entry_count = avg_scores.shape
+
+    ranking_order = np.argsort(-avg_scores, axis=1, kind="stable")
+    sorted_avg_scores = np.take_along_axis(avg_scores, ranking_order, axis=1)
+
+    # Position where the draw group of each sorted entry starts
+    positions = np.broadcast_to(np.arange(entry_count), (resample_count, entry_count))
+    draw_group_starts = np.where(np.diff(sorted_avg_scores, axis=1, prepend=np.nan) != 0, positions, 0)
+    np.maximum.accumulate(draw_group_starts, axis=1, out=draw_group_starts)
+
+    places = np.empty((resample_count, entry_count), dtype=np.int32)
+    np.put_along_axis(places, ranking_order, draw_group_starts + 1, axis=1)
+
+    return places
+
+
+def summarize_resample_places(
+    musicosa: Musicosa,
+    entries_stats: list[EntryStats],
+    resample_places: np.ndarray,
+    method: SimulationMethod,
+    top_places: int,
+    confidence_level: float,
+) -> RankingStability:
+    entry_indexes = {entry.title: idx for idx, entry in enumerate(musicosa.entries)}
+    actual_places = np.zeros(len(musicosa.entries), dtype=np.int32)
+
+    for stat in entries_stats:
+        actual_places[entry_indexes[stat.entry.title]] = cast(int, stat.ranking_place)
+
+    in_top_places = resample_places <= top_places
+    # Resamples whose top places are taken by a different set of entries
+    top_places_changes = np.any(in_top_places != (actual_places <= top_places), axis=1)
+
+    tail = (1 - confidence_level) / 2
+    interval_lows = np.quantile(resample_places, tail, axis=0, method="lower").tolist()
+    interval_highs = np.quantile(resample_places, 1 - tail, axis=0, method="higher").tolist()
+    mean_places = resample_places.mean(axis=0).tolist()
+    median_places = np.median(resample_places, axis=0).tolist()
+    best_places = resample_places.min(axis=0).tolist()
+    worst_places = resample_places.max(axis=0).tolist()
+    top_places_rates = in_top_places.mean(axis=0).tolist()
+
+    entry_distributions = [
+        EntryPlaceDistribution(
+            entry,
+            int(actual_places[idx]),
+            mean_places[idx],
+            median_places[idx],
+            (int(interval_lows[idx]), int(interval_highs[idx])),
+            best_places[idx],
+            worst_places[idx],
+            top_places_rates[idx],
+        )
+        for idx, entry in enumerate(musicosa.entries)
+    ]
+    entry_distributions.sort(key=lambda distribution: (distribution.ranking_place, distribution.mean_place))
+
+    return RankingStability(
+        method,
+        len(resample_places),
+        confidence_level,
+        top_places,
+        float(top_places_changes.mean()),
+        entry_distributions,
+    )
@@ -0,0 +1,163 @@
+import numpy as np
+
+from common.custom_types import StageException
+from common.model.settings import SettingsSnapshot
+from stage_2_ranking.custom_types import ContestantStats, EntryStrategyStats, Musicosa, RankingStrategy
+from stage_2_ranking.logic.ranking_numpy import round_values
+
+
+def rank_musicosa_strategies(
+    musicosa: Musicosa,
+    contestants_stats: list[ContestantStats],
+    settings: SettingsSnapshot,
+    strategies: list[RankingStrategy],
+    trimmed_mean_proportion: float = 0.1,
+) -> list[EntryStrategyStats]:
+    """
+    Rank the entries by other scoring strategies than the official average score, all of them from one contestants x
+    entries score matrix, loaded once:
+    - 'mean': Average score over every contestant, missing scores as 0 (the official one)
+    - 'mean_excluding_self': Average of the scores cast, without the author's own
+    - 'median': Median of the scores cast
+    - 'trimmed_mean': Average of the scores cast, without the lowest and highest 'trimmed_mean_proportion' of them
+    Median and trimmed mean share a single sort of the score matrix columns. Draws are broken like the official ranking
+    (by the author's average given score, then by entries order)
+    :param contestants_stats: Official contestant stats (for the draw tiebreaker)
+    :return: Stats of every entry for each strategy, in strategies order, each in ascending score order
+    """
+    if not 0 <= trimmed_mean_proportion < 0.5:
+        raise StageException(
+            f"Invalid trimmed mean proportion '{trimmed_mean_proportion}' (Should be at least 0 and less than 0.5)"
+        )
+
+    significant_decimal_digits = settings.significant_decimal_digits
+    entry_count = len(musicosa.entries)
+
+    contestant_indexes = {contestant.name: idx for idx, contestant in enumerate(musicosa.contestants)}
+    entry_authors = np.array([contestant_indexes[entry.author_name] for entry in musicosa.entries], dtype=np.intp)
+    avg_given_scores_by_name = {stat.contestant.name: stat.avg_given_score for stat in contestants_stats}
+    author_avg_given_scores = np.array(
+        [avg_given_scores_by_name[entry.author_name] for entry in musicosa.entries], dtype=np.float64
+    )
+
+    scores_matrix = build_scores_matrix(musicosa, contestant_indexes)
+    is_scored = ~np.isnan(scores_matrix)
+    vote_counts = is_scored.sum(axis=0)
+
+    # Missing scores (NaN) are sorted last, so the scores cast for entry 'e' are sorted_scores[:vote_counts[e], e]
+    sorted_scores = (
+        np.sort(scores_matrix, axis=0) if "median" in strategies or "trimmed_mean" in strategies else scores_matrix
+    )
+
+    strategies_stats: list[EntryStrategyStats] = []
+
+    for strategy in strategies:
+        if strategy == "mean":
+            scores = np.where(is_scored, scores_matrix, 0.0).sum(axis=0) / len(musicosa.contestants)
+        elif strategy == "mean_excluding_self":
+            # Left out of the matrix rather than subtracted from the sums, so the sums are of the same scores
+            scores_excluding_self = scores_matrix.copy()
+            scores_excluding_self[entry_authors, np.arange(entry_count)] = np.nan
+            scores = divide(np.nansum(scores_excluding_self, axis=0), (~np.isnan(scores_excluding_self)).sum(axis=0))
+        elif strategy == "median":
+            scores = median(sorted_scores, vote_counts)
+        elif strategy == "trimmed_mean":
+            scores = trimmed_mean(sorted_scores, vote_counts, trimmed_mean_proportion)
+        else:
+            raise StageException(f"Unknown ranking strategy '{strategy}'")
+
+        strategies_stats.extend(
+            rank_strategy(
+                musicosa,
+                strategy,
+                round_values(scores, significant_decimal_digits),
+                author_avg_given_scores,
+            )
+        )
+
+    return strategies_stats
+
+
+def build_scores_matrix(musicosa: Musicosa, contestant_indexes: dict[str, int]) -> np.ndarray:
+    """
+    :return: Contestants x entries matrix (in musicosa order) with the scores, NaN where missing
+    """
+    store = musicosa.scores
+
+    store_contestant_indexes = np.full(len(store.contestant_names), -1, dtype=np.intp)
+    store_contestant_indexes[[store.contestant_id(name) for name in contestant_indexes]] = list(
+        contestant_indexes.values()
+    )
+    store_entry_indexes = np.full(len(store.titles), -1, dtype=np.intp)
+    store_entry_indexes[[store.title_id(entry.title) for entry in musicosa.entries]] = np.arange(len(musicosa.entries))
+
+    scores_matrix = np.full((len(musicosa.contestants), len(musicosa.entries)), np.nan)
+    scores_matrix[
+        store_contestant_indexes[np.frombuffer(store.row_contestants, dtype=store.row_contestants.typecode)],
+        store_entry_indexes[np.frombuffer(store.row_titles, dtype=store.row_titles.typecode)],
+    ] = np.frombuffer(store.row_scores, dtype=store.row_scores.typecode)
+
+    return scores_matrix
+
+
+def divide(dividends: np.ndarray, divisors: np.ndarray) -> np.ndarray:
+    """
+    :return: Element-wise quotients, NaN where the divisor is 0
+    """
+    return np.divide(dividends, divisors, out=np.full(len(dividends), np.nan), where=divisors > 0)
+
+
+def median(sorted_scores: np.ndarray, vote_counts: np.ndarray) -> np.ndarray:
+    columns = np.arange(sorted_scores.shape[1])
+    lower = sorted_scores[np.maximum(vote_counts - 1, 0) // 2, columns]
+    upper = sorted_scores[vote_counts // 2 - (vote_counts == 0), columns]
+
+    return np.where(vote_counts > 0, (lower + upper) / 2, np.nan)
+
+
+def trimmed_mean(sorted_scores: np.ndarray, vote_counts: np.ndarray, proportion: float) -> np.ndarray:
+    trimmed_counts = np.floor(vote_counts * proportion).astype(np.intp)
+
+    # Rows of the sorted scores kept for each entry, the rest are summed as 0 (so the kept ones are summed exactly in
+    # ascending order)
+    rows = np.arange(sorted_scores.shape[0])[:, np.newaxis]
+    is_kept = (rows >= trimmed_counts) & (rows < vote_counts - trimmed_counts)
+
+    return divide(np.where(is_kept, sorted_scores, 0.0).sum(axis=0), vote_counts - 2 * trimmed_counts)
+
+
+def rank_strategy(
+    musicosa: Musicosa, strategy: RankingStrategy, scores: np.ndarray, author_avg_given_scores: np.ndarray
+) -> list[EntryStrategyStats]:
+    """
+    Rank the entries by their strategy scores, like the official ranking ranks them by average score. Entries with no
+    score (no scores cast) are ranked last
+    """
+    entry_count = len(musicosa.entries)
+    ranking_scores = np.where(np.isnan(scores), -np.inf, scores)
+
+    # Ascending score, draws broken by the author's average given score. Both sorts are stable, so remaining draws
+    # keep the entries order
+    ranking_order = np.lexsort((author_avg_given_scores, ranking_scores))
+
+    # A draw group shares the highest place among its entries: the one of its last entry in ranking order
+    sorted_scores = ranking_scores[ranking_order]
+    draw_group_ends = np.searchsorted(sorted_scores, sorted_scores, side="right")
+
+    ranking_places = np.empty(entry_count, dtype=np.int64)
+    ranking_places[ranking_order] = entry_count - draw_group_ends + 1
+    ranking_sequences = np.empty(entry_count, dtype=np.int64)
+    ranking_sequences[ranking_order] = np.arange(entry_count, 0, -1)
+
+    entry_scores, places, sequences = scores.tolist(), ranking_places.tolist(), ranking_sequences.tolist()
+
+    return [
+        EntryStrategyStats(
+            musicosa.entries[entry_idx],
+            strategy,
+            entry_scores[entry_idx] if not np.isnan(entry_scores[entry_idx]) else None,
+            places[entry_idx],
+            sequences[entry_idx],
+        )
+        for entry_idx in np.argsort(ranking_scores, kind="stable").tolist()
+    ]
@@ -1,17 +1,91 @@
+import argparse
+from typing import cast, get_args
+
+from common.config.loader import load_config
 from common.custom_types import StageException
 from common.db.database import db
-from common.db.peewee_helpers import bulk_pack
-from common.model.models import Contestant, ContestantStats, Entry, EntryStats
-from stage_2_ranking.custom_types import StageTwoInput
+from common.db.peewee_helpers import bulk_write
+from common.model.models import Contestant, ContestantStats, Entry, EntryStats, EntryStrategyStats
+from common.model.ranking_snapshot import save_ranking_snapshot
+from common.model.settings import load_settings_snapshot
+from stage_2_ranking.correction_mode import correct_scores
+from stage_2_ranking.custom_types import (
+    RankingEngine,
+    RankingStrategy,
+    ScoreCorrection,
+    SimulationMethod,
+    StageTwoInput,
+)
 from stage_2_ranking.execute import execute
+from stage_2_ranking.simulation_mode import simulate_ranking
+from stage_2_ranking.snapshots import diff_ranking_runs, take_ranking_snapshot
 from stage_2_ranking.stage_input import load_musicosa_from_db
 from stage_2_ranking.summary import stage_summary
 
 if __name__ == "__main__":
+    # Configuration
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config_file")
+    parser.add_argument("--correct", nargs=3, action="append", metavar=("CONTESTANT", "TITLE", "SCORE"))
+    parser.add_argument("--simulate", choices=get_args(SimulationMethod))
+    parser.add_argument("--resamples", type=int, default=10000)
+    parser.add_argument("--top_places", type=int, default=10)
+    parser.add_argument("--confidence_level", type=float, default=0.95)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--diff", nargs="*", type=int, metavar="RUN_ID")
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config_file.strip() if args.config_file else None)
+    except FileNotFoundError | IOError | TypeError as err:
+        print(f"[Stage 2 | Configuration] {err}")
+        exit(1)
+
+    # Score correction mode
+
+    if args.correct:
+        try:
+            correct_scores(
+                config,
+                [ScoreCorrection(name.strip(), title.strip(), float(score)) for name, title, score in args.correct],
+            )
+        except Exception as err:
+            print(f"[Stage 2 | Score correction] {err}")
+            exit(1)
+
+        exit(0)
+
+    # Ranking stability simulation mode
+
+    if args.simulate:
+        try:
+            simulate_ranking(config, args.simulate, args.resamples, args.top_places, args.confidence_level, args.seed)
+        except Exception as err:
+            print(f"[Stage 2 | Simulation] {err}")
+            exit(1)
+
+        exit(0)
+
+    # Ranking runs diff mode
+
+    if args.diff is not None:
+        try:
+            diff_ranking_runs(args.diff)
+        except Exception as err:
+            print(f"[Stage 2 | Ranking diff] {err}")
+            exit(1)
+
+        exit(0)
+
     # Data retrieval
 
     try:
-        musicosa = load_musicosa_from_db()
+        # The extra ranking strategies rank the loaded scores, whatever the engine
+        musicosa = load_musicosa_from_db(
+            load_scores=config.stage_2.ranking_engine != "sqlite" or bool(config.stage_2.ranking_strategies)
+        )
+        settings = load_settings_snapshot()
     except Exception as err:
         print(f"[Stage 2 | Data retrieval] {err}")
         exit(1)
@@ -21,7 +95,14 @@ if __name__ == "__main__":
     # Stage execution
 
     try:
-        result = execute(stage_input)
+        result = execute(
+            stage_input,
+            settings,
+            cast(RankingEngine, config.stage_2.ranking_engine),
+            config.stage_2.min_votes,
+            cast(list[RankingStrategy], config.stage_2.ranking_strategies),
+            config.stage_2.trimmed_mean_proportion,
+        )
     except StageException as err:
         print(f"[Stage 2 | Execution] {err}")
         exit(1)
@@ -39,36 +120,48 @@ if __name__ == "__main__":
 
     with db.atomic() as tx:
         try:
-            (
-                ContestantStats.ORM.insert_many(
-                    bulk_pack(
-                        [
-                            ContestantStats(
-                                contestant=contestants_by_name[stat.contestant.name],
-                                avg_given_score=stat.avg_given_score,
-                                avg_received_score=stat.avg_received_score,
-                            )
-                            for stat in contestants_stats
-                        ]
+            bulk_write(
+                ContestantStats,
+                (
+                    ContestantStats(
+                        contestant=contestants_by_name[stat.contestant.name],
+                        avg_given_score=stat.avg_given_score,
+                        avg_received_score=stat.avg_received_score,
                     )
-                ).execute()
+                    for stat in contestants_stats
+                ),
             )
 
-            (
-                EntryStats.ORM.insert_many(
-                    bulk_pack(
-                        [
-                            EntryStats(
-                                entry=entries_by_title[stat.entry.title],
-                                avg_score=stat.avg_score,
-                                ranking_place=stat.ranking_place,
-                                ranking_sequence=stat.ranking_sequence,
-                            )
-                            for stat in entries_stats
-                        ]
+            bulk_write(
+                EntryStats,
+                (
+                    EntryStats(
+                        entry=entries_by_title[stat.entry.title],
+                        avg_score=stat.avg_score,
+                        ranking_place=stat.ranking_place,
+                        ranking_sequence=stat.ranking_sequence,
                     )
-                ).execute()
+                    for stat in entries_stats
+                ),
             )
+
+            # A new ranking, the rankings by strategies no longer configured are cleared as well
+            EntryStrategyStats.ORM.delete().execute()
+            bulk_write(
+                EntryStrategyStats,
+                (
+                    EntryStrategyStats(
+                        entry=entries_by_title[stat.entry.title],
+                        strategy=stat.strategy,
+                        score=stat.score,
+                        ranking_place=stat.ranking_place,
+                        ranking_sequence=stat.ranking_sequence,
+                    )
+                    for stat in result.strategies_stats
+                ),
+            )
+
+            save_ranking_snapshot(take_ranking_snapshot(entries_stats), "ranking")
         except Exception as err:
             tx.rollback()
             print(f"[Stage 2 | Data persistence] {err}")
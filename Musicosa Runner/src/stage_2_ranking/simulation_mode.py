@@ -0,0 +1,49 @@
+from common.config.config import Config
+from common.custom_types import StageException
+from common.model.settings import load_settings_snapshot
+from stage_2_ranking.custom_types import SimulationMethod, StageTwoInput
+from stage_2_ranking.execute import execute
+from stage_2_ranking.stage_input import load_musicosa_from_db
+from stage_2_ranking.summary import simulation_summary
+
+
+def simulate_ranking(
+    config: Config,
+    method: SimulationMethod,
+    resamples: int,
+    top_places: int,
+    confidence_level: float,
+    seed: int | None = None,
+) -> None:
+    """
+    Rank the stored edition and simulate how stable that ranking is against who scored it (see
+    simulate_ranking_stability). Nothing is written, so it can be run before the reveal as many times as needed.
+    Missing scores count as 0, as in the 'python' engine (and the ones that rank the same)
+    """
+    if config.stage_2.ranking_engine == "sparse":
+        raise StageException(
+            "The simulation ranks like the 'python' engine, counting missing scores as 0, so it would simulate another "
+            "ranking than the one of the configured 'sparse' engine"
+        )
+
+    # Imported on demand, NumPy is only needed by the simulation
+    from stage_2_ranking.logic.simulation import simulate_ranking_stability
+
+    settings = load_settings_snapshot()
+    musicosa = load_musicosa_from_db()
+
+    result = execute(StageTwoInput(musicosa), settings)
+
+    stability = simulate_ranking_stability(
+        musicosa,
+        result.entries_stats,
+        settings.significant_decimal_digits,
+        method,
+        resamples,
+        top_places,
+        confidence_level,
+        config.stage_2.simulation_workers,
+        seed,
+    )
+
+    print(simulation_summary(stability))
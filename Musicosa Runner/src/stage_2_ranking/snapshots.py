@@ -0,0 +1,44 @@
+from common.custom_types import StageException
+from common.model.models import Entry
+from common.model.ranking_snapshot import RankingSnapshot, load_latest_ranking_run_ids, load_ranking_run
+from common.naming.identifiers import generate_entry_uuid5
+from stage_2_ranking.custom_types import EntryStats
+from stage_2_ranking.summary import snapshot_diff_summary
+
+
+def take_ranking_snapshot(entries_stats: list[EntryStats]) -> RankingSnapshot:
+    return RankingSnapshot.from_rows(
+        (generate_entry_uuid5(stat.entry.title).hex, stat.ranking_place, stat.ranking_sequence, stat.avg_score)
+        for stat in entries_stats
+    )
+
+
+def diff_ranking_runs(run_ids: list[int]) -> None:
+    """
+    Show what changed in the ranking between two stored ranking runs: the given ones (previous and current), the given
+    one and the latest one, or the latest two if none are given. Only the packed snapshots of both runs are loaded,
+    not the stats tables
+    """
+    if len(run_ids) > 2:
+        raise StageException(f"Invalid ranking runs '{run_ids}' (Should be at most the previous and current run ids)")
+
+    if len(run_ids) < 2:
+        run_ids = [*run_ids, *load_latest_ranking_run_ids(2 - len(run_ids))]
+
+        if len(run_ids) < 2:
+            raise StageException("There are less than 2 ranking runs stored (Run Stage 2 again first)")
+
+    try:
+        previous_run, current_run = load_ranking_run(run_ids[0]), load_ranking_run(run_ids[1])
+    except ValueError as err:
+        raise StageException(str(err)) from err
+
+    changes = RankingSnapshot(previous_run.snapshot).diff(RankingSnapshot(current_run.snapshot))
+
+    changed_entry_ids = [change.entry_id for change in changes]
+    entry_titles = {
+        entry.id: entry.title
+        for entry in Entry.ORM.select(Entry.ORM.id, Entry.ORM.title).where(Entry.ORM.id.in_(changed_entry_ids))
+    }
+
+    print(snapshot_diff_summary(previous_run, current_run, changes, entry_titles))
@@ -1,23 +1,79 @@
+from typing import Iterable, cast
+
+from peewee import JOIN, Column
+
 from common.model.models import Contestant, Entry, Scoring
+from common.model.submission_store import SubmissionStore
 from stage_2_ranking.custom_types import Contestant as S2_Contestant
 from stage_2_ranking.custom_types import Entry as S2_Entry
 from stage_2_ranking.custom_types import Musicosa
-from stage_2_ranking.custom_types import Score as S2_Score
 
+# Rows are ordered like contestants and entries are stored (scorings by entry within each contestant), so scores are
+# accumulated in the same order every time
+
+
+def load_contestants_from_db() -> list[S2_Contestant]:
+    contestant_rows = cast(
+        Iterable[tuple[str]],
+        Contestant.ORM.select(Contestant.ORM.name).order_by(Column(Contestant.ORM, "rowid")).tuples(),
+    )
 
-def load_musicosa_from_db() -> Musicosa:
-    contestants: list[Contestant] = [contestant.to_domain() for contestant in Contestant.ORM.select()]
+    return [S2_Contestant(name) for (name,) in contestant_rows]
+
+
+def load_contestants_and_scores_from_db() -> tuple[list[S2_Contestant], SubmissionStore]:
+    """
+    Loads the contestants with their scorings in a single joined query, streamed as tuples
+    """
     s2_contestants: list[S2_Contestant] = []
+    scores = SubmissionStore()
+
+    contestant_scorings = (
+        Contestant.ORM.select(
+            Contestant.ORM.id, Contestant.ORM.name, Entry.ORM.title, Entry.ORM.author, Scoring.ORM.score
+        )
+        .join(Scoring.ORM, join_type=JOIN.LEFT_OUTER, on=(Contestant.ORM.id == Scoring.ORM.contestant))
+        .join(Entry.ORM, join_type=JOIN.LEFT_OUTER, on=(Scoring.ORM.entry == Entry.ORM.id))
+        .order_by(Column(Contestant.ORM, "rowid"), Scoring.ORM.entry)
+        .tuples()
+    )
+
+    store_contestant_id = -1
+    previous_contestant_id = None
+
+    for contestant_id, name, title, author_id, score in contestant_scorings.iterator():
+        # Rows come grouped by contestant
+        if contestant_id != previous_contestant_id:
+            s2_contestants.append(S2_Contestant(name))
+            store_contestant_id = scores.add_contestant(name)
+            previous_contestant_id = contestant_id
+
+        # Contestants without scorings come in a single row with no scoring columns
+        if title is not None:
+            scores.append_score(store_contestant_id, scores.add_title(title), score, author_id == contestant_id)
+
+    return s2_contestants, scores
+
+
+def load_entries_from_db() -> list[S2_Entry]:
+    entry_rows = cast(
+        Iterable[tuple[str, str | None]],
+        Entry.ORM.select(Entry.ORM.title, Contestant.ORM.name)
+        .join(Contestant.ORM, join_type=JOIN.LEFT_OUTER, on=(Entry.ORM.author == Contestant.ORM.id))
+        .order_by(Column(Entry.ORM, "rowid"))
+        .tuples(),
+    )
 
-    for contestant in contestants:
-        scoring_entries: list[Scoring] = [
-            scoring.to_domain() for scoring in Scoring.ORM.select().where(Scoring.ORM.contestant == contestant.id)
-        ]
-        s2_scores: list[S2_Score] = [S2_Score(scoring.entry.title, scoring.score) for scoring in scoring_entries]
+    return [S2_Entry(title, author_name or "") for title, author_name in entry_rows]
 
-        s2_contestants.append(S2_Contestant(contestant.name, s2_scores))
 
-    entries: list[Entry] = [entry.to_domain() for entry in Entry.ORM.select()]
-    s2_entries: list[S2_Entry] = [S2_Entry(entry.title, entry.author.name if entry.author else "") for entry in entries]
+def load_musicosa_from_db(load_scores: bool = True) -> Musicosa:
+    """
+    :param load_scores: Whether to load the scorings too (Not needed when ranking inside the DB)
+    """
+    if load_scores:
+        s2_contestants, scores = load_contestants_and_scores_from_db()
+    else:
+        s2_contestants, scores = load_contestants_from_db(), SubmissionStore()
 
-    return Musicosa(s2_contestants, s2_entries)
+    return Musicosa(s2_contestants, load_entries_from_db(), scores)
@@ -1,5 +1,14 @@
 from common.formatting.tabulate import tab
-from stage_2_ranking.custom_types import StageTwoInput, StageTwoOutput
+from common.model.models import RankingRun
+from common.model.ranking_snapshot import RankingRow, RankingRowChange, changed_ranking_sequences
+from stage_2_ranking.custom_types import (
+    RankingStability,
+    RankingStrategy,
+    RankingUpdate,
+    ScoreCorrection,
+    StageTwoInput,
+    StageTwoOutput,
+)
 
 
 def stage_summary(stage_input: StageTwoInput, stage_output: StageTwoOutput) -> str:
@@ -17,6 +26,11 @@ def stage_summary(stage_input: StageTwoInput, stage_output: StageTwoOutput) -> s
     f(f"# Contestants loaded: {len(musicosa.contestants)}")
     f(f"# Entries loaded: {len(musicosa.entries)}")
     f(f"# Entries ranked: {len(entries_stats)}")
+    if stage_output.strategies_stats:
+        f(
+            f"# Extra ranking strategies: "
+            f"{', '.join(dict.fromkeys([stat.strategy for stat in stage_output.strategies_stats]))}"
+        )
     f("")
     stats_display = [
         (stat.contestant.name, stat.avg_given_score, stat.avg_received_score) for stat in contestants_stats
@@ -26,5 +40,111 @@ def stage_summary(stage_input: StageTwoInput, stage_output: StageTwoOutput) -> s
         f"{'\n'.join([tab(1, f'* {name} (AGS: {ags}, ARS: {ars})') for name, ags, ars in stats_display])}"
     )
     f("")
+    if vote_counts := stage_output.entries_vote_counts:
+        f(
+            f"Entry vote counts (scores cast, out of {len(musicosa.contestants)}):\n"
+            f"{'\n'.join([tab(1, f'* {entry.title} (Votes: {vote_counts[entry.title]})') for entry in musicosa.entries])}"
+        )
+        f("")
+
+    return "\n".join(log_lines)
+
+
+def correction_summary(
+    corrections: list[ScoreCorrection], update: RankingUpdate, ranked_strategies: list[RankingStrategy]
+) -> str:
+    log_lines = []
+
+    def f(content: str) -> None:
+        log_lines.append(content)
+
+    f("")
+    f("[STAGE 2 SUMMARY | Score corrections]")
+    f("")
+    f(f"# Scores corrected: {len(corrections)}")
+    f(f"# Contestant stats updated: {len(update.contestants_stats)}")
+    f(f"# Entry stats updated: {len(update.entries_stats)}")
+    if ranked_strategies:
+        f(f"Extra ranking strategies ranked again: {', '.join(ranked_strategies)}")
+    f("")
+    f(
+        f"Changed ranking sequences (templates and video bits to generate again): "
+        f"{', '.join([str(sequence) for sequence in update.changed_ranking_sequences]) or 'None'}"
+    )
+    f("")
+    if update.contestants_stats:
+        f(
+            f"Contestant stats (avg_given_score, avg_received_score):\n"
+            f"{'\n'.join([tab(1, f'* {stat.contestant.name} (AGS: {stat.avg_given_score}, ARS: {stat.avg_received_score})') for stat in update.contestants_stats])}"
+        )
+        f("")
+    if update.entries_stats:
+        f(
+            f"Entry stats (avg_score, ranking_place, ranking_sequence):\n"
+            f"{'\n'.join([tab(1, f'* {stat.entry.title} (AS: {stat.avg_score}, RP: {stat.ranking_place}, RS: {stat.ranking_sequence})') for stat in update.entries_stats])}"
+        )
+        f("")
+
+    return "\n".join(log_lines)
+
+
+def simulation_summary(stability: RankingStability) -> str:
+    confidence = f"{stability.confidence_level:.0%}"
+    top = f"top {stability.top_places}"
+
+    log_lines = []
+
+    def f(content: str) -> None:
+        log_lines.append(content)
+
+    f("")
+    f(f"[STAGE 2 SUMMARY | Ranking stability ({stability.method})]")
+    f("")
+    f(f"# Resamples: {stability.resamples}")
+    f(f"# Resamples with a different {top}: {stability.top_places_change_rate:.1%}")
+    f("")
+    f(
+        f"Place distributions (actual place, mean, median, {confidence} interval, best-worst, in {top}):\n"
+        f"{'\n'.join([tab(1, f'* #{dist.ranking_place} {dist.entry.title} (Mean: {dist.mean_place:.2f}, Median: {dist.median_place:g}, CI: {dist.place_interval[0]}-{dist.place_interval[1]}, Range: {dist.best_place}-{dist.worst_place}, Top: {dist.top_places_rate:.1%})') for dist in stability.entries])}"
+    )
+    f("")
+
+    return "\n".join(log_lines)
+
+
+def snapshot_diff_summary(
+    previous_run: RankingRun, current_run: RankingRun, changes: list[RankingRowChange], entry_titles: dict[str, str]
+) -> str:
+    def row_display(row: RankingRow | None) -> str:
+        return f"AS: {row[3]}, RP: {row[1]}, RS: {row[2]}" if row is not None else "Not ranked"
+
+    def ranking_sequence(change: RankingRowChange) -> int:
+        row = change.current or change.previous
+
+        return (row[2] or 0) if row is not None else 0
+
+    log_lines = []
+
+    def f(content: str) -> None:
+        log_lines.append(content)
+
+    f("")
+    f(f"[STAGE 2 SUMMARY | Ranking diff (run {previous_run.id} -> run {current_run.id})]")
+    f("")
+    f(f"# Run {previous_run.id}: {previous_run.origin} at {previous_run.created_at}")
+    f(f"# Run {current_run.id}: {current_run.origin} at {current_run.created_at}")
+    f(f"# Entries changed: {len(changes)}")
+    f("")
+    f(
+        f"Changed ranking sequences (templates and video bits to generate again): "
+        f"{', '.join([str(sequence) for sequence in changed_ranking_sequences(changes)]) or 'None'}"
+    )
+    f("")
+    if changes:
+        f(
+            f"Entry stats (avg_score, ranking_place, ranking_sequence):\n"
+            f"{'\n'.join([tab(1, f'* {entry_titles.get(change.entry_id, change.entry_id)} ({row_display(change.previous)} -> {row_display(change.current)})') for change in sorted(changes, key=ranking_sequence)])}"
+        )
+        f("")
 
     return "\n".join(log_lines)
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from common.model.models import Avatar, Contestant, Entry, Setting, Template, VideoOptions
 
@@ -17,6 +17,64 @@ class Musicosa:
     entries_index_unfulfilled_video_options: dict[int, Entry]
 
 
+@dataclass
+class SequenceRange:
+    """
+    Ranking sequences from 'first' to 'last', both included. A missing end leaves that side open
+    """
+
+    first: int | None
+    last: int | None
+
+    def __contains__(self, sequence: int) -> bool:
+        return (self.first is None or sequence >= self.first) and (self.last is None or sequence <= self.last)
+
+
+@dataclass
+class AvatarSpec:
+    """
+    Avatar of a contestant: the existing avatar with that image file, or else a new one ('new_avatar', None if the
+    fulfillment file doesn't give all of its values)
+    """
+
+    image_filename: str
+    new_avatar: Avatar.Insert | None
+
+
+@dataclass
+class TemplateRule:
+    sequences: SequenceRange
+    avatar_scale: float
+    author_avatar_scale: float
+    video_box_width_px: int
+    video_box_height_px: int
+    video_box_position_top_px: int
+    video_box_position_left_px: int
+
+
+@dataclass
+class VideoOptionsRule:
+    sequences: SequenceRange
+    segment: str
+
+
+@dataclass
+class Fulfillment:
+    """
+    What Stage 3 fulfills without prompting, as declared in a fulfillment file. Avatars are paired by contestant name.
+    Templates and video options are rules by ranking sequence range, the first one that covers an entry applies.
+    Settings are only set if they aren't already
+    """
+
+    avatars: dict[str, AvatarSpec] = field(default_factory=dict)
+    frame_width_px: int | None = None
+    frame_height_px: int | None = None
+    templates: list[TemplateRule] = field(default_factory=list)
+    videoclips_override_top_n_duration: int | None = None
+    videoclips_override_duration_seconds: int | None = None
+    video_options: list[VideoOptionsRule] = field(default_factory=list)
+
+
 @dataclass
 class StageThreeInput:
     musicosa: Musicosa
@@ -1,7 +1,14 @@
 from common.custom_types import StageException
 from common.model.models import SettingKeys
-from common.model.settings import is_setting_set
-from stage_3_templates_pre_gen.custom_types import StageThreeInput, StageThreeOutput
+from common.model.settings import SettingsSnapshot
+from stage_3_templates_pre_gen.custom_types import Fulfillment, StageThreeInput, StageThreeOutput
+from stage_3_templates_pre_gen.logic.bulk_fulfillment import (
+    frame_settings_from_file,
+    generation_settings_from_file,
+    pair_avatars_from_file,
+    templates_from_file,
+    video_options_from_file,
+)
 from stage_3_templates_pre_gen.logic.fulfillment import (
     fulfill_unfulfilled_avatar_pairings,
     fulfill_unfulfilled_frame_settings,
@@ -11,19 +18,75 @@ from stage_3_templates_pre_gen.logic.fulfillment import (
 )
 
 
-def execute(stage_input: StageThreeInput) -> StageThreeOutput:
+def execute(
+    stage_input: StageThreeInput, settings: SettingsSnapshot, fulfillment: Fulfillment | None = None
+) -> StageThreeOutput:
+    """
+    :param fulfillment: Fulfillment file contents, applied in bulk first. Only what it doesn't cover is prompted for
+    """
     musicosa = stage_input.musicosa
 
-    if not is_setting_set(SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS):
+    if not settings.is_set(SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS):
         raise StageException(f"Setting '{SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS}' not set")
 
     if not musicosa:
         raise StageException("Musicosa data is empty")
 
-    avatar_pairings = fulfill_unfulfilled_avatar_pairings(musicosa.unfulfilled_contestants, musicosa.avatars)
-    frame_settings = fulfill_unfulfilled_frame_settings()
-    templates = fulfill_unfulfilled_templates(musicosa.entries_index_unfulfilled_templates)
-    generation_settings = fulfill_unfulfilled_generation_settings()
-    video_options = fulfill_unfulfilled_video_options(musicosa.entries_index_unfulfilled_video_options)
+    if fulfillment is None:
+        fulfillment = Fulfillment()
+
+    # Fulfillment file
+
+    file_avatar_pairings = pair_avatars_from_file(musicosa.unfulfilled_contestants, musicosa.avatars, fulfillment)
+    file_frame_settings = frame_settings_from_file(settings, fulfillment)
+    file_templates = templates_from_file(musicosa.entries_index_unfulfilled_templates, fulfillment)
+    file_generation_settings = generation_settings_from_file(settings, fulfillment)
+    file_video_options = video_options_from_file(
+        musicosa.entries_index_unfulfilled_video_options, fulfillment, settings
+    )
+
+    if fulfillment != Fulfillment():
+        print("")
+        print(".: FULFILLMENT FILE :.")
+        print("")
+        print(f"Avatar pairings: {len(file_avatar_pairings)}")
+        print(f"Frame settings: {len(file_frame_settings)}")
+        print(f"Entry templates: {len(file_templates)}")
+        print(f"Generation general settings: {len(file_generation_settings)}")
+        print(f"Entry video options: {len(file_video_options)}")
+
+    # Prompted for, what the fulfillment file doesn't cover
+
+    paired_contestant_names = {pairing.contestant.name for pairing in file_avatar_pairings}
+
+    avatar_pairings = file_avatar_pairings + fulfill_unfulfilled_avatar_pairings(
+        [
+            contestant
+            for contestant in musicosa.unfulfilled_contestants
+            if contestant.name not in paired_contestant_names
+        ],
+        musicosa.avatars,
+    )
+    frame_settings = file_frame_settings + fulfill_unfulfilled_frame_settings(
+        settings.with_settings(file_frame_settings)
+    )
+    templates = list(file_templates.values()) + fulfill_unfulfilled_templates(
+        {
+            sequence_number: entry
+            for sequence_number, entry in musicosa.entries_index_unfulfilled_templates.items()
+            if sequence_number not in file_templates
+        }
+    )
+    generation_settings = file_generation_settings + fulfill_unfulfilled_generation_settings(
+        settings.with_settings(file_generation_settings)
+    )
+    video_options = list(file_video_options.values()) + fulfill_unfulfilled_video_options(
+        {
+            sequence_number: entry
+            for sequence_number, entry in musicosa.entries_index_unfulfilled_video_options.items()
+            if sequence_number not in file_video_options
+        },
+        settings,
+    )
 
     return StageThreeOutput(avatar_pairings, frame_settings, templates, generation_settings, video_options)
@@ -0,0 +1,260 @@
+import re
+import tomllib
+from os import path
+from os.path import basename
+from typing import Any, cast
+
+from common.constants import VIDEOCLIPS_OVERRIDE_DURATION_LIMIT
+from common.custom_types import StageException
+from common.model.models import Avatar
+from common.time.timestamp import parse_clip_range
+from stage_3_templates_pre_gen.constants import AVATAR_IMG_SUPPORTED_FORMATS
+from stage_3_templates_pre_gen.custom_types import (
+    AvatarSpec,
+    Fulfillment,
+    SequenceRange,
+    TemplateRule,
+    VideoOptionsRule,
+)
+
+SEQUENCE_RANGE_REGEX = re.compile(r"^(\d*):(\d*)$")
+
+# Values of a new avatar besides its image file
+AVATAR_FIELDS = (
+    "image_height",
+    "score_box_position_top",
+    "score_box_position_left",
+    "score_box_font_scale",
+    "score_box_font_color",
+)
+TEMPLATE_FIELDS = (
+    "avatar_scale",
+    "author_avatar_scale",
+    "video_box_width_px",
+    "video_box_height_px",
+    "video_box_position_top_px",
+    "video_box_position_left_px",
+)
+
+TYPE_NAMES = {int: "an integer", float: "a number", str: "a string", dict: "a table", list: "an array of tables"}
+
+
+def load_fulfillment_file(fulfillment_file: str) -> Fulfillment:
+    """
+    Load a fulfillment file (TOML, see 'fulfillment.toml.example'). Every value is validated up front, so a mistake
+    in the file stops the stage before anything is fulfilled
+    """
+    if not path.isfile(fulfillment_file):
+        raise FileNotFoundError(f"Fulfillment file '{fulfillment_file}' not found")
+
+    with open(fulfillment_file, "rb") as file:
+        try:
+            contents = tomllib.load(file)
+        except tomllib.TOMLDecodeError as err:
+            raise StageException(f"Couldn't parse fulfillment file '{fulfillment_file}'. Cause: {err}") from err
+
+    return parse_fulfillment(contents)
+
+
+def parse_fulfillment(contents: dict[str, Any]) -> Fulfillment:
+    check_keys(
+        contents,
+        {"frame", "generation", "avatar_defaults", "avatars", "templates", "video_options"},
+        "fulfillment file",
+    )
+
+    fulfillment = Fulfillment()
+
+    frame = typed_value(contents, "frame", dict, "fulfillment file") or {}
+    check_keys(frame, {"width_px", "height_px"}, "[frame]")
+    fulfillment.frame_width_px = positive_int(frame, "width_px", "[frame]")
+    fulfillment.frame_height_px = positive_int(frame, "height_px", "[frame]")
+
+    generation = typed_value(contents, "generation", dict, "fulfillment file") or {}
+    check_keys(
+        generation, {"videoclips_override_top_n_duration", "videoclips_override_duration_seconds"}, "[generation]"
+    )
+    fulfillment.videoclips_override_top_n_duration = non_negative_int(
+        generation, "videoclips_override_top_n_duration", "[generation]"
+    )
+    fulfillment.videoclips_override_duration_seconds = override_duration_seconds(
+        generation, "videoclips_override_duration_seconds", "[generation]"
+    )
+
+    avatar_defaults = typed_value(contents, "avatar_defaults", dict, "fulfillment file") or {}
+    check_keys(avatar_defaults, {*AVATAR_FIELDS}, "[avatar_defaults]")
+    avatar_defaults = avatar_values(avatar_defaults, "[avatar_defaults]")
+
+    for contestant_name, avatar in (typed_value(contents, "avatars", dict, "fulfillment file") or {}).items():
+        location = f"[avatars] '{contestant_name}'"
+
+        if isinstance(avatar, str):
+            avatar = {"image_filename": avatar}
+        elif not isinstance(avatar, dict):
+            raise StageException(f"Invalid {location} ('{avatar}' should be an image file or a table)")
+
+        check_keys(avatar, {"image_filename", *AVATAR_FIELDS}, location)
+        fulfillment.avatars[contestant_name.strip()] = avatar_spec(avatar, avatar_defaults, location)
+
+    for idx, template in enumerate(typed_value(contents, "templates", list, "fulfillment file") or []):
+        location = f"[[templates]] #{idx + 1}"
+        template = table(template, location)
+        check_keys(template, {"sequences", *TEMPLATE_FIELDS}, location)
+
+        values = {
+            "avatar_scale": non_negative_number(template, "avatar_scale", location),
+            "author_avatar_scale": non_negative_number(template, "author_avatar_scale", location),
+            "video_box_width_px": positive_int(template, "video_box_width_px", location),
+            "video_box_height_px": positive_int(template, "video_box_height_px", location),
+            "video_box_position_top_px": non_negative_int(template, "video_box_position_top_px", location),
+            "video_box_position_left_px": non_negative_int(template, "video_box_position_left_px", location),
+        }
+
+        if missing_keys := [key for key, value in values.items() if value is None]:
+            raise StageException(f"Missing '{"', '".join(missing_keys)}' in {location}")
+
+        fulfillment.templates.append(TemplateRule(sequence_range(template, location), **values))
+
+    for idx, video_options in enumerate(typed_value(contents, "video_options", list, "fulfillment file") or []):
+        location = f"[[video_options]] #{idx + 1}"
+        video_options = table(video_options, location)
+        check_keys(video_options, {"sequences", "segment"}, location)
+
+        if (segment := typed_value(video_options, "segment", str, location)) is None:
+            raise StageException(f"Missing 'segment' in {location}")
+
+        if parse_clip_range(segment) is None:
+            raise StageException(f"Invalid 'segment' in {location} ('{segment}' should be '[HH:]MM:SS-[HH:]MM:SS')")
+
+        fulfillment.video_options.append(VideoOptionsRule(sequence_range(video_options, location), segment.strip()))
+
+    return fulfillment
+
+
+def avatar_spec(avatar: dict[str, Any], avatar_defaults: dict[str, Any], location: str) -> AvatarSpec:
+    if not (image_filename := (typed_value(avatar, "image_filename", str, location) or "").strip()):
+        raise StageException(f"Missing 'image_filename' in {location}")
+
+    if basename(image_filename.lower()).rsplit(".", 1)[-1] not in AVATAR_IMG_SUPPORTED_FORMATS:
+        raise StageException(
+            f"Invalid 'image_filename' in {location} "
+            f"('{image_filename}' should be one of '{"', '".join(AVATAR_IMG_SUPPORTED_FORMATS)}')"
+        )
+
+    values = {**avatar_defaults, **avatar_values(avatar, location)}
+    # The font color can be left out (the avatar's default)
+    values.setdefault("score_box_font_color", None)
+
+    new_avatar = Avatar.Insert(image_filename=image_filename, **values) if values.keys() >= {*AVATAR_FIELDS} else None
+
+    return AvatarSpec(image_filename, new_avatar)
+
+
+def avatar_values(avatar: dict[str, Any], location: str) -> dict[str, Any]:
+    values: dict[str, Any] = {}
+
+    if "image_height" in avatar:
+        values["image_height"] = positive_int(avatar, "image_height", location)
+
+    for key in ("score_box_position_top", "score_box_position_left"):
+        if key in avatar:
+            values[key] = typed_value(avatar, key, float, location)
+
+    if "score_box_font_scale" in avatar:
+        values["score_box_font_scale"] = non_negative_number(avatar, "score_box_font_scale", location)
+
+    if "score_box_font_color" in avatar:
+        values["score_box_font_color"] = (
+            typed_value(avatar, "score_box_font_color", str, location) or ""
+        ).strip() or None
+
+    return values
+
+
+def sequence_range(rule: dict[str, Any], location: str) -> SequenceRange:
+    """
+    :return: Ranking sequences of the rule: a single sequence, a '[first]:[last]' range, or all if not given
+    """
+    sequences = rule.get("sequences")
+
+    if sequences is None:
+        return SequenceRange(None, None)
+
+    if isinstance(sequences, int) and not isinstance(sequences, bool) and sequences >= 1:
+        return SequenceRange(sequences, sequences)
+
+    if isinstance(sequences, str) and (match := SEQUENCE_RANGE_REGEX.match(sequences.replace(" ", ""))):
+        first, last = int(match.group(1)) if match.group(1) else None, int(match.group(2)) if match.group(2) else None
+
+        if (first is None or first >= 1) and (first is None or last is None or first <= last):
+            return SequenceRange(first, last)
+
+    raise StageException(
+        f"Invalid 'sequences' in {location} ('{sequences}' should be a sequence number or a '[first]:[last]' range)"
+    )
+
+
+def table(value: Any, location: str) -> dict[str, Any]:
+    if not isinstance(value, dict):
+        raise StageException(f"Invalid {location} ('{value}' should be a table)")
+
+    return value
+
+
+def check_keys(values: dict[str, Any], allowed_keys: set[str], location: str) -> None:
+    if unknown_keys := [key for key in values if key not in allowed_keys]:
+        raise StageException(
+            f"Unknown key(s) in {location}: '{"', '".join(unknown_keys)}' "
+            f"(Should be any of '{"', '".join(sorted(allowed_keys))}')"
+        )
+
+
+def typed_value[T](values: dict[str, Any], key: str, value_type: type[T], location: str) -> T | None:
+    """
+    :return: The value of the key, None if missing. Integers are taken as numbers too
+    """
+    if (value := values.get(key)) is None:
+        return None
+
+    if value_type is float and isinstance(value, int) and not isinstance(value, bool):
+        value = float(value)
+
+    if not isinstance(value, value_type) or (isinstance(value, bool) and value_type is not bool):
+        raise StageException(f"Invalid '{key}' in {location} ('{value}' should be {TYPE_NAMES[value_type]})")
+
+    return cast(T, value)
+
+
+def positive_int(values: dict[str, Any], key: str, location: str) -> int | None:
+    if (value := typed_value(values, key, int, location)) is not None and value <= 0:
+        raise StageException(f"Invalid '{key}' in {location} ('{value}' should be a positive integer)")
+
+    return value
+
+
+def non_negative_int(values: dict[str, Any], key: str, location: str) -> int | None:
+    if (value := typed_value(values, key, int, location)) is not None and value < 0:
+        raise StageException(f"Invalid '{key}' in {location} ('{value}' should be 0 or a positive integer)")
+
+    return value
+
+
+def non_negative_number(values: dict[str, Any], key: str, location: str) -> float | None:
+    if (value := typed_value(values, key, float, location)) is not None and value < 0:
+        raise StageException(f"Invalid '{key}' in {location} ('{value}' should be 0 or a positive number)")
+
+    return value
+
+
+def override_duration_seconds(values: dict[str, Any], key: str, location: str) -> int | None:
+    if (
+        (value := typed_value(values, key, int, location)) is not None
+        and value <= 0
+        and value != VIDEOCLIPS_OVERRIDE_DURATION_LIMIT
+    ):
+        raise StageException(
+            f"Invalid '{key}' in {location} "
+            f"('{value}' should be {VIDEOCLIPS_OVERRIDE_DURATION_LIMIT} for the full duration or a positive integer)"
+        )
+
+    return value
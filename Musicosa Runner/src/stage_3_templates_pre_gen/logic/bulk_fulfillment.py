@@ -0,0 +1,171 @@
+from common.custom_types import StageException
+from common.model.models import (
+    Avatar,
+    Contestant,
+    Entry,
+    FrameSettingNames,
+    GenerationSettingNames,
+    Setting,
+    SettingGroupKeys,
+    SettingKeys,
+    Template,
+    VideoOptions,
+)
+from common.model.settings import SettingsSnapshot
+from common.time.timestamp import parse_clip_range, validate_clip_range_str
+from stage_3_templates_pre_gen.custom_types import AvatarPairing, Fulfillment, TemplateRule, VideoOptionsRule
+
+
+def pair_avatars_from_file(
+    unfulfilled_contestants: list[Contestant], available_avatars: list[Avatar], fulfillment: Fulfillment
+) -> list[AvatarPairing]:
+    """
+    :return: Pairings of the contestants the fulfillment file has an avatar for
+    """
+    avatars_by_filename: dict[str, Avatar] = {}
+
+    for avatar in available_avatars:
+        avatars_by_filename.setdefault(avatar.image_filename, avatar)
+
+    pairings: list[AvatarPairing] = []
+
+    for contestant in unfulfilled_contestants:
+        if (avatar_spec := fulfillment.avatars.get(contestant.name)) is None:
+            continue
+
+        if (avatar := avatars_by_filename.get(avatar_spec.image_filename)) is not None:
+            pairings.append(AvatarPairing(contestant, avatar))
+        elif avatar_spec.new_avatar is not None:
+            pairings.append(AvatarPairing(contestant, avatar_spec.new_avatar))
+        else:
+            raise StageException(
+                f"There is no avatar with image file '{avatar_spec.image_filename}' for '{contestant.name}' "
+                f"(Give all the values of a new avatar in the fulfillment file, or in [avatar_defaults])"
+            )
+
+    return pairings
+
+
+def frame_settings_from_file(settings: SettingsSnapshot, fulfillment: Fulfillment) -> list[Setting]:
+    """
+    :return: Frame settings not set yet that the fulfillment file has a value for
+    """
+    frame_settings: list[Setting] = []
+
+    if not settings.is_set(SettingKeys.FRAME_WIDTH_PX) and fulfillment.frame_width_px is not None:
+        frame_settings.append(
+            Setting(
+                group_key=SettingGroupKeys.FRAME,
+                setting=FrameSettingNames.WIDTH_PX,
+                value=fulfillment.frame_width_px,
+                type="integer",
+            )
+        )
+
+    if not settings.is_set(SettingKeys.FRAME_HEIGHT_PX) and fulfillment.frame_height_px is not None:
+        frame_settings.append(
+            Setting(
+                group_key=SettingGroupKeys.FRAME,
+                setting=FrameSettingNames.HEIGHT_PX,
+                value=fulfillment.frame_height_px,
+                type="integer",
+            )
+        )
+
+    return frame_settings
+
+
+def generation_settings_from_file(settings: SettingsSnapshot, fulfillment: Fulfillment) -> list[Setting]:
+    """
+    :return: Generation settings not set yet that the fulfillment file has a value for
+    """
+    generation_settings: list[Setting] = []
+
+    if (
+        not settings.is_set(SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_TOP_N_DURATION)
+        and fulfillment.videoclips_override_top_n_duration is not None
+    ):
+        generation_settings.append(
+            Setting(
+                group_key=SettingGroupKeys.GENERATION,
+                setting=GenerationSettingNames.VIDEOCLIPS_OVERRIDE_TOP_N_DURATION,
+                value=fulfillment.videoclips_override_top_n_duration,
+                type="integer",
+            )
+        )
+
+    if (
+        not settings.is_set(SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_DURATION_UP_TO_X_SECONDS)
+        and fulfillment.videoclips_override_duration_seconds is not None
+    ):
+        generation_settings.append(
+            Setting(
+                group_key=SettingGroupKeys.GENERATION,
+                setting=GenerationSettingNames.VIDEOCLIPS_OVERRIDE_DURATION_SECONDS,
+                value=fulfillment.videoclips_override_duration_seconds,
+                type="integer",
+            )
+        )
+
+    return generation_settings
+
+
+def templates_from_file(
+    entries_sequence_number_index: dict[int, Entry], fulfillment: Fulfillment
+) -> dict[int, Template]:
+    """
+    :return: Templates of the entries covered by a template rule of the fulfillment file, by ranking sequence
+    """
+    templates: dict[int, Template] = {}
+
+    for sequence_number, entry in entries_sequence_number_index.items():
+        if (rule := first_rule_covering(fulfillment.templates, sequence_number)) is None:
+            continue
+
+        templates[sequence_number] = Template(
+            entry=entry,
+            avatar_scale=rule.avatar_scale,
+            author_avatar_scale=rule.author_avatar_scale,
+            video_box_width_px=rule.video_box_width_px,
+            video_box_height_px=rule.video_box_height_px,
+            video_box_position_top_px=rule.video_box_position_top_px,
+            video_box_position_left_px=rule.video_box_position_left_px,
+        )
+
+    return templates
+
+
+def video_options_from_file(
+    entries_sequence_number_index: dict[int, Entry], fulfillment: Fulfillment, settings: SettingsSnapshot
+) -> dict[int, VideoOptions]:
+    """
+    :return: Video options of the entries covered by a video options rule of the fulfillment file, by ranking sequence
+    """
+    video_target_duration = settings.entry_video_duration_seconds
+
+    for rule in fulfillment.video_options:
+        if not validate_clip_range_str(rule.segment, video_target_duration):
+            raise StageException(
+                f"Invalid segment '{rule.segment}' in the fulfillment file "
+                f"(Must be in '[HH:]MM:SS-[HH:]MM:SS' format and last {video_target_duration} seconds)"
+            )
+
+    video_options: dict[int, VideoOptions] = {}
+
+    for sequence_number, entry in entries_sequence_number_index.items():
+        if (rule := first_rule_covering(fulfillment.video_options, sequence_number)) is None:
+            continue
+
+        clip_range = parse_clip_range(rule.segment)
+
+        video_options[sequence_number] = VideoOptions(
+            entry=entry,
+            timestamp_start=clip_range.start,  # pyright: ignore [reportOptionalMemberAccess]
+            timestamp_end=clip_range.end,  # pyright: ignore [reportOptionalMemberAccess]
+        )
+
+    return video_options
+
+
+def first_rule_covering[R: (TemplateRule, VideoOptionsRule)](rules: list[R], sequence_number: int) -> R | None:
+    return next((rule for rule in rules if sequence_number in rule.sequences), None)
@@ -1,7 +1,7 @@
 import re
 from os.path import basename
 
-from common.constants import VIDEO_TIMESTAMP_SEPARATOR, VIDEOCLIPS_OVERRIDE_DURATION_LIMIT
+from common.constants import VIDEOCLIPS_OVERRIDE_DURATION_LIMIT
 from common.formatting.tabulate import tab
 from common.input.better_input import better_input
 from common.model.models import (
@@ -16,8 +16,8 @@ from common.model.models import (
     Template,
     VideoOptions,
 )
-from common.model.settings import get_setting_by_key, is_setting_set
-from common.time.utils import parse_time, time_str_zfill, validate_video_timestamp_str
+from common.model.settings import SettingsSnapshot
+from common.time.timestamp import parse_clip_range, validate_clip_range_str
 from stage_3_templates_pre_gen.constants import AVATAR_IMG_SUPPORTED_FORMATS
 from stage_3_templates_pre_gen.custom_types import AvatarPairing
 from stage_3_templates_pre_gen.logic.helpers import (
@@ -139,14 +139,14 @@ def fulfill_unfulfilled_avatar_pairings(
     return pairings
 
 
-def fulfill_unfulfilled_frame_settings() -> list[Setting]:
+def fulfill_unfulfilled_frame_settings(settings: SettingsSnapshot) -> list[Setting]:
     frame_settings: list[Setting] = []
 
     print("")
     print(".: FRAME SETTINGS :.")
     print("")
 
-    if not is_setting_set(SettingKeys.FRAME_WIDTH_PX):
+    if not settings.is_set(SettingKeys.FRAME_WIDTH_PX):
         print("Frame width not set...")
         total_width = better_input(
             "Width of the frame where assets get rendered (px)",
@@ -166,7 +166,7 @@ def fulfill_unfulfilled_frame_settings() -> list[Setting]:
     else:
         print("Frame width set ✔")
 
-    if not is_setting_set(SettingKeys.FRAME_HEIGHT_PX):
+    if not settings.is_set(SettingKeys.FRAME_HEIGHT_PX):
         print("Frame height not set...")
         total_height = better_input(
             "Height of the frame where assets get rendered (px)",
@@ -308,14 +308,14 @@ def fulfill_unfulfilled_templates(entries_sequence_number_index: dict[int, Entry
     return list(templates.values())
 
 
-def fulfill_unfulfilled_generation_settings() -> list[Setting]:
+def fulfill_unfulfilled_generation_settings(settings: SettingsSnapshot) -> list[Setting]:
     generation_settings: list[Setting] = []
 
     print("")
     print(".: GENERATION GENERAL SETTINGS :.")
     print("")
 
-    if not is_setting_set(SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_TOP_N_DURATION):
+    if not settings.is_set(SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_TOP_N_DURATION):
         print("Override duration of top-N videoclips not set...")
         override_top_n_videoclips = better_input(
             "Override duration of top-N videoclips (0=disabled)",
@@ -335,7 +335,7 @@ def fulfill_unfulfilled_generation_settings() -> list[Setting]:
     else:
         print("Override duration of top-N videoclips set ✔")
 
-    if not is_setting_set(SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_DURATION_UP_TO_X_SECONDS):
+    if not settings.is_set(SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_DURATION_UP_TO_X_SECONDS):
         print("Duration override value not set...")
         override_duration_value = better_input(
             f"Duration override (seconds) of top-N videoclips ({VIDEOCLIPS_OVERRIDE_DURATION_LIMIT}=full duration)",
@@ -360,7 +360,9 @@ def fulfill_unfulfilled_generation_settings() -> list[Setting]:
     return generation_settings
 
 
-def fulfill_unfulfilled_video_options(entries_sequence_number_index: dict[int, Entry]) -> list[VideoOptions]:
+def fulfill_unfulfilled_video_options(
+    entries_sequence_number_index: dict[int, Entry], settings: SettingsSnapshot
+) -> list[VideoOptions]:
     video_options: dict[int, VideoOptions] = {}
 
     print("")
@@ -374,7 +376,7 @@ def fulfill_unfulfilled_video_options(entries_sequence_number_index: dict[int, E
         print("All entries have video options assigned ✔")
         return []
 
-    video_target_duration: int = get_setting_by_key(SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS).value  # pyright: ignore [reportOptionalMemberAccess, reportAssignmentType]
+    video_target_duration = settings.entry_video_duration_seconds
 
     def get_missing_options() -> list[int]:
         return [seq_num for seq_num in entries_sequence_number_index.keys() if seq_num not in video_options]
@@ -409,7 +411,7 @@ def fulfill_unfulfilled_video_options(entries_sequence_number_index: dict[int, E
 
         video_timestamp = better_input(
             "Videoclip segment ([HH:]MM:SS)-([HH:]MM:SS)",
-            lambda x: validate_video_timestamp_str(x, video_target_duration),
+            lambda x: validate_clip_range_str(x, video_target_duration),
             default=last_video_timestamp,
             error_message=lambda x: f"Invalid segment '{x}' "
             f"(Must be in '[HH:]MM:SS-[HH:]MM:SS' format and last "
@@ -418,15 +420,13 @@ def fulfill_unfulfilled_video_options(entries_sequence_number_index: dict[int, E
         )
         last_video_timestamp = video_timestamp
 
-        video_timestamp_bits = video_timestamp.split(VIDEO_TIMESTAMP_SEPARATOR)
-        start_time, end_time = (
-            parse_time(time_str_zfill(video_timestamp_bits[0])),
-            parse_time(time_str_zfill(video_timestamp_bits[1])),
-        )
+        clip_range = parse_clip_range(video_timestamp)
 
         for sequence_number in selection:
             video_options[sequence_number] = VideoOptions(
-                entry=entries_sequence_number_index[sequence_number], timestamp_start=start_time, timestamp_end=end_time
+                entry=entries_sequence_number_index[sequence_number],
+                timestamp_start=clip_range.start,  # pyright: ignore [reportOptionalMemberAccess]
+                timestamp_end=clip_range.end,  # pyright: ignore [reportOptionalMemberAccess]
             )
 
     return list(video_options.values())
@@ -1,17 +1,38 @@
+import argparse
+
+from common.config.loader import load_config
 from common.custom_types import StageException
 from common.db.database import db
-from common.db.peewee_helpers import bulk_pack
+from common.db.peewee_helpers import bulk_write
 from common.model.models import Avatar, Contestant, Setting, Template, VideoOptions
+from common.model.settings import load_settings_snapshot
 from stage_3_templates_pre_gen.custom_types import StageThreeInput
 from stage_3_templates_pre_gen.execute import execute
+from stage_3_templates_pre_gen.fulfillment_file import load_fulfillment_file
 from stage_3_templates_pre_gen.stage_input import load_musicosa_from_db
 from stage_3_templates_pre_gen.summary import stage_summary
 
 if __name__ == "__main__":
+    # Configuration
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config_file")
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config_file.strip() if args.config_file else None)
+    except FileNotFoundError | IOError | TypeError as err:
+        print(f"[Stage 3 | Configuration] {err}")
+        exit(1)
+
     # Data retrieval
 
     try:
         musicosa = load_musicosa_from_db()
+        settings = load_settings_snapshot()
+        fulfillment = (
+            load_fulfillment_file(config.stage_3.fulfillment_file) if config.stage_3.fulfillment_file else None
+        )
     except Exception as err:
         print(f"[Stage 3 | Data retrieval] {err}")
         exit(1)
@@ -19,7 +40,7 @@ if __name__ == "__main__":
     # Execution
 
     try:
-        result = execute(StageThreeInput(musicosa))
+        result = execute(StageThreeInput(musicosa), settings, fulfillment)
     except StageException as err:
         print(f"[Stage 3 | Execution] {err}")
         exit(1)
@@ -42,20 +63,16 @@ if __name__ == "__main__":
                     )
 
         if result.frame_settings:
-            with db.atomic():
-                Setting.ORM.replace_many(bulk_pack(result.frame_settings)).execute()
+            bulk_write(Setting, result.frame_settings, replace=True)
 
         if result.templates:
-            with db.atomic():
-                Template.ORM.insert_many(bulk_pack(result.templates)).execute()
+            bulk_write(Template, result.templates)
 
         if result.generation_settings:
-            with db.atomic():
-                Setting.ORM.replace_many(bulk_pack(result.generation_settings)).execute()
+            bulk_write(Setting, result.generation_settings, replace=True)
 
         if result.video_options:
-            with db.atomic():
-                VideoOptions.ORM.insert_many(bulk_pack(result.video_options)).execute()
+            bulk_write(VideoOptions, result.video_options)
     except Exception as err:
         print(f"[Stage 3 | Data persistence] {err}")
         exit(1)
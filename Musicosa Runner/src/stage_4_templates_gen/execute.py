@@ -7,13 +7,13 @@ from validators import url as validate_url
 from common.config.config import Config
 from common.custom_types import StageException
 from common.model.models import SettingKeys
-from common.model.settings import is_setting_set
+from common.model.settings import SettingsSnapshot
 from stage_4_templates_gen.constants import MAX_GEN_RETRY_ATTEMPTS
 from stage_4_templates_gen.custom_types import StageFourInput, StageFourOutput
 from stage_4_templates_gen.logic.generate_templates import generate_templates
 
 
-def execute(config: Config, stage_input: StageFourInput) -> StageFourOutput:
+def execute(config: Config, stage_input: StageFourInput, settings: SettingsSnapshot) -> StageFourOutput:
     templates_api_url = config.stage_4.templates_api_url
     presentations_api_url = config.stage_4.presentations_api_url
     artifacts_folder = config.artifacts_folder
@@ -22,10 +22,10 @@ def execute(config: Config, stage_input: StageFourInput) -> StageFourOutput:
     overwrite_presentations = config.stage_4.overwrite_presentations
     templates = stage_input.templates
 
-    if not is_setting_set(SettingKeys.FRAME_WIDTH_PX):
+    if not settings.is_set(SettingKeys.FRAME_WIDTH_PX):
         raise StageException(f"Setting '{SettingKeys.FRAME_WIDTH_PX}' not set")
 
-    if not is_setting_set(SettingKeys.FRAME_HEIGHT_PX):
+    if not settings.is_set(SettingKeys.FRAME_HEIGHT_PX):
         raise StageException(f"Setting '{SettingKeys.FRAME_HEIGHT_PX}' not set")
 
     if isinstance(validate_url(templates_api_url, simple_host=True), ValidationError):
@@ -56,6 +56,7 @@ def execute(config: Config, stage_input: StageFourInput) -> StageFourOutput:
         retry_attempts,
         overwrite_templates,
         overwrite_presentations,
+        settings,
     )
 
     return StageFourOutput(entry_templates, presentation_templates)
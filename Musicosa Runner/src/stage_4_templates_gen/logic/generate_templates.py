@@ -7,8 +7,7 @@ from playwright.sync_api import ViewportSize, sync_playwright
 from common.constants import PRESENTATION_IMG_FILE_SUFFIX, TEMPLATE_IMG_FORMAT
 from common.custom_types import TemplateType
 from common.formatting.tabulate import tab
-from common.model.models import SettingKeys
-from common.model.settings import get_setting_by_key
+from common.model.settings import SettingsSnapshot
 from common.naming.slugify import slugify
 from stage_4_templates_gen.custom_types import Template, TemplateGenerationResult
 
@@ -21,6 +20,7 @@ def generate_templates(
     retry_attempts: int,
     overwrite_templates: bool,
     overwrite_presentations: bool,
+    settings: SettingsSnapshot,
 ) -> tuple[TemplateGenerationResult, TemplateGenerationResult]:
     generated_entry_template_titles: list[str] = []
     generated_presentation_template_titles: list[str] = []
@@ -29,8 +29,8 @@ def generate_templates(
     failed_entry_template_ids: list[str] = []
     failed_presentation_template_ids: list[str] = []
 
-    frame_width: int = get_setting_by_key(SettingKeys.FRAME_WIDTH_PX).value  # pyright: ignore [reportOptionalMemberAccess, reportAssignmentType]
-    frame_height: int = get_setting_by_key(SettingKeys.FRAME_HEIGHT_PX).value  # pyright: ignore [reportOptionalMemberAccess, reportAssignmentType]
+    frame_width = settings.frame_width_px
+    frame_height = settings.frame_height_px
 
     def load_template_page(url: str, template_type: TemplateType) -> int:
         print(f"[LOADING #{idx + 1}] {template_type.name.upper()} {url}")  # pyright: ignore [reportOptionalMemberAccess]
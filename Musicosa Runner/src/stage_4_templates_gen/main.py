@@ -4,6 +4,7 @@ from peewee import PeeweeException
 
 from common.config.loader import load_config
 from common.custom_types import StageException
+from common.model.settings import load_settings_snapshot
 from stage_4_templates_gen.custom_types import StageFourInput
 from stage_4_templates_gen.execute import execute
 from stage_4_templates_gen.stage_input import load_templates_from_db
@@ -26,6 +27,7 @@ if __name__ == "__main__":
 
     try:
         templates = load_templates_from_db(generate_presentations=config.stitch_final_video)
+        settings = load_settings_snapshot()
     except PeeweeException as err:
         print(f"[Stage 4 | Data Retrieval] {err}")
         exit(1)
@@ -35,7 +37,7 @@ if __name__ == "__main__":
     # Execution
 
     try:
-        result = execute(config, stage_input)
+        result = execute(config, stage_input, settings)
     except StageException as err:
         print(f"[Stage 4 | Execution] {err}")
         exit(1)
@@ -1,11 +1,7 @@
 from dataclasses import dataclass
 from typing import Literal, NamedTuple
 
-
-@dataclass
-class Timestamp:
-    start: str
-    end: str
+from common.time.timestamp import ClipRange
 
 
 @dataclass
@@ -14,7 +10,7 @@ class EntryVideoOptions:
     entry_title: str
     ranking_place: int
     sequence_number: int
-    timestamp: Timestamp
+    timestamp: ClipRange | None
     width: int
     height: int
     position_top: int
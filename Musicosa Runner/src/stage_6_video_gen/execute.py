@@ -5,13 +5,13 @@ from typing import cast, get_args
 from common.config.config import Config
 from common.custom_types import StageException
 from common.model.models import SettingKeys
-from common.model.settings import is_setting_set
+from common.model.settings import SettingsSnapshot
 from stage_6_video_gen.custom_types import StageSixInput, StageSixOutput, TransitionOptions, TransitionType
 from stage_6_video_gen.logic.generate_final_video import generate_final_video
 from stage_6_video_gen.logic.generate_video_bits import generate_video_bit_collection
 
 
-def execute(config: Config, stage_input: StageSixInput) -> StageSixOutput:
+def execute(config: Config, stage_input: StageSixInput, settings: SettingsSnapshot) -> StageSixOutput:
     artifacts_folder = config.artifacts_folder
     video_bits_folder = config.stage_6.video_bits_folder
     overwrite = config.stage_6.overwrite_video_bits
@@ -28,13 +28,13 @@ def execute(config: Config, stage_input: StageSixInput) -> StageSixOutput:
 
     final_video_path = None
 
-    if not is_setting_set(SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS):
+    if not settings.is_set(SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS):
         raise StageException(f"Setting '{SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS}' not set")
 
-    if not is_setting_set(SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_TOP_N_DURATION):
+    if not settings.is_set(SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_TOP_N_DURATION):
         raise StageException(f"Setting '{SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_TOP_N_DURATION}' not set")
 
-    if not is_setting_set(SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_DURATION_UP_TO_X_SECONDS):
+    if not settings.is_set(SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_DURATION_UP_TO_X_SECONDS):
         raise StageException(f"Setting '{SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_DURATION_UP_TO_X_SECONDS}' not set")
 
     if not artifacts_folder:
@@ -69,7 +69,7 @@ def execute(config: Config, stage_input: StageSixInput) -> StageSixOutput:
         os.makedirs(video_bits_folder)
 
     missing_templates, missing_videoclips, generation_result = generate_video_bit_collection(
-        artifacts_folder, video_bits_folder, overwrite, quiet_ffmpeg, entries_video_options
+        artifacts_folder, video_bits_folder, overwrite, quiet_ffmpeg, entries_video_options, settings
     )
     generated, skipped, failed = generation_result
 
@@ -8,10 +8,8 @@ from ffmpeg_normalize import FFmpegNormalize
 from common.constants import TEMPLATE_IMG_FORMAT, VIDEO_FORMAT, VIDEOCLIPS_OVERRIDE_DURATION_LIMIT
 from common.custom_types import StageException
 from common.formatting.tabulate import tab
-from common.model.models import SettingKeys
-from common.model.settings import get_setting_by_key
+from common.model.settings import SettingsSnapshot
 from common.naming.slugify import slugify
-from common.time.utils import parse_time, time_to_seconds
 from stage_6_video_gen.constants import (
     NORMALIZATION_AUDIO_CODEC,
     NORMALIZATION_AUDIO_SAMPLE_RATE,
@@ -32,6 +30,7 @@ def generate_video_bit_collection(
     overwrite: bool,
     quiet_ffmpeg: bool,
     entry_video_options: list[EntryVideoOptions],
+    settings: SettingsSnapshot,
 ) -> tuple[list[str], list[str], VideoGenerationResult]:
     missing_templates: list[str] = []
     missing_videoclips: list[str] = []
@@ -64,7 +63,9 @@ def generate_video_bit_collection(
         print(f"[GENERATING #{idx + 1}] {vid_opts.entry_title}")
 
         try:
-            video_bit = generate_video_bit(source_videoclip, vid_opts, source_template, video_bit_path, quiet_ffmpeg)
+            video_bit = generate_video_bit(
+                source_videoclip, vid_opts, source_template, video_bit_path, quiet_ffmpeg, settings
+            )
             generated_video_bit_files.append(video_bit)
         except FFMpegError as err:
             print(f"[FAILED #{idx + 1}] {vid_opts.entry_title}. Cause: {err}")
@@ -78,13 +79,16 @@ def generate_video_bit_collection(
 
 
 def generate_video_bit(
-    videoclip_path: str, vid_opts: EntryVideoOptions, template_path: str, video_bit_path: str, quiet_ffmpeg: bool
+    videoclip_path: str,
+    vid_opts: EntryVideoOptions,
+    template_path: str,
+    video_bit_path: str,
+    quiet_ffmpeg: bool,
+    settings: SettingsSnapshot,
 ) -> str:
-    default_duration: int = get_setting_by_key(SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS).value  # pyright: ignore [reportOptionalMemberAccess, reportAssignmentType]
-    override_top_n: int = get_setting_by_key(SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_TOP_N_DURATION).value  # pyright: ignore [reportOptionalMemberAccess, reportAssignmentType]
-    override_duration_value: int = get_setting_by_key(  # pyright: ignore [reportAssignmentType]
-        SettingKeys.GENERATION_VIDEOCLIPS_OVERRIDE_DURATION_UP_TO_X_SECONDS
-    ).value  # pyright: ignore [reportOptionalMemberAccess]
+    default_duration = settings.entry_video_duration_seconds
+    override_top_n = settings.videoclips_override_top_n_duration
+    override_duration_value = settings.videoclips_override_duration_up_to_x_seconds
 
     videoclip_duration_seconds = get_video_duration_seconds(videoclip_path)
 
@@ -105,16 +109,13 @@ def generate_video_bit(
         else:
             ffmpeg_time_code_args = {"ss": 0, "t": override_duration_value}
     else:
-        timestamp_start_time = parse_time(vid_opts.timestamp.start)
-        timestamp_end_time = parse_time(vid_opts.timestamp.end)
-
-        if not timestamp_start_time or not timestamp_end_time:
-            raise StageException(f"Invalid timestamp strings ({vid_opts.timestamp})")
+        if not vid_opts.timestamp:
+            raise StageException("Missing or invalid video timestamp")
 
-        timestamp_start_seconds = time_to_seconds(timestamp_start_time)
-        timestamp_end_seconds = time_to_seconds(timestamp_end_time)
+        timestamp_start_seconds = vid_opts.timestamp.start.seconds
+        timestamp_end_seconds = vid_opts.timestamp.end.seconds
 
-        ffmpeg_time_code_args = {"ss": vid_opts.timestamp.start, "to": vid_opts.timestamp.end}
+        ffmpeg_time_code_args = {"ss": timestamp_start_seconds, "to": timestamp_end_seconds}
 
         if timestamp_start_seconds < videoclip_duration_seconds < timestamp_end_seconds:
             print(
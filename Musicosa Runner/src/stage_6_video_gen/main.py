@@ -4,6 +4,7 @@ from peewee import PeeweeException
 
 from common.config.loader import load_config
 from common.custom_types import StageException
+from common.model.settings import load_settings_snapshot
 from stage_6_video_gen.custom_types import StageSixInput
 from stage_6_video_gen.execute import execute
 from stage_6_video_gen.stage_input import load_entries_video_options_from_db
@@ -28,6 +29,7 @@ if __name__ == "__main__":
 
     try:
         entries_video_options = load_entries_video_options_from_db()
+        settings = load_settings_snapshot()
     except PeeweeException as err:
         print(f"[Stage 6 | Data retrieval] {err}")
         exit(1)
@@ -37,7 +39,7 @@ if __name__ == "__main__":
     # Execution
 
     try:
-        result = execute(config, stage_input)
+        result = execute(config, stage_input, settings)
     except StageException as err:
         print(f"[Stage 6 | Execution] {err}")
         exit(1)
@@ -3,7 +3,8 @@ import random
 from peewee import JOIN
 
 from common.model.models import Entry, EntryStats, Template, VideoOptions
-from stage_6_video_gen.custom_types import EntryVideoOptions, Timestamp
+from common.time.timestamp import ClipRange
+from stage_6_video_gen.custom_types import EntryVideoOptions
 
 
 def load_entries_video_options_from_db() -> list[EntryVideoOptions]:
@@ -13,7 +14,11 @@ def load_entries_video_options_from_db() -> list[EntryVideoOptions]:
             entry_title=row.title,
             ranking_place=row.ranking_place,
             sequence_number=row.ranking_sequence,
-            timestamp=Timestamp(start=row.timestamp_start, end=row.timestamp_end),
+            timestamp=(
+                ClipRange(row.timestamp_start, row.timestamp_end)
+                if row.timestamp_start is not None and row.timestamp_end is not None
+                else None
+            ),
             width=row.video_box_width_px,
             height=row.video_box_height_px,
             position_top=row.video_box_position_top_px,
@@ -0,0 +1,62 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import pytest
+
+DB_DDL_FILE = Path(__file__).parents[2] / "Musicosa DB" / "db-ddl.sql"
+
+_db_dir: str | None = None
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """
+    Point the app at an empty DB built from the DDL, before any test module imports 'common.db.database' (which
+    connects on import)
+    """
+    global _db_dir
+
+    _db_dir = tempfile.mkdtemp(prefix="musicosa-tests-")
+    db_path = os.path.join(_db_dir, "musicosa.sqlite")
+
+    with sqlite3.connect(db_path) as connection:
+        connection.executescript(DB_DDL_FILE.read_text(encoding="utf-8"))
+
+    connection.close()
+    os.environ["DB_PATH"] = db_path
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    if _db_dir is not None:
+        shutil.rmtree(_db_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def db():
+    """
+    The test DB, with everything written by the test rolled back afterwards
+    """
+    from common.db.database import db
+
+    with db.atomic() as tx:
+        yield db
+        tx.rollback()
+
+
+@pytest.fixture
+def executed_sql(db, monkeypatch) -> list[str]:
+    """
+    SQL of every statement run on the test DB, from when the fixture is set up
+    """
+    statements: list[str] = []
+    execute_sql = db.execute_sql
+
+    def recording_execute_sql(sql, *args, **kwargs):
+        statements.append(sql)
+        return execute_sql(sql, *args, **kwargs)
+
+    monkeypatch.setattr(db, "execute_sql", recording_execute_sql)
+
+    return statements
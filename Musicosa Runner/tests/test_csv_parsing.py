@@ -0,0 +1,87 @@
+import pytest
+
+from common.custom_types import StageException
+from common.time.timestamp import ClipRange, Timestamp
+from stage_1_validation.custom_types import ContestantSubmission, ContestantSubmissionEntry
+from stage_1_validation.logic.parsing.csv import parse_consolidated_csv, parse_contestant_form_csv
+
+
+def test_consolidated_csv_is_grouped_by_contestant(tmp_path):
+    csv_file = tmp_path / "submissions.csv"
+    csv_file.write_text(
+        "\ufeffContestant;Title;Score;Author;Video_URL;Video_Timestamp;Topic\n"
+        "Contestant 1;Entry 0;7,5;;;;\n"
+        "Contestant 0;Entry 0;10;x;https://youtu.be/v0;1:00-1:30;opening\n"
+        "\n"
+        ";;;;;;\n"
+        'Contestant 1;"Entry; with separator";2;x; https://youtu.be/v1 ;;\n'
+        'Contestant 0;"Entry; with separator";0;;;;\n',
+        encoding="utf-8",
+    )
+
+    assert parse_consolidated_csv(str(csv_file)) == [
+        ContestantSubmission(
+            "Contestant 1",
+            [
+                ContestantSubmissionEntry("Entry 0", 7.5, False, None, None, None),
+                ContestantSubmissionEntry("Entry; with separator", 2.0, True, "https://youtu.be/v1", None, None),
+            ],
+        ),
+        ContestantSubmission(
+            "Contestant 0",
+            [
+                ContestantSubmissionEntry(
+                    "Entry 0",
+                    10.0,
+                    True,
+                    "https://youtu.be/v0",
+                    ClipRange(Timestamp(60), Timestamp(90)),
+                    "OPENING",
+                ),
+                ContestantSubmissionEntry("Entry; with separator", 0.0, False, None, None, None),
+            ],
+        ),
+    ]
+
+
+def test_consolidated_csv_reports_every_bad_row(tmp_path):
+    csv_file = tmp_path / "submissions.csv"
+    csv_file.write_text(
+        "Contestant 0;Entry 0;10;x;https://youtu.be/v0;1:00-1:30;\n"
+        "Contestant 0;Entry 1;ten;;;;\n"
+        "Contestant 0;Entry 2;5;;;\n"
+        ";Entry 3;5;;;;\n"
+        "Contestant 0;Entry 4;5;x;https://youtu.be/v4;1:00;\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(StageException) as exc_info:
+        parse_consolidated_csv(str(csv_file))
+
+    error_lines = str(exc_info.value).splitlines()
+
+    assert error_lines[0] == "Failed to parse 4 row(s) of 'submissions.csv':"
+    assert error_lines[1].startswith("  * Line 2: [Contestant 0] [Entry 1] Error parsing score value 'ten'")
+    assert error_lines[2].startswith("  * Line 3: Field count mismatch")
+    assert error_lines[3] == "  * Line 4: Missing contestant name"
+    assert error_lines[4].startswith("  * Line 5: [Contestant 0] [Entry 4] ")
+
+
+def test_contestant_form_csv(tmp_path):
+    form_file = tmp_path / "Contestant 0.csv"
+    form_file.write_text("Entry 0;10;x;https://youtu.be/v0;1:00-1:30;\nEntry 1;5;;;;\n", encoding="utf-8")
+
+    assert parse_contestant_form_csv(str(form_file)) == ContestantSubmission(
+        "Contestant 0",
+        [
+            ContestantSubmissionEntry(
+                "Entry 0", 10.0, True, "https://youtu.be/v0", ClipRange(Timestamp(60), Timestamp(90)), None
+            ),
+            ContestantSubmissionEntry("Entry 1", 5.0, False, None, None, None),
+        ],
+    )
+
+    form_file.write_text("Entry 0;10;x\n", encoding="utf-8")
+
+    with pytest.raises(StageException, match=r"^\[Contestant 0\] Field count mismatch"):
+        parse_contestant_form_csv(str(form_file))
@@ -0,0 +1,96 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from common.custom_types import StageException
+from stage_3_templates_pre_gen.custom_types import SequenceRange
+from stage_3_templates_pre_gen.fulfillment_file import load_fulfillment_file, parse_fulfillment
+
+FULFILLMENT_FILE_EXAMPLE = Path(__file__).parents[1] / "fulfillment.toml.example"
+
+TEMPLATE = {
+    "avatar_scale": 1,
+    "author_avatar_scale": 1.5,
+    "video_box_width_px": 1280,
+    "video_box_height_px": 720,
+    "video_box_position_top_px": 0,
+    "video_box_position_left_px": 320,
+}
+
+
+def test_example_fulfillment_file():
+    fulfillment = load_fulfillment_file(str(FULFILLMENT_FILE_EXAMPLE))
+
+    assert (fulfillment.frame_width_px, fulfillment.frame_height_px) == (1920, 1080)
+    assert fulfillment.videoclips_override_duration_seconds == -1
+    assert fulfillment.avatars["Contestant A"].new_avatar is not None
+    assert fulfillment.avatars["Contestant B"].new_avatar.score_box_position_top == 12.5  # pyright: ignore [reportOptionalMemberAccess]
+    assert [rule.sequences for rule in fulfillment.templates] == [SequenceRange(1, 10), SequenceRange(None, None)]
+    assert fulfillment.video_options[0].segment == "00:30-01:00"
+
+
+def test_templates_and_avatars_without_every_value():
+    fulfillment = parse_fulfillment(
+        {"avatars": {"Contestant A": " a.PNG "}, "templates": [{**TEMPLATE, "sequences": " 3 : "}]}
+    )
+
+    # No avatar defaults to create a new avatar from, the existing one with that image file is paired
+    assert fulfillment.avatars["Contestant A"].image_filename == "a.PNG"
+    assert fulfillment.avatars["Contestant A"].new_avatar is None
+    assert fulfillment.templates[0].sequences == SequenceRange(3, None)
+    assert fulfillment.templates[0].avatar_scale == 1.0
+
+
+@pytest.mark.parametrize(
+    "contents, error",
+    [
+        ({"frames": {}}, "Unknown key(s) in fulfillment file: 'frames'"),
+        ({"frame": {"width_px": 1920, "depth_px": 1}}, "Unknown key(s) in [frame]: 'depth_px'"),
+        ({"frame": [1920, 1080]}, "Invalid 'frame' in fulfillment file ('[1920, 1080]' should be a table)"),
+        ({"frame": {"width_px": 0}}, "Invalid 'width_px' in [frame] ('0' should be a positive integer)"),
+        ({"frame": {"height_px": "1080"}}, "Invalid 'height_px' in [frame] ('1080' should be an integer)"),
+        ({"frame": {"height_px": 1080.0}}, "Invalid 'height_px' in [frame] ('1080.0' should be an integer)"),
+        (
+            {"generation": {"videoclips_override_duration_seconds": -2}},
+            "Invalid 'videoclips_override_duration_seconds' in [generation] ('-2' should be -1",
+        ),
+        (
+            {"avatar_defaults": {"score_box_font_scale": -1}},
+            "Invalid 'score_box_font_scale' in [avatar_defaults] ('-1.0' should be 0 or a positive number)",
+        ),
+        ({"avatars": {"Contestant A": 1}}, "Invalid [avatars] 'Contestant A' ('1' should be an image file or a table)"),
+        ({"avatars": {"Contestant A": {"image_height": 400}}}, "Missing 'image_filename' in [avatars] 'Contestant A'"),
+        ({"avatars": {"Contestant A": "a.gif"}}, "Invalid 'image_filename' in [avatars] 'Contestant A' ('a.gif'"),
+        ({"templates": {"sequences": 1}}, "Invalid 'templates' in fulfillment file"),
+        ({"templates": [1]}, "Invalid [[templates]] #1 ('1' should be a table)"),
+        ({"templates": [{**TEMPLATE, "avatar_scale": True}]}, "Invalid 'avatar_scale' in [[templates]] #1"),
+        (
+            {"templates": [TEMPLATE, {"video_box_width_px": 1280}]},
+            "Missing 'avatar_scale', 'author_avatar_scale', 'video_box_height_px', 'video_box_position_top_px', "
+            "'video_box_position_left_px' in [[templates]] #2",
+        ),
+        ({"templates": [{**TEMPLATE, "sequences": 0}]}, "Invalid 'sequences' in [[templates]] #1 ('0'"),
+        ({"templates": [{**TEMPLATE, "sequences": "10:1"}]}, "Invalid 'sequences' in [[templates]] #1 ('10:1'"),
+        ({"templates": [{**TEMPLATE, "sequences": "1-10"}]}, "Invalid 'sequences' in [[templates]] #1 ('1-10'"),
+        ({"video_options": [{"sequences": 1}]}, "Missing 'segment' in [[video_options]] #1"),
+        (
+            {"video_options": [{"segment": "00:30"}]},
+            "Invalid 'segment' in [[video_options]] #1 ('00:30' should be '[HH:]MM:SS-[HH:]MM:SS')",
+        ),
+    ],
+)
+def test_malformed_fulfillment_is_rejected(contents, error):
+    with pytest.raises(StageException, match=f"^{re.escape(error)}"):
+        parse_fulfillment(contents)
+
+
+def test_unparsable_fulfillment_file(tmp_path):
+    fulfillment_file = tmp_path / "fulfillment.toml"
+    fulfillment_file.write_text("[frame]\nwidth_px = \n", encoding="utf-8")
+
+    with pytest.raises(StageException, match="^Couldn't parse fulfillment file"):
+        load_fulfillment_file(str(fulfillment_file))
+
+    with pytest.raises(FileNotFoundError):
+        load_fulfillment_file(str(tmp_path / "missing.toml"))
@@ -0,0 +1,73 @@
+import random
+
+from test_ranking_engines import random_edition
+
+from common.model.submission_store import SubmissionStore
+from stage_2_ranking.custom_types import Musicosa
+from stage_2_ranking.logic.incremental import IncrementalRanking
+from stage_2_ranking.logic.ranking import rank_musicosa
+
+EDITION_DRAWS = 100
+RERANKS = 5
+
+
+def corrected_musicosa(musicosa: Musicosa, scores: dict[tuple[str, str], float]) -> Musicosa:
+    """
+    The edition with the given scores, in the same store row order (so a full ranking sums them in the same order)
+    """
+    store = musicosa.scores
+    corrected_store = SubmissionStore()
+
+    for store_contestant_id, store_title_id, _ in store.scores():
+        contestant_name, title = store.contestant_names[store_contestant_id], store.titles[store_title_id]
+        corrected_store.append_score(
+            corrected_store.add_contestant(contestant_name),
+            corrected_store.add_title(title),
+            scores[(contestant_name, title)],
+            False,
+        )
+
+    return Musicosa(musicosa.contestants, musicosa.entries, corrected_store)
+
+
+def test_rerank_matches_a_full_ranking():
+    for seed in range(EDITION_DRAWS):
+        rng = random.Random(seed)
+        musicosa, settings = random_edition(rng)
+
+        store = musicosa.scores
+        scores = {
+            (store.contestant_names[store_contestant_id], store.titles[store_title_id]): score
+            for store_contestant_id, store_title_id, score in store.scores()
+        }
+        # Scores already in the edition (binary fractions, so score deltas are exact) and whole numbers
+        correction_scores = sorted(set(scores.values()) | {float(score) for score in range(11)})
+
+        ranking = IncrementalRanking(musicosa, settings)
+        previous_stats = ranking.stats()
+
+        assert previous_stats == rank_musicosa(musicosa, settings), f"Edition {seed}"
+
+        for rerank in range(RERANKS):
+            # Several corrections between reranks, some of them to the same score
+            for _ in range(rng.randint(1, 6)):
+                contestant_name, title = rng.choice(list(scores))
+                scores[(contestant_name, title)] = score = rng.choice(correction_scores)
+                ranking.set_score(contestant_name, title, score)
+
+            update = ranking.rerank()
+            stats = ranking.stats()
+
+            assert stats == rank_musicosa(corrected_musicosa(musicosa, scores), settings), f"Edition {seed} ({rerank})"
+
+            # The update has every stat that changed, as it is now
+            changed_contestants_stats = [stat for stat in stats[0] if stat not in previous_stats[0]]
+            changed_entries_stats = [stat for stat in stats[1] if stat not in previous_stats[1]]
+
+            assert all(stat in update.contestants_stats for stat in changed_contestants_stats)
+            assert all(stat in stats[0] for stat in update.contestants_stats)
+            assert all(stat in update.entries_stats for stat in changed_entries_stats)
+            assert all(stat in stats[1] for stat in update.entries_stats)
+            assert {stat.ranking_sequence for stat in changed_entries_stats} <= set(update.changed_ranking_sequences)
+
+            previous_stats = stats
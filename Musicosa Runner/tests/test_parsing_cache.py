@@ -0,0 +1,72 @@
+import os
+
+from stage_1_validation.custom_types import ContestantSubmission, ContestantSubmissionEntry
+from stage_1_validation.logic.parsing.cache import ParsedFormsCache, ParsedFormsCacheStats
+
+LAYOUT = ("F2", "C6:H17")
+SUBMISSION = ContestantSubmission("Contestant 0", [ContestantSubmissionEntry("Entry 0", 5.0, False, None, None, None)])
+
+
+def write_form(form_file, contents: bytes, mtime_ns: int) -> None:
+    form_file.write_bytes(contents)
+    os.utime(form_file, ns=(mtime_ns, mtime_ns))
+
+
+def test_parsed_forms_survive_a_reload_from_disk(tmp_path):
+    form_file, cache_file = tmp_path / "Contestant 0.xlsx", str(tmp_path / "cache" / "forms.pickle")
+    write_form(form_file, b"form", 1_000_000_000)
+
+    cache = ParsedFormsCache(cache_file)
+    assert cache.get(str(form_file), LAYOUT) is None
+    cache.put(str(form_file), LAYOUT, SUBMISSION)
+    cache.save()
+
+    reloaded_cache = ParsedFormsCache(cache_file)
+    assert reloaded_cache.get(str(form_file), LAYOUT) == SUBMISSION
+    assert reloaded_cache.stats == ParsedFormsCacheStats(hits=1, misses=0)
+
+
+def test_parsed_forms_are_invalidated_by_size_mtime_and_layout(tmp_path):
+    form_file = tmp_path / "Contestant 0.xlsx"
+    cache = ParsedFormsCache(None)
+
+    write_form(form_file, b"form", 1_000_000_000)
+    cache.put(str(form_file), LAYOUT, SUBMISSION)
+    assert cache.get(str(form_file), LAYOUT) == SUBMISSION
+    assert cache.get(str(form_file), ("F2", "C6:H18")) is None
+
+    write_form(form_file, b"form", 2_000_000_000)
+    assert cache.get(str(form_file), LAYOUT) is None
+
+    cache.put(str(form_file), LAYOUT, SUBMISSION)
+    write_form(form_file, b"longer form", 2_000_000_000)
+    assert cache.get(str(form_file), LAYOUT) is None
+
+    cache.put(str(form_file), LAYOUT, SUBMISSION)
+    cache.invalidate(str(form_file))
+    assert cache.get(str(form_file), LAYOUT) is None
+
+    assert cache.stats == ParsedFormsCacheStats(hits=1, misses=4)
+
+
+def test_content_hash_catches_rewrites_the_fingerprint_misses(tmp_path):
+    form_file = tmp_path / "Contestant 0.xlsx"
+    write_form(form_file, b"form A", 1_000_000_000)
+
+    fingerprint_cache, hashing_cache = ParsedFormsCache(None), ParsedFormsCache(None, hash_contents=True)
+    fingerprint_cache.put(str(form_file), LAYOUT, SUBMISSION)
+    hashing_cache.put(str(form_file), LAYOUT, SUBMISSION)
+
+    # Same size and mtime, other contents
+    write_form(form_file, b"form B", 1_000_000_000)
+
+    assert fingerprint_cache.get(str(form_file), LAYOUT) == SUBMISSION
+    assert hashing_cache.get(str(form_file), LAYOUT) is None
+
+
+def test_an_unreadable_cache_file_is_a_cold_cache(tmp_path):
+    form_file, cache_file = tmp_path / "Contestant 0.xlsx", tmp_path / "forms.pickle"
+    write_form(form_file, b"form", 1_000_000_000)
+    cache_file.write_bytes(b"not a pickle")
+
+    assert ParsedFormsCache(str(cache_file)).get(str(form_file), LAYOUT) is None
@@ -0,0 +1,58 @@
+import pytest
+from peewee import IntegrityError
+
+from common.constants import BULK_WRITE_CHUNK_SIZE
+from common.db.peewee_helpers import bulk_write, bulk_write_rows
+from common.model.models import Contestant, EntryTopic, Metadata
+
+
+def test_bulk_write_in_chunks(db):
+    topics = (EntryTopic(f"Topic {idx}") for idx in range(BULK_WRITE_CHUNK_SIZE + 1))
+
+    assert bulk_write(EntryTopic, topics) == BULK_WRITE_CHUNK_SIZE + 1
+    assert bulk_write(EntryTopic, [EntryTopic(f"Other {idx}") for idx in range(10)], chunk_size=3) == 10
+    assert EntryTopic.ORM.select().count() == BULK_WRITE_CHUNK_SIZE + 11
+    assert EntryTopic.ORM.get_by_id(f"Topic {BULK_WRITE_CHUNK_SIZE}").to_domain() == EntryTopic(
+        f"Topic {BULK_WRITE_CHUNK_SIZE}"
+    )
+
+
+def test_bulk_write_replace(db):
+    edition = Metadata("edition", "4")
+
+    with pytest.raises(IntegrityError):
+        bulk_write(Metadata, [edition])
+
+    assert bulk_write(Metadata, [edition], replace=True) == 1
+    assert Metadata.ORM.get_by_id("edition").to_domain() == edition
+
+    fields = [Metadata.ORM.field, Metadata.ORM.value]
+    assert bulk_write_rows(Metadata.ORM, fields, [("edition", "5"), ("topic", "Openings")], replace=True) == 2
+    assert {metadata.field: metadata.value for metadata in Metadata.ORM.select()} == {
+        "edition": "5",
+        "topic": "Openings",
+        "organiser": "",
+        "start_date": "",
+    }
+
+
+def test_bulk_write_rolls_back_on_a_bad_row(db):
+    # The duplicated topic is in the third chunk, after two have been executed
+    designations = [f"Topic {idx}" for idx in range(10)] + ["Topic 0"]
+
+    with pytest.raises(IntegrityError):
+        bulk_write(EntryTopic, map(EntryTopic, designations), chunk_size=4)
+
+    assert EntryTopic.ORM.select().count() == 0
+
+    with pytest.raises(TypeError):
+        bulk_write(EntryTopic, [EntryTopic("Topic 0"), Metadata("edition", "4")], chunk_size=1)  # pyright: ignore [reportArgumentType]
+
+    assert EntryTopic.ORM.select().count() == 0
+
+
+def test_bulk_write_related_entities(db):
+    contestants = [Contestant(id=f"contestant-{idx}", name=f"Contestant {idx}", avatar=None) for idx in range(3)]
+
+    assert bulk_write(Contestant, contestants) == 3
+    assert [contestant.to_domain() for contestant in Contestant.ORM.select().order_by(Contestant.ORM.id)] == contestants
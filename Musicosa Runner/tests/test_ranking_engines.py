@@ -0,0 +1,180 @@
+import random
+
+from common.model.models import Setting, SettingKeys, SettingValueTypes
+from common.model.settings import SettingsSnapshot
+from common.model.submission_store import SubmissionStore
+from common.naming.identifiers import generate_contestant_uuid5, generate_entry_uuid5
+from stage_2_ranking.custom_types import Contestant, Entry, Musicosa, StageTwoInput
+from stage_2_ranking.execute import execute
+from stage_2_ranking.logic import ranking_fixed_point
+from stage_2_ranking.logic.ranking import rank_musicosa
+from stage_2_ranking.logic.ranking_fixed_point import rank_musicosa_fixed_point
+from stage_2_ranking.logic.ranking_numpy import rank_musicosa_numpy
+from stage_2_ranking.logic.ranking_sparse import rank_musicosa_sparse
+from stage_2_ranking.logic.ranking_sql import rank_musicosa_in_db
+from stage_2_ranking.stage_input import load_musicosa_from_db
+from stage_2_ranking.summary import stage_summary
+
+EDITION_DRAWS = 300
+STORED_EDITION_DRAWS = 100
+
+
+def ranking_settings(significant_decimal_digits: int) -> SettingsSnapshot:
+    values = {
+        SettingKeys.VALIDATION_SCORE_MIN_VALUE: (0.0, SettingValueTypes.REAL),
+        SettingKeys.VALIDATION_SCORE_MAX_VALUE: (10.0, SettingValueTypes.REAL),
+        SettingKeys.RANKING_SIGNIFICANT_DECIMAL_DIGITS: (significant_decimal_digits, SettingValueTypes.INTEGER),
+    }
+
+    return SettingsSnapshot(
+        Setting(group_key=key.split(".")[0], setting=key.split(".")[1], type=value_type, value=value)
+        for key, (value, value_type) in values.items()
+    )
+
+
+def random_edition(rng: random.Random) -> tuple[Musicosa, SettingsSnapshot]:
+    """
+    Edition with full ballots, scored from a handful of values so that draws between entries and averages exactly
+    halfway between two rounded values are common. Entries and store rows are shuffled, as the engines have to
+    accumulate in store row order and list entries in musicosa order
+    """
+    significant_decimal_digits = rng.choice([0, 1, 2])
+    step = 1.0 if significant_decimal_digits == 0 else rng.choice([0.5, 0.25][:significant_decimal_digits])
+    score_values = rng.sample([step * idx for idx in range(int(10 / step) + 1)], rng.randint(2, 5))
+
+    contestants = [Contestant(f"Contestant {idx}") for idx in range(rng.randint(2, 12))]
+    entries = [
+        Entry(f"Entry {contestant_idx} - {round_}", contestant.name)
+        for contestant_idx, contestant in enumerate(contestants)
+        for round_ in range(rng.randint(1, 3))
+    ]
+    rng.shuffle(entries)
+
+    rows = [(contestant.name, entry.title) for contestant in contestants for entry in entries]
+    rng.shuffle(rows)
+
+    scores = SubmissionStore()
+
+    for contestant_name, title in rows:
+        scores.append_score(
+            scores.add_contestant(contestant_name), scores.add_title(title), rng.choice(score_values), False
+        )
+
+    return Musicosa(contestants, entries, scores), ranking_settings(significant_decimal_digits)
+
+
+def test_numpy_engine_matches_python_engine():
+    for seed in range(EDITION_DRAWS):
+        musicosa, settings = random_edition(random.Random(seed))
+
+        assert rank_musicosa_numpy(musicosa, settings) == rank_musicosa(musicosa, settings), f"Edition {seed}"
+
+
+def test_fixed_point_engine_matches_python_engine(monkeypatch):
+    halfway_rounds: list[int] = []
+    round_halfway_averages = ranking_fixed_point.round_halfway_averages
+
+    def counting_round_halfway_averages(*args, **kwargs):
+        halfway_rounds.append(1)
+        return round_halfway_averages(*args, **kwargs)
+
+    monkeypatch.setattr(ranking_fixed_point, "round_halfway_averages", counting_round_halfway_averages)
+
+    for seed in range(EDITION_DRAWS):
+        musicosa, settings = random_edition(random.Random(seed))
+
+        assert rank_musicosa_fixed_point(musicosa, settings) == rank_musicosa(musicosa, settings), f"Edition {seed}"
+
+    # The editions have to go through the float fallback for averages exactly halfway, not only the integer path
+    assert len(halfway_rounds) > EDITION_DRAWS // 10
+
+
+def store_edition(db, musicosa: Musicosa) -> None:
+    """
+    Write the contestants, entries and scorings of an edition to the DB, in the order the edition lists them
+    """
+    for contestant in musicosa.contestants:
+        db.execute_sql(
+            "INSERT INTO contestants (id, name) VALUES (?, ?)",
+            (generate_contestant_uuid5(contestant.name).hex, contestant.name),
+        )
+
+    for entry in musicosa.entries:
+        db.execute_sql(
+            "INSERT INTO entries (id, title, author, video_url) VALUES (?, ?, ?, ?)",
+            (
+                generate_entry_uuid5(entry.title).hex,
+                entry.title,
+                generate_contestant_uuid5(entry.author_name).hex,
+                f"https://youtu.be/{entry.title}",
+            ),
+        )
+
+    scores = musicosa.scores
+
+    for store_contestant_id, store_title_id, score in scores.scores():
+        db.execute_sql(
+            "INSERT INTO contestant_grades_entries (contestant, entry, score) VALUES (?, ?, ?)",
+            (
+                generate_contestant_uuid5(scores.contestant_names[store_contestant_id]).hex,
+                generate_entry_uuid5(scores.titles[store_title_id]).hex,
+                score,
+            ),
+        )
+
+
+def test_sqlite_engine_matches_python_engine(db):
+    for seed in range(STORED_EDITION_DRAWS):
+        musicosa, settings = random_edition(random.Random(seed))
+
+        with db.atomic() as savepoint:
+            store_edition(db, musicosa)
+            # Loaded back, as the SQLite engine ranks what is stored (in the order it is stored)
+            stored_musicosa = load_musicosa_from_db()
+
+            assert rank_musicosa_in_db(stored_musicosa, settings) == rank_musicosa(stored_musicosa, settings), (
+                f"Edition {seed}"
+            )
+
+            savepoint.rollback()
+
+
+def test_sparse_engine_matches_python_engine_with_full_ballots():
+    for seed in range(EDITION_DRAWS):
+        musicosa, settings = random_edition(random.Random(seed))
+
+        contestants_stats, entries_stats, entries_vote_counts = rank_musicosa_sparse(musicosa, settings)
+
+        assert (contestants_stats, entries_stats) == rank_musicosa(musicosa, settings), f"Edition {seed}"
+        assert entries_vote_counts == {entry.title: len(musicosa.contestants) for entry in musicosa.entries}
+
+
+def test_sparse_engine_vote_counts():
+    contestants = [Contestant(f"Contestant {idx}") for idx in range(3)]
+    entries = [Entry(f"Entry {idx}", f"Contestant {idx}") for idx in range(3)]
+    scores = SubmissionStore()
+
+    # 'Entry 0' is scored by everyone, 'Entry 1' by one contestant and 'Entry 2' by nobody
+    for contestant_idx, contestant in enumerate(contestants):
+        contestant_id = scores.add_contestant(contestant.name)
+        scores.append_score(contestant_id, scores.add_title("Entry 0"), 5.0, False)
+
+        if contestant_idx == 2:
+            scores.append_score(contestant_id, scores.add_title("Entry 1"), 8.0, False)
+
+    scores.add_title("Entry 2")
+    stage_input = StageTwoInput(Musicosa(contestants, entries, scores))
+
+    result = execute(stage_input, ranking_settings(2), "sparse", min_votes=2)
+
+    assert result.entries_vote_counts == {"Entry 0": 3, "Entry 1": 1, "Entry 2": 0}
+    assert [(stat.entry.title, stat.ranking_place) for stat in result.entries_stats] == [
+        ("Entry 2", 3),
+        ("Entry 1", 2),
+        ("Entry 0", 1),
+    ]
+    assert (
+        "Entry vote counts (scores cast, out of 3):\n  * Entry 0 (Votes: 3)\n  * Entry 1 (Votes: 1)\n"
+        "  * Entry 2 (Votes: 0)"
+    ) in stage_summary(stage_input, result)
+    assert execute(stage_input, ranking_settings(2), "python").entries_vote_counts == {}
@@ -0,0 +1,55 @@
+import pytest
+
+from common.model.ranking_snapshot import RankingRowChange, RankingSnapshot, changed_ranking_sequences
+
+
+def entry_id(idx: int) -> str:
+    return f"{idx:032x}"
+
+
+def test_diff_lists_added_removed_and_changed_rows():
+    previous = RankingSnapshot.from_rows(
+        [
+            (entry_id(4), 3, 3, 5.0),
+            (entry_id(1), 1, 1, 7.5),
+            (entry_id(2), 2, 2, 6.25),
+            (entry_id(3), 4, 4, 4.0),
+            (entry_id(6), None, None, None),
+        ]
+    )
+    # 'entry 2' swaps places with 'entry 4', 'entry 3' and 'entry 6' are gone, and 'entry 5' and 'entry 7' are new
+    current = RankingSnapshot.from_rows(
+        [
+            (entry_id(1), 1, 1, 7.5),
+            (entry_id(2), 3, 3, 5.0),
+            (entry_id(4), 2, 2, 6.25),
+            (entry_id(5), 4, 4, 4.0),
+            (entry_id(7), 5, 5, None),
+        ]
+    )
+
+    assert previous.diff(current) == [
+        RankingRowChange(entry_id(2), (entry_id(2), 2, 2, 6.25), (entry_id(2), 3, 3, 5.0)),
+        RankingRowChange(entry_id(3), (entry_id(3), 4, 4, 4.0), None),
+        RankingRowChange(entry_id(4), (entry_id(4), 3, 3, 5.0), (entry_id(4), 2, 2, 6.25)),
+        RankingRowChange(entry_id(5), None, (entry_id(5), 4, 4, 4.0)),
+        RankingRowChange(entry_id(6), (entry_id(6), None, None, None), None),
+        RankingRowChange(entry_id(7), None, (entry_id(7), 5, 5, None)),
+    ]
+    assert changed_ranking_sequences(previous.diff(current)) == [2, 3, 4, 5]
+    assert previous.diff(RankingSnapshot(previous.data)) == []
+
+
+def test_rows_are_sorted_by_entry_id():
+    snapshot = RankingSnapshot.from_rows([(entry_id(2), 1, 1, 8.0), (entry_id(1), 2, 2, None)])
+
+    assert list(snapshot.rows()) == [(entry_id(1), 2, 2, None), (entry_id(2), 1, 1, 8.0)]
+    assert len(snapshot) == 2
+
+
+def test_invalid_snapshots_are_rejected():
+    with pytest.raises(ValueError, match="is more than once in the ranking"):
+        RankingSnapshot.from_rows([(entry_id(1), 1, 1, 8.0), (entry_id(1), 2, 2, 7.0)])
+
+    with pytest.raises(ValueError, match="Invalid ranking snapshot of 5 bytes"):
+        RankingSnapshot(b"\x00" * 5)
@@ -0,0 +1,73 @@
+from test_validation import ROUND_COUNT, TOPIC, synthetic_edition
+
+from common.model.models import EntryTopic
+from common.model.settings import load_settings_snapshot
+from common.model.submission_store import SubmissionStore
+from stage_1_validation.custom_types import StageOneInput
+from stage_1_validation.execute import execute as execute_stage_1
+from stage_2_ranking.custom_types import Contestant, Entry, Musicosa, StageTwoInput
+from stage_2_ranking.execute import execute as execute_stage_2
+from stage_3_templates_pre_gen.custom_types import Fulfillment, SequenceRange, StageThreeInput, VideoOptionsRule
+from stage_3_templates_pre_gen.custom_types import Musicosa as S3_Musicosa
+from stage_3_templates_pre_gen.execute import execute as execute_stage_3
+
+SETTINGS = [
+    ("global", "round_count", ROUND_COUNT),
+    ("ranking", "significant_decimal_digits", 2),
+    ("generation", "videoclips_override_top_n_duration", 10),
+    ("generation", "videoclips_override_duration_up_to_x_seconds", 60),
+]
+
+
+def set_settings(db) -> None:
+    for group_key, setting, value in SETTINGS:
+        db.execute_sql(
+            "UPDATE settings SET value = ? WHERE group_key = ? AND setting = ?", (str(value), group_key, setting)
+        )
+
+
+def settings_queries(executed_sql: list[str]) -> int:
+    return len([sql for sql in executed_sql if '"settings"' in sql])
+
+
+def test_stage_1_reads_settings_once(db, executed_sql):
+    set_settings(db)
+    submissions, titles = synthetic_edition(6)
+    executed_sql.clear()
+
+    result = execute_stage_1(StageOneInput(submissions, titles, [EntryTopic(TOPIC)]), load_settings_snapshot())
+
+    assert result.validation_errors is None
+    # Not once per validated entry (360 of them)
+    assert settings_queries(executed_sql) == 1
+
+
+def test_stage_2_reads_settings_once(db, executed_sql):
+    set_settings(db)
+    scores = SubmissionStore()
+    contestants = [Contestant(f"Contestant {idx}") for idx in range(6)]
+    entries = [Entry(f"Entry {idx}", f"Contestant {idx % 6}") for idx in range(12)]
+
+    for contestant in contestants:
+        contestant_id = scores.add_contestant(contestant.name)
+
+        for idx, entry in enumerate(entries):
+            scores.append_score(contestant_id, scores.add_title(entry.title), float(idx % 10), False)
+
+    executed_sql.clear()
+
+    result = execute_stage_2(StageTwoInput(Musicosa(contestants, entries, scores)), load_settings_snapshot())
+
+    assert len(result.entries_stats) == len(entries)
+    assert settings_queries(executed_sql) == 1
+
+
+def test_stage_3_reads_settings_once(db, executed_sql):
+    set_settings(db)
+    fulfillment = Fulfillment(video_options=[VideoOptionsRule(SequenceRange(None, None), "00:30-01:00")])
+    executed_sql.clear()
+
+    result = execute_stage_3(StageThreeInput(S3_Musicosa([], [], {}, {})), load_settings_snapshot(), fulfillment)
+
+    assert result.frame_settings == [] and result.generation_settings == []
+    assert settings_queries(executed_sql) == 1
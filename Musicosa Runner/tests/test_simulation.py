@@ -0,0 +1,64 @@
+import random
+
+from test_ranking_engines import random_edition, ranking_settings
+
+from common.model.submission_store import SubmissionStore
+from stage_2_ranking.custom_types import Contestant, Entry, Musicosa
+from stage_2_ranking.logic.ranking import rank_musicosa
+from stage_2_ranking.logic.simulation import RESAMPLES_BATCH_SIZE, simulate_ranking_stability
+
+
+def unanimous_edition(contestant_count: int, entry_count: int) -> Musicosa:
+    """
+    Edition where every contestant gives each entry the same score, and no two entries get the same one
+    """
+    contestants = [Contestant(f"Contestant {idx}") for idx in range(contestant_count)]
+    entries = [Entry(f"Entry {idx}", f"Contestant {idx % contestant_count}") for idx in range(entry_count)]
+    scores = SubmissionStore()
+
+    for contestant in contestants:
+        contestant_id = scores.add_contestant(contestant.name)
+
+        for idx, entry in enumerate(entries):
+            scores.append_score(contestant_id, scores.add_title(entry.title), 10 * idx / entry_count, False)
+
+    return Musicosa(contestants, entries, scores)
+
+
+def test_bootstrap_results_depend_on_the_seed_alone():
+    musicosa, settings = random_edition(random.Random(0))
+    entries_stats = rank_musicosa(musicosa, settings)[1]
+    significant_decimal_digits = settings.significant_decimal_digits
+    # Several batches, the last one partial
+    resamples = 2 * RESAMPLES_BATCH_SIZE + 100
+
+    stability = simulate_ranking_stability(
+        musicosa, entries_stats, significant_decimal_digits, resamples=resamples, top_places=3, seed=42
+    )
+
+    assert stability.resamples == resamples
+    assert stability == simulate_ranking_stability(
+        musicosa, entries_stats, significant_decimal_digits, resamples=resamples, top_places=3, workers=3, seed=42
+    )
+    assert stability != simulate_ranking_stability(
+        musicosa, entries_stats, significant_decimal_digits, resamples=resamples, top_places=3, seed=43
+    )
+
+
+def test_leave_one_out_of_a_unanimous_edition_changes_nothing():
+    musicosa = unanimous_edition(8, 20)
+    entries_stats = rank_musicosa(musicosa, ranking_settings(2))[1]
+
+    stability = simulate_ranking_stability(musicosa, entries_stats, 2, method="leave_one_out", top_places=5)
+
+    assert stability.resamples == len(musicosa.contestants)
+    assert stability.top_places_change_rate == 0.0
+    assert [distribution.entry for distribution in stability.entries] == list(reversed(musicosa.entries))
+
+    for distribution in stability.entries:
+        place = distribution.ranking_place
+
+        assert (distribution.best_place, distribution.worst_place) == (place, place)
+        assert distribution.place_interval == (place, place)
+        assert distribution.mean_place == distribution.median_place == place
+        assert distribution.top_places_rate == (1.0 if place <= 5 else 0.0)
@@ -0,0 +1,69 @@
+import pytest
+
+from common.naming.identifiers import generate_contestant_uuid5, generate_entry_uuid5
+from stage_2_ranking.custom_types import Contestant, Entry
+from stage_2_ranking.stage_input import load_musicosa_from_db
+
+
+def populate_edition(db, contestant_count: int, round_count: int) -> None:
+    """
+    Contestants with avatars, each one authoring 'round_count' entries and scoring every entry, except the last
+    contestant (no scorings at all) and an entry without author
+    """
+    names = [f"Contestant {contestant}" for contestant in range(contestant_count)]
+    titles = [
+        f"Entry {contestant} - {round_}" for contestant in range(contestant_count) for round_ in range(round_count)
+    ]
+
+    for name in names:
+        avatar_id = db.execute_sql(
+            "INSERT INTO avatars (image_filename, image_height, score_box_position_top, score_box_position_left, "
+            "score_box_font_scale) VALUES (?, 400, 10, 50, 1)",
+            (f"{name}.png",),
+        ).lastrowid
+        db.execute_sql(
+            "INSERT INTO contestants (id, name, avatar) VALUES (?, ?, ?)",
+            (generate_contestant_uuid5(name).hex, name, avatar_id),
+        )
+
+    for idx, title in enumerate([*titles, "Entry without author"]):
+        author = names[idx // round_count] if idx < len(titles) else None
+        db.execute_sql(
+            "INSERT INTO entries (id, title, author, video_url) VALUES (?, ?, ?, ?)",
+            (
+                generate_entry_uuid5(title).hex,
+                title,
+                generate_contestant_uuid5(author).hex if author else None,
+                f"https://youtu.be/{idx:011d}",
+            ),
+        )
+
+    for contestant_idx, name in enumerate(names[:-1]):
+        for title_idx, title in enumerate(titles):
+            db.execute_sql(
+                "INSERT INTO contestant_grades_entries (contestant, entry, score) VALUES (?, ?, ?)",
+                (
+                    generate_contestant_uuid5(name).hex,
+                    generate_entry_uuid5(title).hex,
+                    (contestant_idx + title_idx) % 11,
+                ),
+            )
+
+
+@pytest.mark.parametrize("contestant_count", [3, 30])
+def test_load_musicosa_from_db_runs_two_queries(db, executed_sql, contestant_count):
+    round_count = 2
+    populate_edition(db, contestant_count, round_count)
+    executed_sql.clear()
+
+    musicosa = load_musicosa_from_db()
+
+    # Contestants with their scorings, and entries with their authors. Whatever the size of the edition
+    assert len(executed_sql) == 2, executed_sql
+
+    assert musicosa.contestants == [Contestant(f"Contestant {idx}") for idx in range(contestant_count)]
+    assert len(musicosa.entries) == contestant_count * round_count + 1
+    assert musicosa.entries[0] == Entry("Entry 0 - 0", "Contestant 0")
+    assert musicosa.entries[-1] == Entry("Entry without author", "")
+    assert len(musicosa.scores) == (contestant_count - 1) * contestant_count * round_count
+    assert sum(musicosa.scores.row_author_flags) == (contestant_count - 1) * round_count
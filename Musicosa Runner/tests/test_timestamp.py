@@ -0,0 +1,79 @@
+import pytest
+
+from common.db.peewee_helpers import bulk_write_rows
+from common.model.models import Entry, VideoOptions
+from common.time.timestamp import (
+    ClipRange,
+    Timestamp,
+    parse_clip_range,
+    parse_timestamp,
+    validate_clip_range_str,
+)
+
+
+@pytest.mark.parametrize(
+    "time_str, seconds",
+    [
+        ("00:00:00", 0),
+        ("1:30", 90),
+        (":05", 5),
+        ("1::07", 3607),
+        ("01:02:03", 3723),
+        ("01:02:03.999", 3723),
+        ("2:03,5", 123),
+        ("23:59:59", 86399),
+    ],
+)
+def test_parse_timestamp(time_str, seconds):
+    assert parse_timestamp(time_str) == Timestamp(seconds)
+
+
+@pytest.mark.parametrize("time_str", ["", "90", "1:3", "24:00:00", "00:60:00", "00:00:60", "1:30:", "a:bc"])
+def test_parse_invalid_timestamp(time_str):
+    assert parse_timestamp(time_str) is None
+
+
+def test_timestamp_text_round_trip():
+    for seconds in (0, 59, 60, 3599, 3600, 3723, 86399):
+        timestamp = Timestamp(seconds)
+
+        assert parse_timestamp(str(timestamp)) == timestamp
+
+    clip_range = ClipRange(Timestamp(83), Timestamp(113))
+
+    assert str(clip_range) == "00:01:23-00:01:53"
+    assert parse_clip_range(str(clip_range)) == clip_range
+    assert parse_clip_range(" 1:23 - 1:53 ") == clip_range
+    assert clip_range.duration == 30
+
+
+@pytest.mark.parametrize("clip_range_str", ["1:23", "1:23-1:53-2:23", "1:23-", "1:23-1:60"])
+def test_parse_invalid_clip_range(clip_range_str):
+    assert parse_clip_range(clip_range_str) is None
+
+
+def test_validate_clip_range_str():
+    assert validate_clip_range_str("1:00-1:30")
+    assert validate_clip_range_str("1:00-1:30", duration=30)
+    assert not validate_clip_range_str("1:00-1:31", duration=30)
+    assert not validate_clip_range_str("1:30-1:00")
+    assert not validate_clip_range_str("1:00-1:00")
+    assert not validate_clip_range_str("1:00")
+
+
+def test_timestamp_db_round_trip(db):
+    bulk_write_rows(Entry.ORM, [Entry.ORM.id, Entry.ORM.title, Entry.ORM.video_url], [("entry", "Entry", "url")])
+    bulk_write_rows(
+        VideoOptions.ORM,
+        [VideoOptions.ORM.entry, VideoOptions.ORM.timestamp_start, VideoOptions.ORM.timestamp_end],
+        [("entry", Timestamp(3723), Timestamp(86399))],
+    )
+
+    assert db.execute_sql("SELECT timestamp_start, timestamp_end FROM video_options").fetchall() == [
+        ("01:02:03", "23:59:59")
+    ]
+
+    video_options = VideoOptions.ORM.get_by_id("entry")
+
+    assert video_options.timestamp_start == Timestamp(3723)
+    assert video_options.timestamp_end == Timestamp(86399)
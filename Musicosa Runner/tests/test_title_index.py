@@ -0,0 +1,34 @@
+from stage_1_validation.constants import TITLE_SUGGESTIONS_LIMIT
+from stage_1_validation.logic.title_index import TitleTrigramIndex, normalize_title
+
+TITLES = [
+    "Cruel Angel's Thesis",
+    "Unravel",
+    "Gurenge",
+    "Again",
+    "Blue Bird",
+    "Silhouette",
+    "Kaikai Kitan",
+    "Guren no Yumiya",
+]
+
+
+def test_normalize_title():
+    assert normalize_title("  Cruel   ANGEL'S_thesis!! ") == "cruel angel s thesis"
+
+
+def test_suggestions_are_ranked_by_similarity():
+    index = TitleTrigramIndex(TITLES)
+
+    assert index.suggest("cruel angels thesis") == ["Cruel Angel's Thesis"]
+    assert index.suggest("Guren no Yumia") == ["Guren no Yumiya"]
+    assert index.suggest("Blue-bird") == ["Blue Bird"]
+    assert index.suggest("Completely unrelated") == []
+
+
+def test_suggestions_are_limited():
+    index = TitleTrigramIndex([f"Entry {idx}" for idx in range(TITLE_SUGGESTIONS_LIMIT * 2)] + ["Entry 0"])
+
+    assert len(index.titles) == TITLE_SUGGESTIONS_LIMIT * 2
+    assert len(suggestions := index.suggest("Entry")) == TITLE_SUGGESTIONS_LIMIT
+    assert index.suggest("Entry") is suggestions
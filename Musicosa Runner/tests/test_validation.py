@@ -0,0 +1,198 @@
+import time
+from dataclasses import replace
+
+from common.model.models import EntryTopic, Setting, SettingKeys, SettingValueTypes
+from common.model.settings import SettingsSnapshot
+from common.time.timestamp import ClipRange, Timestamp
+from stage_1_validation.custom_types import ContestantSubmission, ContestantSubmissionEntry, StageOneInput
+from stage_1_validation.execute import execute
+from stage_1_validation.logic.validation import (
+    AuthorRegistry,
+    IncrementalValidator,
+    build_validation_index,
+    validate_contestant_submission,
+)
+
+ROUND_COUNT = 10
+VIDEO_DURATION = 30
+TOPIC = "Opening"
+
+
+def settings_snapshot() -> SettingsSnapshot:
+    values = {
+        SettingKeys.GLOBAL_ROUND_COUNT: (ROUND_COUNT, SettingValueTypes.INTEGER),
+        SettingKeys.VALIDATION_SCORE_MIN_VALUE: (0.0, SettingValueTypes.REAL),
+        SettingKeys.VALIDATION_SCORE_MAX_VALUE: (10.0, SettingValueTypes.REAL),
+        SettingKeys.VALIDATION_ENTRY_VIDEO_DURATION_SECONDS: (VIDEO_DURATION, SettingValueTypes.INTEGER),
+    }
+
+    return SettingsSnapshot(
+        Setting(group_key=key.split(".")[0], setting=key.split(".")[1], type=value_type, value=value)
+        for key, (value, value_type) in values.items()
+    )
+
+
+def synthetic_edition(contestant_count: int) -> tuple[list[ContestantSubmission], list[str]]:
+    """
+    Valid submissions of 'contestant_count' contestants, each one authoring ROUND_COUNT entries and scoring every
+    entry. Entries scored but not authored are the same objects in every submission, to keep the edition light
+    """
+    titles = [
+        f"Entry {contestant} - {round_}" for contestant in range(contestant_count) for round_ in range(ROUND_COUNT)
+    ]
+    scored_entries = [ContestantSubmissionEntry(title, 5.0, False, None, None, None) for title in titles]
+    clip_range = ClipRange(Timestamp(60), Timestamp(60 + VIDEO_DURATION))
+
+    submissions: list[ContestantSubmission] = []
+
+    for contestant in range(contestant_count):
+        entries = scored_entries.copy()
+
+        for round_ in range(ROUND_COUNT):
+            entry_idx = contestant * ROUND_COUNT + round_
+            entries[entry_idx] = ContestantSubmissionEntry(
+                titles[entry_idx],
+                7.5,
+                True,
+                f"https://youtu.be/v{contestant:05d}{round_:05d}?si=shared",
+                clip_range,
+                TOPIC.lower() if round_ == 0 else None,
+            )
+
+        submissions.append(ContestantSubmission(f"Contestant {contestant}", entries))
+
+    return submissions, titles
+
+
+def validation_seconds_per_entry(contestant_count: int) -> float:
+    submissions, titles = synthetic_edition(contestant_count)
+    index = build_validation_index(titles, [EntryTopic(TOPIC)], settings_snapshot())
+
+    start = time.perf_counter()
+    validation_errors = IncrementalValidator().validate(submissions, index)
+    elapsed = time.perf_counter() - start
+
+    assert validation_errors is None
+
+    return elapsed / sum(len(submission.entries) for submission in submissions)
+
+
+def test_validation_scales_linearly_with_entries():
+    # 500 contestants x 10 rounds: 500 submissions of 5000 entries (2.5M validated entries)
+    seconds_per_entry = {
+        contestant_count: validation_seconds_per_entry(contestant_count) for contestant_count in (125, 500)
+    }
+
+    # 16 times the entries of the smaller edition. A cost per entry that grew with the size of the submissions (or the
+    # entry topics) would be at least 4 times higher
+    assert seconds_per_entry[500] < 2 * seconds_per_entry[125]
+
+
+def test_submission_errors_are_found_in_one_pass():
+    submissions, titles = synthetic_edition(4)
+    index = build_validation_index(titles, [EntryTopic(TOPIC)], settings_snapshot())
+
+    submission = submissions[0]
+    submission.entries[1] = ContestantSubmissionEntry("Entry 0 - 0", 5.0, False, None, None, "opening")
+    submission.entries[-1] = ContestantSubmissionEntry("Entry 3 - 9", 11.0, False, None, None, None)
+
+    assert validate_contestant_submission(submission, len(submissions), index) == [
+        "[Contestant 0] Author claim count mismatch (9) (Should be 10)",
+        "[Contestant 0] Entry 'Entry 0 - 0' is duplicated 1 time",
+        "[Contestant 0] Missing entries (1):\n    * Entry 0 - 1",
+        "[Contestant 0] [Entry 0 - 0] Topic is only allowed for authors",
+        "[Contestant 0] [Entry 3 - 9] Invalid score '11.0' (Should be a number between 0.0 and 10.0)",
+        "[Contestant 0] There are multiple entries (2) of topic 'OPENING':\n  * Entry 0 - 0\n  * Entry 0 - 0",
+    ]
+
+
+def test_entries_sharing_a_video_are_a_warning():
+    submissions, titles = synthetic_edition(4)
+    # Same video as 'Entry 1 - 0' ('https://youtu.be/v0000100000...'), at another time
+    shared_entry = submissions[0].entries[1]
+    submissions[0].entries[1] = ContestantSubmissionEntry(
+        shared_entry.title,
+        shared_entry.score,
+        True,
+        "https://www.youtube.com/watch?v=v0000100000&t=120",
+        shared_entry.video_timestamp,
+        None,
+    )
+    stage_input = StageOneInput(submissions, titles, [EntryTopic(TOPIC)])
+
+    for validator in (IncrementalValidator(), None):
+        result = execute(stage_input, settings_snapshot(), validator)
+
+        assert result.validation_errors is None
+        assert result.validation_warnings == [
+            "[WARNING] Entries share the same video 'youtube:v0000100000' (2): Entry 0 - 1, Entry 1 - 0"
+        ]
+
+
+def collection_errors(submissions: list[ContestantSubmission]) -> list[str]:
+    registry = AuthorRegistry()
+
+    for submission in submissions:
+        registry.add(submission)
+
+    return registry.errors()
+
+
+def test_empty_titles_are_listed_with_the_collection_errors():
+    # Empty title cells (None) nobody authors, next to 'Entry 1 - 0' that nobody authors either
+    submissions, _ = synthetic_edition(4)
+    submissions[0].entries[ROUND_COUNT] = replace(submissions[0].entries[ROUND_COUNT], title=None)
+    submissions[1].entries[ROUND_COUNT] = replace(submissions[1].entries[ROUND_COUNT], is_author=False)
+
+    assert collection_errors(submissions) == ["Entries with no author (2):\n  * Entry 1 - 0\n  * None"]
+
+    # Empty title cells claimed by two contestants, next to 'Entry 3 - 0' that has two authors as well
+    submissions, _ = synthetic_edition(4)
+    for contestant in (2, 3):
+        submissions[contestant].entries[1] = replace(submissions[contestant].entries[1], title=None, is_author=True)
+    submissions[2].entries[3 * ROUND_COUNT] = replace(submissions[2].entries[3 * ROUND_COUNT], is_author=True)
+
+    assert collection_errors(submissions) == [
+        "Entry 'Entry 3 - 0' has multiple authors (2): Contestant 2, Contestant 3",
+        "Entry 'None' has multiple authors (2): Contestant 2, Contestant 3",
+    ]
+
+
+def test_empty_title_cells_are_reported():
+    submissions, titles = synthetic_edition(4)
+    # Empty title cell in place of 'Entry 1 - 1'
+    submissions[0].entries[ROUND_COUNT + 1] = replace(submissions[0].entries[ROUND_COUNT + 1], title=None)
+    stage_input = StageOneInput(submissions, titles, [EntryTopic(TOPIC)])
+
+    for validator in (IncrementalValidator(), None):
+        result = execute(stage_input, settings_snapshot(), validator)
+
+        assert result.validation_errors == [
+            "Entries with no author (1):\n  * None",
+            "[Contestant 0] Invalid entries (1):\n    * None",
+            "[Contestant 0] Missing entries (1):\n    * Entry 1 - 1",
+            "[Contestant 0] [None] Title is not a string or is empty",
+        ]
+
+
+def test_partial_ballots_list_only_some_entries():
+    submissions, titles = synthetic_edition(4)
+    # Contestant 0 scores none of the entries of contestant 1, and nobody lists 'Entry 3 - 9' (not even its author)
+    submissions[0].entries = [entry for entry in submissions[0].entries if not entry.title.startswith("Entry 1 - ")]
+    for submission in submissions:
+        submission.entries.pop()
+    stage_input = StageOneInput(submissions, titles, [EntryTopic(TOPIC)])
+
+    for validator in (IncrementalValidator(), None):
+        result = execute(stage_input, settings_snapshot(), validator, partial_ballots=True)
+
+        assert result.validation_errors == [
+            "Entries with no author (1):\n  * Entry 3 - 9",
+            "[Contestant 3] Author claim count mismatch (9) (Should be 10)",
+        ]
+
+    errors = execute(stage_input, settings_snapshot(), IncrementalValidator()).validation_errors
+
+    assert errors is not None
+    assert "[Contestant 0] Submission entry count mismatch (29) (Should be 40)" in errors
+    assert "[Contestant 0] Missing entries (11):" in "\n".join(errors)
@@ -0,0 +1,96 @@
+from datetime import datetime
+from typing import Any
+
+import pytest
+from openpyxl import Workbook
+
+from stage_1_validation.logic.parsing.xlsx import parse_contestant_form_xlsx, read_contestant_form_xlsx_openpyxl
+from stage_1_validation.logic.parsing.xlsx_stream import XlsxStreamReader, XlsxStreamUnsupportedError
+
+NAME_COORDS = "F2"
+DATA_COORDS = "C6:H10"
+
+VALID_ROWS = [
+    ["Entry 0", 7.5, "x", "https://youtu.be/v0000000000", "1:00-1:30", "Opening"],
+    ["Entry 1", 10, None, None, None, None],
+    ["Entry 2", 0, None, None, None, None],
+    ["Entry 3", "2.25", None, "", None, None],
+    ["Entry 4", 5, "x", "https://youtu.be/v0000000004", "01:00:00 - 01:00:30", None],
+]
+
+
+def write_form(form_file: str, contestant_name: Any, rows: list[list[Any]]) -> None:
+    """
+    Form with the layout of the contestant forms, on a sheet that isn't the first one, plus cells outside the ranges
+    read
+    """
+    workbook = Workbook()
+    instructions = workbook.worksheets[0]
+    instructions.title = "Instructions"
+    instructions["A1"] = "Fill in the 'Form' sheet"
+
+    form = workbook.create_sheet("Form")
+    workbook.active = form
+
+    form[NAME_COORDS] = contestant_name
+
+    for row_idx, row in enumerate(rows):
+        for column_idx, value in enumerate(row):
+            form.cell(6 + row_idx, 3 + column_idx, value)
+
+    form["J6"] = "Notes"
+    form["C40"] = "Entry 99"
+
+    workbook.save(form_file)
+
+
+def test_stream_reader_matches_openpyxl(tmp_path):
+    form_file = str(tmp_path / "Contestant 0.xlsx")
+    # Shared strings, integers, floats, booleans, blanks and a row past the end of the data
+    rows = [*VALID_ROWS[:3], ["Entry 0", True, False, "", 1e-3, None]]
+    write_form(form_file, "Contestant 0", rows)
+
+    with XlsxStreamReader(form_file) as workbook:
+        name_matrix, data_rows = workbook.read_ranges([NAME_COORDS, DATA_COORDS])
+
+    openpyxl_name, openpyxl_data_rows = read_contestant_form_xlsx_openpyxl(form_file, NAME_COORDS, DATA_COORDS)
+
+    assert name_matrix == [[openpyxl_name]]
+    assert data_rows == openpyxl_data_rows
+    assert [[type(value) for value in row] for row in data_rows] == [
+        [type(value) for value in row] for row in openpyxl_data_rows
+    ]
+    assert data_rows[-1] == [None] * 6
+
+
+def test_stream_and_openpyxl_parse_the_same_submission(tmp_path):
+    form_file = str(tmp_path / "Contestant 0.xlsx")
+    write_form(form_file, "Contestant 0", VALID_ROWS)
+
+    submission = parse_contestant_form_xlsx(form_file, NAME_COORDS, DATA_COORDS, "stream")
+
+    assert submission == parse_contestant_form_xlsx(form_file, NAME_COORDS, DATA_COORDS, "openpyxl")
+    assert [entry.title for entry in submission.entries] == [row[0] for row in VALID_ROWS]
+
+
+def test_date_cells_fall_back_to_openpyxl(tmp_path):
+    form_file = str(tmp_path / "Contestant 0.xlsx")
+    write_form(form_file, datetime(2025, 1, 1), VALID_ROWS)
+
+    with XlsxStreamReader(form_file) as workbook, pytest.raises(XlsxStreamUnsupportedError):
+        workbook.read_ranges([NAME_COORDS, DATA_COORDS])
+
+    submission = parse_contestant_form_xlsx(form_file, NAME_COORDS, DATA_COORDS, "stream")
+
+    assert submission == parse_contestant_form_xlsx(form_file, NAME_COORDS, DATA_COORDS, "openpyxl")
+    assert submission.name == datetime(2025, 1, 1)
+
+
+def test_blank_rows_are_skipped(tmp_path):
+    form_file = str(tmp_path / "Contestant 0.xlsx")
+    write_form(form_file, "Contestant 0", [VALID_ROWS[0], [None, None, None, "", None, None], VALID_ROWS[2]])
+
+    for reader in ("stream", "openpyxl"):
+        submission = parse_contestant_form_xlsx(form_file, NAME_COORDS, DATA_COORDS, reader)
+
+        assert [entry.title for entry in submission.entries] == ["Entry 0", "Entry 2"]